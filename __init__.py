@@ -7,19 +7,32 @@ __version__ = "1.2.0"
 __author__ = "Franklooo"
 __description__ = "基于pyecharts的现代季节性分析工具包"
 
+# charts和utils中的模块先尝试相对导入..core/..charts，作为visualkit子包使用时与
+# visualkit.core共享同一份埋点和内存统计状态；直接以顶层charts/utils导入时
+# （仓库根目录在sys.path中，见example/demo.py）回退到顶层core/charts
+
 # 导入核心模块
 from .core.data_processor import DataProcessor
 from .core.calendar_manager import CalendarManager
 from .core.wind_client import WindClient, WindDataProcessor
+from .core.windpy_client import WindPyClient
+from .core.trading_calendar import TradingCalendar
+from .core.constituent_store import ConstituentStore
+from .core.timeseries_store import TimeSeriesStore
 
 # 导入图表模块
 from .charts.base_chart import BaseChart, ChartConfig
 from .charts.seasonal_chart import SeasonalChart
-from .charts.time_series_chart import TimeSeriesChart
+from .charts.time_series_chart import TimeSeriesChart, TimeSeriesBuffer
+from .charts.dataset import SharedDataset, DatasetPage
+from .charts.dashboard import Dashboard
+from .charts.binary_export import encode_chart_payload, render_binary
+from .charts.image_export import ImageExporter, render_svg
 
 # 导入工具模块
-from .utils.data_formatter import DataFormatter
+from .utils.data_formatter import DataFormatter, MissingValueFiller
 from .utils.template_manager import TemplateManager
+from .utils.chart_server import ChartServer
 
 # 设置默认配置
 DEFAULT_CONFIG = {
@@ -38,16 +51,30 @@ __all__ = [
     'CalendarManager',
     'WindClient',
     'WindDataProcessor',
+    'WindPyClient',
+    'TradingCalendar',
+    'ConstituentStore',
+    'TimeSeriesStore',
     
     # 图表类
     'BaseChart',
     'ChartConfig',
     'SeasonalChart',
     'TimeSeriesChart',
+    'TimeSeriesBuffer',
+    'SharedDataset',
+    'DatasetPage',
+    'Dashboard',
+    'encode_chart_payload',
+    'render_binary',
+    'ImageExporter',
+    'render_svg',
     
     # 工具类
     'DataFormatter',
+    'MissingValueFiller',
     'TemplateManager',
+    'ChartServer',
     
     # 配置
     'DEFAULT_CONFIG'
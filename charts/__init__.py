@@ -5,11 +5,23 @@
 
 from .base_chart import BaseChart, ChartConfig
 from .seasonal_chart import SeasonalChart
-from .time_series_chart import TimeSeriesChart
+from .time_series_chart import TimeSeriesChart, TimeSeriesBuffer
+from .dataset import SharedDataset, DatasetPage
+from .dashboard import Dashboard
+from .binary_export import encode_chart_payload, render_binary
+from .image_export import ImageExporter, render_svg
 
 __all__ = [
     'BaseChart',
     'ChartConfig',
     'SeasonalChart',
-    'TimeSeriesChart'
+    'TimeSeriesChart',
+    'TimeSeriesBuffer',
+    'SharedDataset',
+    'DatasetPage',
+    'Dashboard',
+    'encode_chart_payload',
+    'render_binary',
+    'ImageExporter',
+    'render_svg'
 ]
\ No newline at end of file
@@ -8,6 +8,14 @@ import pandas as pd
 from pyecharts.charts import Line, Bar, Scatter
 from pyecharts import options as opts
 
+try:
+    from ..core.instrumentation import span
+except ImportError:
+    from core.instrumentation import span
+
+from .binary_export import render_binary
+from .image_export import render_svg, svg_to_png
+
 
 class BaseChart(ABC):
     """所有图表类的基类"""
@@ -48,13 +56,51 @@ class BaseChart(ABC):
             ]
         )
     
-    def save_chart(self, chart: Any, filename: str) -> None:
-        """保存图表为HTML文件"""
-        chart.render(filename)
+    def save_chart(self, chart: Any, filename: str, embed: str = 'json', dtype: str = 'auto') -> None:
+        """
+        保存图表为HTML文件
+
+        Args:
+            chart: pyecharts图表
+            filename: HTML文件路径
+            embed: 数据的嵌入方式，'json'为pyecharts默认的明文option，
+                'binary'为压缩的类型化数组（见binary_export），数据量大时文件小得多
+            dtype: binary模式下数值的类型
+        """
+        if embed == 'binary':
+            render_binary(chart, filename, dtype=dtype)
+            return
+        if embed != 'json':
+            raise ValueError(f"不支持的嵌入方式: {embed}，可选: json, binary")
+        with span('chart.render', filename=filename):
+            chart.render(filename)
+
+    def save_image(
+        self,
+        chart: Any,
+        filename: str,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        scale: float = 1.0
+    ) -> None:
+        """
+        保存图表为静态图片，按扩展名输出SVG或PNG（PNG需要cairosvg）
+
+        批量导出时使用ImageExporter，渲染进程可在多个批次间复用
+        """
+        fmt = filename.rsplit('.', 1)[-1].lower()
+        if fmt not in ('svg', 'png'):
+            raise ValueError(f"不支持的图片格式: {fmt}，可选: svg, png")
+        with span('chart.render_image', filename=filename):
+            svg = render_svg(chart, width, height)
+            data = svg_to_png(svg, scale) if fmt == 'png' else svg.encode('utf-8')
+            with open(filename, 'wb') as f:
+                f.write(data)
     
     def get_chart_options(self, chart: Any) -> Dict[str, Any]:
         """获取图表配置"""
-        return chart.dump_options_with_quotes()
+        with span('chart.dump_options'):
+            return chart.dump_options_with_quotes()
 
 
 class ChartConfig:
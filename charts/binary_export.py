@@ -0,0 +1,251 @@
+"""
+二进制数据嵌入
+把序列数值从option中取出，按Float32/Float64连续存放，与其余option一起gzip压缩后base64嵌入HTML；
+浏览器端用DecompressionStream解压，再把类型化数组还原到option中
+"""
+import base64
+import copy
+import gzip
+import html
+import json
+import struct
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import simplejson
+from pyecharts.charts.base import default as _json_default
+from pyecharts.commons.utils import replace_placeholder
+from pyecharts.globals import CurrentConfig
+
+try:
+    from ..core.instrumentation import span
+except ImportError:
+    from core.instrumentation import span
+
+from .dataset import _axis_dict, _series_values
+
+
+# 支持的数值类型
+BINARY_DTYPES = ('float32', 'float64', 'auto')
+
+# 二进制列按8字节对齐，浏览器端可直接创建类型化数组视图
+_ALIGNMENT = 8
+
+# 浏览器端的gzip+base64解码函数
+INFLATE_JS = """
+function visualkitInflate(b64) {
+    var bytes = Uint8Array.from(atob(b64.trim()), function (c) { return c.charCodeAt(0); });
+    var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).arrayBuffer();
+}
+"""
+
+# 浏览器端的payload解码函数: [uint32 头部长度][头部JSON][按8字节对齐的数值列]
+DECODE_JS = """
+function visualkitDecodeOption(buffer) {
+    var headerLength = new DataView(buffer).getUint32(0, true);
+    var header = JSON.parse(new TextDecoder('utf-8').decode(new Uint8Array(buffer, 4, headerLength)));
+    var dataStart = Math.ceil((4 + headerLength) / 8) * 8;
+    var option = (new Function('return ' + header.option))();
+    header.columns.forEach(function (column) {
+        var Typed = column.dtype === 'float32' ? Float32Array : Float64Array;
+        var values = new Typed(buffer, dataStart + column.offset, column.length);
+        var data = new Array(values.length);
+        for (var i = 0; i < values.length; i++) {
+            var value = values[i];
+            if (value !== value) {
+                value = null;
+            } else if (column.precision) {
+                // 有损的float32还原为double后按有效数字取整，3456.78不会显示为3456.780029296875
+                value = parseFloat(value.toPrecision(column.precision));
+            }
+            data[i] = value;
+        }
+        var target = option;
+        for (var j = 0; j < column.target.length - 1; j++) {
+            target = target[column.target[j]];
+        }
+        target[column.target[column.target.length - 1]] = data;
+    });
+    return option;
+}
+"""
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>%(title)s</title>
+<script src="%(echarts_src)s"></script>
+</head>
+<body>
+<div id="%(chart_id)s" style="width:%(width)s;height:%(height)s;"></div>
+<script type="application/octet-stream" id="%(chart_id)s-data">%(payload)s</script>
+<script>
+%(inflate)s
+%(decode)s
+(function () {
+    var el = document.getElementById('%(chart_id)s');
+    visualkitInflate(document.getElementById('%(chart_id)s-data').textContent).then(function (buffer) {
+        var chart = echarts.init(el, %(theme)s);
+        chart.setOption(visualkitDecodeOption(buffer));
+        window.addEventListener('resize', function () { chart.resize(); });
+    });
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def dump_option_js(chart: Any) -> str:
+    """将图表或option字典序列化为紧凑的option JS表达式（JsCode保留为函数）"""
+    options = chart if isinstance(chart, dict) else chart.get_options()
+    text = simplejson.dumps(
+        options,
+        separators=(',', ':'),
+        default=_json_default,
+        ignore_nan=True,
+        ensure_ascii=False
+    )
+    return replace_placeholder(text)
+
+
+def _numeric_array(values: Any) -> Optional[np.ndarray]:
+    """数值或None组成的列表转为float64数组（None为NaN），含其他类型时返回None"""
+    if not isinstance(values, list) or not values:
+        return None
+    if any(isinstance(v, (str, bytes, dict, list, tuple)) for v in values):
+        return None
+    try:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+
+
+# float32的有效数字位数，有损的float32列在浏览器端按此位数取整
+FLOAT32_PRECISION = 7
+
+
+def _choose_dtype(array: np.ndarray, dtype: str) -> Tuple[np.dtype, bool]:
+    """返回列的类型及是否无损，auto时能无损转为float32的列使用float32"""
+    if dtype == 'float64':
+        return np.dtype(np.float64), True
+    narrow = array.astype(np.float32)
+    lossless = np.array_equal(narrow.astype(np.float64), array, equal_nan=True)
+    if dtype == 'float32' or lossless:
+        return np.dtype(np.float32), lossless
+    return np.dtype(np.float64), True
+
+
+def _extract_columns(options: dict) -> List[Tuple[list, np.ndarray]]:
+    """取出option中的数值列（序列数据和dataset列），原位置置空，返回(路径, 数组)"""
+    columns = []
+    axes = [_axis_dict(axis) for axis in (options.get('xAxis') or [])]
+
+    for idx, series in enumerate(options.get('series') or []):
+        data = series.get('data')
+        axis_index = series.get('xAxisIndex') or 0
+        labels = axes[axis_index].get('data') if axis_index < len(axes) else None
+        if isinstance(labels, list):
+            # 类目轴上的[x, y]数据只保留y，x由类目轴按位置对应
+            data = _series_values(data, labels) or data
+        array = _numeric_array(data)
+        if array is not None:
+            series['data'] = None
+            columns.append((['series', idx, 'data'], array))
+
+    datasets = options.get('dataset') or []
+    for idx, dataset in enumerate(datasets if isinstance(datasets, list) else [datasets]):
+        source = dataset.get('source')
+        if not isinstance(source, dict):
+            continue
+        for dimension, values in source.items():
+            array = _numeric_array(values)
+            if array is not None:
+                source[dimension] = None
+                target = ['dataset', idx, 'source', dimension] if isinstance(datasets, list) else ['dataset', 'source', dimension]
+                columns.append((target, array))
+
+    return columns
+
+
+def encode_chart_payload(chart: Any, dtype: str = 'auto') -> bytes:
+    """
+    将图表编码为gzip压缩的二进制payload，浏览器端用visualkitDecodeOption还原
+
+    Args:
+        chart: pyecharts图表或option字典
+        dtype: 数值类型，'auto'（逐列选择无损的最小类型）、'float64'（无损）或
+            'float32'（约7位有效数字，浏览器端还原时按7位有效数字取整）
+
+    Returns:
+        bytes: gzip压缩后的payload
+    """
+    if dtype not in BINARY_DTYPES:
+        raise ValueError(f"不支持的数值类型: {dtype}，可选: {', '.join(BINARY_DTYPES)}")
+
+    # get_options返回新的字典和列表，修改不影响图表本身
+    options = copy.deepcopy(chart) if isinstance(chart, dict) else chart.get_options()
+
+    # 列的偏移量相对于数值区的起点，数值区从头部之后的第一个8字节边界开始
+    specs, blocks, offset = [], [], 0
+    for target, array in _extract_columns(options):
+        column_dtype, lossless = _choose_dtype(array, dtype)
+        block = array.astype(column_dtype).tobytes()
+        spec = {'target': target, 'dtype': column_dtype.name, 'offset': offset, 'length': len(array)}
+        if not lossless:
+            spec['precision'] = FLOAT32_PRECISION
+        specs.append(spec)
+        blocks.append(block + b'\x00' * (-len(block) % _ALIGNMENT))
+        offset += len(blocks[-1])
+
+    header = json.dumps(
+        {'option': dump_option_js(options), 'columns': specs},
+        ensure_ascii=False,
+        separators=(',', ':')
+    ).encode('utf-8')
+    parts = [struct.pack('<I', len(header)), header, b'\x00' * (-(4 + len(header)) % _ALIGNMENT)] + blocks
+
+    with span('binary_export.compress', columns=len(specs)):
+        return gzip.compress(b''.join(parts), compresslevel=9, mtime=0)
+
+
+def render_binary(
+    chart: Any,
+    path: str = "render.html",
+    dtype: str = 'auto',
+    title: Optional[str] = None,
+    js_host: Optional[str] = None
+) -> str:
+    """
+    以二进制嵌入方式渲染单个图表（Line/Bar/Grid等）为HTML
+
+    Args:
+        chart: pyecharts图表
+        path: HTML文件路径
+        dtype: 数值类型，见encode_chart_payload
+        title: 页面标题，默认使用pyecharts的页面标题
+        js_host: echarts.min.js所在的地址，默认与pyecharts一致
+
+    Returns:
+        str: HTML文件的路径
+    """
+    with span('binary_export.render', filename=path):
+        payload = base64.b64encode(encode_chart_payload(chart, dtype)).decode('ascii')
+        theme = getattr(chart, 'theme', None)
+        page = _PAGE_TEMPLATE % {
+            'title': html.escape(title or getattr(chart, 'page_title', None) or CurrentConfig.PAGE_TITLE),
+            'echarts_src': html.escape(f"{js_host if js_host is not None else CurrentConfig.ONLINE_HOST}echarts.min.js"),
+            'chart_id': getattr(chart, 'chart_id', None) or 'visualkit-chart',
+            'width': html.escape(getattr(chart, 'width', None) or '100%'),
+            'height': html.escape(getattr(chart, 'height', None) or '500px'),
+            'payload': payload,
+            'theme': json.dumps(theme) if theme else 'null',
+            'inflate': INFLATE_JS,
+            'decode': DECODE_JS
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(page)
+
+    return path
@@ -0,0 +1,238 @@
+"""
+多图表仪表盘
+页面只包含布局和一个很小的加载脚本，各图表的option放在旁路JS文件或页内压缩的二进制块中，
+滚动到可视区域附近时才加载并初始化，首屏大小与图表数量基本无关
+"""
+import base64
+import html
+import json
+import os
+from typing import Any, List, Optional
+
+from pyecharts.globals import CurrentConfig
+
+try:
+    from ..core.instrumentation import span
+except ImportError:
+    from core.instrumentation import span
+
+from .binary_export import DECODE_JS, INFLATE_JS, dump_option_js, encode_chart_payload
+from .dataset import SharedDataset
+
+
+# 支持的payload存放方式
+PAYLOAD_MODES = ('inline', 'sidecar')
+
+_LOADER_JS = """
+(function () {
+    var pending = {};
+    window.visualkitDashboard = {
+        register: function (id, factory) {
+            var show = pending[id];
+            delete pending[id];
+            if (show) { show(factory()); }
+        }
+    };
+    function show(el, option) {
+        var chart = echarts.init(el, el.getAttribute('data-theme') || null);
+        chart.setOption(option);
+        el.removeAttribute('data-loading');
+        window.addEventListener('resize', function () { chart.resize(); });
+    }
+    function load(el) {
+        var src = el.getAttribute('data-src');
+        if (src) {
+            pending[el.id] = function (option) { show(el, option); };
+            var script = document.createElement('script');
+            script.src = src;
+            script.charset = 'utf-8';
+            document.head.appendChild(script);
+            return;
+        }
+        var blob = document.getElementById(el.id + '-data').textContent;
+        visualkitInflate(blob).then(function (buffer) {
+            show(el, visualkitDecodeOption(buffer));
+        });
+    }
+    var charts = document.querySelectorAll('.vk-chart');
+    if (!('IntersectionObserver' in window)) {
+        charts.forEach(load);
+        return;
+    }
+    var observer = new IntersectionObserver(function (entries) {
+        entries.forEach(function (entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                load(entry.target);
+            }
+        });
+    }, {rootMargin: '%(root_margin)s'});
+    charts.forEach(function (el) { observer.observe(el); });
+})();
+"""
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>%(title)s</title>
+<script src="%(echarts_src)s"></script>
+<style>
+body { margin: 0; padding: 16px; font-family: sans-serif; }
+.vk-grid { display: grid; grid-template-columns: repeat(%(columns)d, minmax(0, 1fr)); gap: 16px; }
+.vk-cell h3 { margin: 0 0 8px; font-size: 15px; font-weight: normal; }
+.vk-chart[data-loading]::before { content: '加载中...'; color: #999; }
+</style>
+</head>
+<body>
+<div class="vk-grid">
+%(cells)s
+</div>
+%(blobs)s
+<script>
+%(shared)s
+%(inflate)s
+%(decode)s
+%(loader)s
+</script>
+</body>
+</html>
+"""
+
+
+class _Panel:
+    """仪表盘中的一个图表"""
+
+    __slots__ = ('chart', 'title', 'height', 'theme')
+
+    def __init__(self, chart: Any, title: str, height: str, theme: Optional[str]):
+        self.chart = chart
+        self.title = title
+        self.height = height
+        self.theme = theme
+
+
+class Dashboard:
+    """
+    懒加载的多图表仪表盘
+
+    用法:
+        dashboard = Dashboard("宏观指标", columns=2)
+        for col in value_cols:
+            dashboard.add(chart.create_seasonal_line(df, 'date', col, title=col))
+        dashboard.render("dashboard.html")
+
+    payload为'inline'时各图表以二进制payload（数值为类型化数组，gzip+base64）存放在页面内，
+    单个文件即可离线打开；
+    为'sidecar'时写到HTML旁边的目录中，每个图表一个JS文件，通过script标签按需加载
+    （file://下同样可用）。两种方式都只在图表接近可视区域时才解析option。
+    """
+
+    def __init__(
+        self,
+        title: str = "visualkit仪表盘",
+        columns: int = 1,
+        chart_height: str = "400px",
+        payload: str = 'inline',
+        dtype: str = 'auto',
+        shared: Optional[SharedDataset] = None,
+        js_host: Optional[str] = None,
+        root_margin: str = '200px'
+    ):
+        """
+        Args:
+            title: 页面标题
+            columns: 每行的图表数
+            chart_height: 图表默认高度
+            payload: option的存放方式，'inline'或'sidecar'
+            dtype: inline模式下数值的类型，见encode_chart_payload
+            shared: 图表使用的页面级共享维度，会在页面中输出一次
+            js_host: echarts.min.js所在的地址，默认与pyecharts一致
+            root_margin: 距可视区域多远时开始加载
+        """
+        if payload not in PAYLOAD_MODES:
+            raise ValueError(f"不支持的payload方式: {payload}，可选: {', '.join(PAYLOAD_MODES)}")
+
+        self.title = title
+        self.columns = max(int(columns), 1)
+        self.chart_height = chart_height
+        self.payload = payload
+        self.dtype = dtype
+        self.shared = shared
+        self.js_host = js_host if js_host is not None else CurrentConfig.ONLINE_HOST
+        self.root_margin = root_margin
+        self._panels: List[_Panel] = []
+
+    def __len__(self) -> int:
+        return len(self._panels)
+
+    def add(
+        self,
+        chart: Any,
+        title: str = "",
+        height: Optional[str] = None
+    ) -> 'Dashboard':
+        """
+        添加图表
+
+        Args:
+            chart: pyecharts图表或option字典
+            title: 图表上方的标题
+            height: 图表高度，默认使用chart_height
+        """
+        theme = getattr(chart, 'theme', None)
+        self._panels.append(_Panel(chart, title, height or self.chart_height, theme))
+        return self
+
+    def render(self, path: str = "dashboard.html") -> str:
+        """
+        生成仪表盘HTML，sidecar模式同时写出<文件名>_charts目录
+
+        Returns:
+            str: HTML文件的路径
+        """
+        stem = os.path.splitext(os.path.basename(path))[0]
+        sidecar_dir = os.path.join(os.path.dirname(path), f"{stem}_charts")
+
+        with span('dashboard.render', charts=len(self._panels), payload=self.payload):
+            if self.payload == 'sidecar':
+                os.makedirs(sidecar_dir, exist_ok=True)
+
+            cells, blobs = [], []
+            for idx, panel in enumerate(self._panels):
+                chart_id = f"vk-chart-{idx}"
+
+                if self.payload == 'sidecar':
+                    option = dump_option_js(panel.chart)
+                    filename = f"{chart_id}.js"
+                    with open(os.path.join(sidecar_dir, filename), 'w', encoding='utf-8') as f:
+                        f.write(f"visualkitDashboard.register({json.dumps(chart_id)}, function () {{ return {option}; }});\n")
+                    source = f' data-src="{html.escape(f"{stem}_charts/{filename}")}"'
+                else:
+                    source = ''
+                    payload = base64.b64encode(encode_chart_payload(panel.chart, self.dtype)).decode('ascii')
+                    blobs.append(f'<script type="application/octet-stream" id="{chart_id}-data">{payload}</script>')
+
+                theme = f' data-theme="{html.escape(panel.theme)}"' if panel.theme else ''
+                cells.append(
+                    f'<div class="vk-cell"><h3>{html.escape(panel.title)}</h3>'
+                    f'<div class="vk-chart" id="{chart_id}" data-loading{source}{theme} '
+                    f'style="width:100%;height:{html.escape(panel.height)}"></div></div>'
+                )
+
+            page = _PAGE_TEMPLATE % {
+                'title': html.escape(self.title),
+                'echarts_src': html.escape(f"{self.js_host}echarts.min.js"),
+                'columns': self.columns,
+                'cells': '\n'.join(cells),
+                'blobs': '\n'.join(blobs),
+                'shared': self.shared.script() if self.shared is not None else '',
+                'inflate': INFLATE_JS if self.payload == 'inline' else '',
+                'decode': DECODE_JS if self.payload == 'inline' else '',
+                'loader': _LOADER_JS % {'root_margin': self.root_margin}
+            }
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(page)
+
+        return path
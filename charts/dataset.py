@@ -0,0 +1,182 @@
+"""
+ECharts dataset输出模式
+将图表中每个序列各自携带的x轴数据改为引用dataset中的同一个维度数组；
+同一页面的多个图表可通过SharedDataset共享一份x轴标签
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from pyecharts.charts import Page
+from pyecharts.commons.utils import JsCode
+
+
+# dataset中x轴维度的名称
+X_DIMENSION = 'x'
+
+
+def _dump_labels(labels: List[Any]) -> str:
+    """x轴标签的紧凑JSON"""
+    return json.dumps(labels, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+class SharedDataset:
+    """
+    页面级共享的x轴维度
+
+    reference返回引用全局JS变量的JsCode，script生成定义这些变量的JS；
+    使用了共享维度的图表需要通过DatasetPage渲染
+    """
+
+    def __init__(self, variable: str = 'visualkitDatasets'):
+        """
+        Args:
+            variable: 保存共享维度的全局JS变量名
+        """
+        self.variable = variable
+        # key -> 标签列表
+        self._axes: Dict[str, List[Any]] = {}
+        # 按id记住已注册的列表；同时持有这些列表，避免被回收后id被复用
+        self._keys_by_id: Dict[int, str] = {}
+        self._registered: List[List[Any]] = []
+
+    @property
+    def axis_count(self) -> int:
+        """已注册的不同x轴数量"""
+        return len(self._axes)
+
+    def key(self, labels: List[Any]) -> str:
+        """注册标签并返回其key，内容相同的标签共用一个key"""
+        key = self._keys_by_id.get(id(labels))
+        if key is not None:
+            return key
+
+        key = hashlib.blake2b(_dump_labels(labels).encode('utf-8'), digest_size=8).hexdigest()
+        self._axes.setdefault(key, labels)
+        self._keys_by_id[id(labels)] = key
+        self._registered.append(labels)
+        return key
+
+    def reference(self, labels: List[Any]) -> JsCode:
+        """引用共享维度的JS表达式"""
+        return JsCode(f"{self.variable}['{self.key(labels)}']")
+
+    def script(self) -> str:
+        """定义全部共享维度的JS，需在引用它们的图表之前执行"""
+        lines = [f"var {self.variable} = window.{self.variable} || (window.{self.variable} = {{}});"]
+        for key, labels in self._axes.items():
+            lines.append(f"{self.variable}['{key}'] = {_dump_labels(labels)};")
+        return '\n'.join(lines)
+
+
+def _axis_dict(axis: Any) -> dict:
+    return axis.opts if hasattr(axis, 'opts') else axis
+
+
+def _series_values(data: Any, labels: List[Any]) -> Optional[list]:
+    """
+    从序列数据中取出y值，数据不是与x轴逐点对应的标量或[x, y]时返回None
+
+    二元素数据只有第一个元素等于对应的x轴标签时才视为[x, y]，
+    否则（如K线的[low, high]）保持原样
+    """
+    if not isinstance(data, list) or len(data) != len(labels):
+        return None
+
+    values = []
+    for item, label in zip(data, labels):
+        if isinstance(item, (list, tuple)):
+            if len(item) != 2 or item[0] != label:
+                return None
+            item = item[1]
+        if isinstance(item, (dict, list, tuple)) or hasattr(item, 'opts'):
+            return None
+        values.append(item)
+    return values
+
+
+def apply_dataset(chart: Any, shared: Optional[SharedDataset] = None) -> Any:
+    """
+    将图表改为dataset输出模式（原地修改）
+
+    同一option中x轴标签相同的序列放入同一个dataset，各序列通过encode引用自己的维度；
+    指定shared时x轴维度引用页面级共享数组。无法转换的序列保持原样。
+
+    Args:
+        chart: 已构建的Line/Bar或Grid
+        shared: 页面级共享维度
+
+    Returns:
+        传入的图表
+    """
+    options = chart.options
+    axes = [_axis_dict(axis) for axis in (options.get('xAxis') or [])]
+    series_list = options.get('series') or []
+
+    datasets: List[dict] = []
+    dataset_by_labels: Dict[str, int] = {}
+    converted_axes = set()
+    unconverted_axes = set()
+
+    for idx, series in enumerate(series_list):
+        axis_index = series.get('xAxisIndex') or 0
+        if axis_index >= len(axes) or not isinstance(axes[axis_index].get('data'), list):
+            continue
+        labels = axes[axis_index]['data']
+        values = _series_values(series.get('data'), labels)
+        if values is None:
+            unconverted_axes.add(axis_index)
+            continue
+
+        labels_key = shared.key(labels) if shared is not None else _dump_labels(labels)
+        dataset_index = dataset_by_labels.get(labels_key)
+        if dataset_index is None:
+            dataset_index = dataset_by_labels[labels_key] = len(datasets)
+            x_source = shared.reference(labels) if shared is not None else labels
+            datasets.append({'dimensions': [X_DIMENSION], 'source': {X_DIMENSION: x_source}})
+
+        dimension = f"s{idx}"
+        dataset = datasets[dataset_index]
+        dataset['dimensions'].append(dimension)
+        dataset['source'][dimension] = values
+
+        series['data'] = None
+        series['datasetIndex'] = dataset_index
+        series['encode'] = {'x': X_DIMENSION, 'y': dimension}
+        converted_axes.add(axis_index)
+
+    if not datasets:
+        return chart
+
+    # 所有序列都已引用dataset的类目轴不再单独携带标签
+    for axis_index in converted_axes - unconverted_axes:
+        axes[axis_index]['data'] = None
+    options['dataset'] = datasets
+    return chart
+
+
+class DatasetPage(Page):
+    """在第一个图表之前输出SharedDataset定义的Page"""
+
+    def __init__(self, shared: SharedDataset, **kwargs):
+        super().__init__(**kwargs)
+        self.shared = shared
+
+    def render(self, *args, **kwargs) -> str:
+        return self._with_dataset_script(super().render, *args, **kwargs)
+
+    def render_embed(self, *args, **kwargs) -> str:
+        return self._with_dataset_script(super().render_embed, *args, **kwargs)
+
+    def _with_dataset_script(self, render, *args, **kwargs) -> str:
+        """渲染期间把共享维度的定义临时放到第一个图表的js_functions最前面"""
+        first = next((c for c in self if hasattr(c, 'js_functions') and hasattr(c, 'dump_options')), None)
+        if first is None or not self.shared.axis_count:
+            return render(*args, **kwargs)
+
+        items = first.js_functions.items
+        items.insert(0, self.shared.script())
+        try:
+            return render(*args, **kwargs)
+        finally:
+            items.pop(0)
@@ -0,0 +1,734 @@
+"""
+静态图片导出
+纯Python的SVG后端，直接根据option绘制折线图、面积图和柱状图，不依赖浏览器；
+ImageExporter维护常驻的渲染进程池，批量图表并发渲染。PNG需要可选依赖cairosvg。
+"""
+import html
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import simplejson
+from pyecharts.charts.base import default as _json_default
+
+try:
+    from ..core.instrumentation import span
+except ImportError:
+    from core.instrumentation import span
+
+try:
+    import cairosvg
+except ImportError:
+    # cairosvg为可选依赖: pip install visualkit[image]
+    cairosvg = None
+
+
+# 支持的图片格式
+IMAGE_FORMATS = ('svg', 'png')
+
+# 图表宽高为百分比时使用的画布大小
+DEFAULT_WIDTH = 960
+DEFAULT_HEIGHT = 500
+
+# 与ECharts默认主题一致的配色
+_PALETTE = [
+    '#5470c6', '#91cc75', '#fac858', '#ee6666', '#73c0de',
+    '#3ba272', '#fc8452', '#9a60b4', '#ea7ccc'
+]
+_FONT_FAMILY = "'Microsoft YaHei', 'PingFang SC', 'Noto Sans CJK SC', 'WenQuanYi Micro Hei', sans-serif"
+_TEXT_COLOR = '#464646'
+_AXIS_COLOR = '#6e7079'
+_SPLIT_COLOR = '#e0e6f1'
+_INACTIVE_COLOR = '#cccccc'
+
+
+def _plain_options(chart: Any) -> dict:
+    """图表或option字典转为纯JSON结构（Opts对象展开，JsCode保留为字符串）"""
+    options = chart if isinstance(chart, dict) else chart.get_options()
+    return json.loads(simplejson.dumps(options, default=_json_default, ignore_nan=True))
+
+
+def _as_list(value: Any) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _pixels(value: Any, total: float, fallback: Optional[float] = None) -> Optional[float]:
+    """解析'50px'、'10%'或数字形式的位置和尺寸"""
+    if value is None:
+        return fallback
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    try:
+        if text.endswith('%'):
+            return float(text[:-1]) / 100 * total
+        return float(text[:-2] if text.endswith('px') else text)
+    except ValueError:
+        return fallback
+
+
+def _canvas_size(chart: Any, width: Optional[int], height: Optional[int]) -> Tuple[int, int]:
+    """画布大小：显式指定优先，其次图表的像素宽高，百分比时使用默认值"""
+    if width is None:
+        width = _pixels(getattr(chart, 'width', None), 0) or DEFAULT_WIDTH
+    if height is None:
+        height = _pixels(getattr(chart, 'height', None), 0) or DEFAULT_HEIGHT
+    return int(width), int(height)
+
+
+def _text_width(text: str, size: float) -> float:
+    """估算文字宽度，中日韩字符按一个字号，其余按0.6个字号"""
+    return sum(size if ord(ch) >= 0x2e80 else size * 0.6 for ch in text)
+
+
+def _float(value: Any) -> float:
+    """数值转为float，None和无法转换的值为NaN"""
+    try:
+        return np.nan if value is None else float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _number(value: float) -> str:
+    return f"{value:.1f}"
+
+
+def _text(x: float, y: float, text: Any, size: float = 12, color: str = _AXIS_COLOR,
+          anchor: str = 'middle', weight: str = 'normal', rotate: float = 0) -> str:
+    transform = f' transform="rotate({-rotate:g} {_number(x)} {_number(y)})"' if rotate else ''
+    return (
+        f'<text x="{_number(x)}" y="{_number(y)}" font-size="{size:g}" fill="{color}" '
+        f'text-anchor="{anchor}" font-weight="{weight}"{transform}>{html.escape(str(text))}</text>'
+    )
+
+
+def _nice_ticks(low: float, high: float, count: int = 5) -> np.ndarray:
+    """按1/2/5的倍数生成覆盖[low, high]的刻度"""
+    if not np.isfinite(low) or not np.isfinite(high):
+        low, high = 0.0, 1.0
+    if low == high:
+        pad = abs(low) * 0.1 or 1.0
+        low, high = low - pad, high + pad
+    raw = (high - low) / max(count, 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m for m in (1, 2, 2.5, 5, 10) if raw / magnitude <= m) * magnitude
+    start = math.floor(low / step + 1e-9) * step
+    end = math.ceil(high / step - 1e-9) * step
+    return np.linspace(start, end, int(round((end - start) / step)) + 1)
+
+
+def _tick_label(value: float, step: float, formatter: Any) -> str:
+    decimals = max(0, -math.floor(math.log10(step) + 1e-9)) if step > 0 else 0
+    label = f"{value:.{decimals}f}"
+    if label.startswith('-') and float(label) == 0:
+        label = label[1:]
+    if isinstance(formatter, str) and '{value}' in formatter and 'function' not in formatter:
+        return formatter.replace('{value}', label)
+    return label
+
+
+class _Series:
+    """解析后的序列: x为类目序号或数值，y为NaN表示缺失，low不为None时是区间柱"""
+
+    __slots__ = ('type', 'name', 'color', 'x_index', 'y_index', 'x', 'y', 'low',
+                 'line_width', 'dash', 'area', 'visible')
+
+    def __init__(self, **fields):
+        for key in self.__slots__:
+            setattr(self, key, fields.get(key))
+
+
+class _Axis:
+    """坐标轴: 类目轴使用labels，数值轴使用ticks"""
+
+    def __init__(self, option: dict, kind: str):
+        self.option = option
+        self.type = option.get('type') or kind
+        self.grid_index = option.get('gridIndex') or 0
+        self.labels: Optional[list] = None
+        self.ticks: Optional[np.ndarray] = None
+        self.lower = 0.0
+        self.upper = 1.0
+
+    @property
+    def is_category(self) -> bool:
+        return self.type not in ('value', 'log')
+
+    def label_positions(self) -> Dict[Any, int]:
+        return {label: idx for idx, label in enumerate(self.labels or [])}
+
+    def fit(self, values: List[np.ndarray], has_bar: bool) -> None:
+        """数值轴根据数据计算范围和刻度"""
+        finite = [v[np.isfinite(v)] for v in values]
+        finite = [v for v in finite if v.size]
+        low = min(float(v.min()) for v in finite) if finite else 0.0
+        high = max(float(v.max()) for v in finite) if finite else 1.0
+        # ECharts的数值轴在scale为false时包含0，柱状图总是从0开始
+        if has_bar or not self.option.get('scale'):
+            low, high = min(low, 0.0), max(high, 0.0)
+        fixed_min = self.option.get('min')
+        fixed_max = self.option.get('max')
+        if isinstance(fixed_min, (int, float)):
+            low = float(fixed_min)
+        if isinstance(fixed_max, (int, float)):
+            high = float(fixed_max)
+        self.ticks = _nice_ticks(low, high, int(self.option.get('splitNumber') or 5))
+        self.lower = float(fixed_min) if isinstance(fixed_min, (int, float)) else float(self.ticks[0])
+        self.upper = float(fixed_max) if isinstance(fixed_max, (int, float)) else float(self.ticks[-1])
+
+
+class SVGRenderer:
+    """
+    根据ECharts option绘制SVG
+
+    支持直角坐标系中的line（含areaStyle面积图）和bar序列、多grid布局、dataset/encode数据、
+    标题、图例和坐标轴；交互组件（tooltip、dataZoom等）和JS格式化函数在静态图片中忽略。
+    数据点远多于像素时按像素列保留最小/最大值，输出大小与数据量基本无关。
+    """
+
+    def __init__(self, options: dict, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT):
+        self.options = options
+        self.width = width
+        self.height = height
+        self.palette = options.get('color') or _PALETTE
+
+    def render(self) -> str:
+        grids = [self._grid_rect(grid) for grid in (_as_list(self.options.get('grid')) or [{}])]
+        x_axes = [_Axis(axis, 'category') for axis in (_as_list(self.options.get('xAxis')) or [{}])]
+        y_axes = [_Axis(axis, 'value') for axis in (_as_list(self.options.get('yAxis')) or [{}])]
+        series = self._parse_series(x_axes)
+
+        for idx, axis in enumerate(x_axes):
+            if not axis.is_category:
+                axis.fit([s.x for s in series if s.x_index == idx and s.visible], False)
+        for idx, axis in enumerate(y_axes):
+            members = [s for s in series if s.y_index == idx and s.visible]
+            values = [s.y for s in members] + [s.low for s in members if s.low is not None]
+            axis.fit(values, any(s.type == 'bar' for s in members))
+
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+            f'viewBox="0 0 {self.width} {self.height}" font-family="{html.escape(_FONT_FAMILY)}">',
+            f'<rect width="100%" height="100%" fill="{self.options.get("backgroundColor") or "#ffffff"}"/>'
+        ]
+        for idx, rect in enumerate(grids):
+            parts.append(
+                f'<clipPath id="vk-grid-{idx}"><rect x="{_number(rect[0])}" y="{_number(rect[1])}" '
+                f'width="{_number(rect[2])}" height="{_number(rect[3])}"/></clipPath>'
+            )
+        for axis in y_axes:
+            parts.extend(self._draw_y_axis(axis, grids[min(axis.grid_index, len(grids) - 1)]))
+        bar_axes = {s.x_index for s in series if s.type == 'bar' and s.visible}
+        for idx, axis in enumerate(x_axes):
+            parts.extend(self._draw_x_axis(axis, grids[min(axis.grid_index, len(grids) - 1)], idx in bar_axes))
+        parts.extend(self._draw_series(series, x_axes, y_axes, grids))
+        parts.extend(self._draw_titles())
+        parts.extend(self._draw_legend(series))
+        parts.append('</svg>')
+        return '\n'.join(parts)
+
+    # ---- 布局 ----
+
+    def _grid_rect(self, grid: dict) -> Tuple[float, float, float, float]:
+        left = _pixels(grid.get('left'), self.width, self.width * 0.1)
+        right = _pixels(grid.get('right'), self.width, self.width * 0.1)
+        top = _pixels(grid.get('top'), self.height, 60)
+        bottom = _pixels(grid.get('bottom'), self.height, 60)
+        width = _pixels(grid.get('width'), self.width, self.width - left - right)
+        height = _pixels(grid.get('height'), self.height, self.height - top - bottom)
+        return left, top, max(width, 1.0), max(height, 1.0)
+
+    # ---- 数据 ----
+
+    def _parse_series(self, x_axes: List[_Axis]) -> List[_Series]:
+        datasets = _as_list(self.options.get('dataset'))
+        selected = {}
+        for legend in _as_list(self.options.get('legend')):
+            selected.update(legend.get('selected') or {})
+
+        parsed = []
+        for idx, series in enumerate(_as_list(self.options.get('series'))):
+            if series.get('type') not in ('line', 'bar'):
+                continue
+            x_index = series.get('xAxisIndex') or 0
+            axis = x_axes[min(x_index, len(x_axes) - 1)]
+            if series.get('encode'):
+                data = self._dataset_data(series, datasets, axis)
+            else:
+                data = series.get('data') or []
+                if axis.is_category and axis.labels is None:
+                    axis.labels = axis.option.get('data') or self._pair_labels(data)
+
+            x, y, low = self._points(series, data, axis)
+            line_style = series.get('lineStyle') or {}
+            area_style = series.get('areaStyle') or {}
+            color = (
+                (series.get('itemStyle') or {}).get('color') or line_style.get('color')
+                or self.palette[idx % len(self.palette)]
+            )
+            parsed.append(_Series(
+                type=series['type'],
+                name=series.get('name') or '',
+                color=color if isinstance(color, str) else self.palette[idx % len(self.palette)],
+                x_index=x_index,
+                y_index=series.get('yAxisIndex') or 0,
+                x=x, y=y, low=low,
+                line_width=float(line_style.get('width') or 2),
+                dash=line_style.get('type') if line_style.get('type') in ('dashed', 'dotted') else None,
+                area=float(area_style.get('opacity', 0.7)) if area_style else 0.0,
+                visible=selected.get(series.get('name'), True) is not False
+            ))
+        return parsed
+
+    def _dataset_data(self, series: dict, datasets: list, axis: _Axis) -> list:
+        """dataset模式的序列还原为[x, y]数据"""
+        index = series.get('datasetIndex') or 0
+        source = datasets[index].get('source') if index < len(datasets) else None
+        encode = series['encode']
+        labels = source.get(encode.get('x')) if isinstance(source, dict) else None
+        if not isinstance(labels, list):
+            raise ValueError("引用页面级共享维度（SharedDataset）的图表无法导出为图片，请改用dataset=True")
+        if axis.is_category and axis.labels is None:
+            axis.labels = list(labels)
+        return [[x, y] for x, y in zip(labels, source.get(encode.get('y')) or [])]
+
+    @staticmethod
+    def _pair_labels(data: list) -> list:
+        labels = []
+        for item in data:
+            if isinstance(item, list) and item and item[0] not in labels:
+                labels.append(item[0])
+        return labels
+
+    @staticmethod
+    def _points(series: dict, data: list, axis: _Axis) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """序列数据转为坐标数组，类目轴上的x为类目序号"""
+        positions = axis.label_positions() if axis.is_category else None
+        labels = axis.labels or []
+        positional = axis.is_category and len(data) == len(labels)
+        is_bar = series.get('type') == 'bar'
+
+        xs, ys, lows = [], [], []
+        for idx, item in enumerate(data):
+            if isinstance(item, dict):
+                item = item.get('value')
+            low = None
+            if isinstance(item, list):
+                if len(item) < 2:
+                    continue
+                if axis.is_category and item[0] not in positions:
+                    if not is_bar:
+                        continue
+                    # 柱状图的[low, high]为区间柱（如K线的价格区间）
+                    low, item = item[0], item[1]
+                    x = idx
+                else:
+                    x = positions[item[0]] if axis.is_category and not positional else (idx if positional else item[0])
+                    item = item[1]
+            else:
+                x = idx
+            xs.append(_float(x))
+            ys.append(_float(item))
+            lows.append(_float(low))
+
+        low_array = np.asarray(lows, dtype=np.float64)
+        if not np.isfinite(low_array).any():
+            low_array = None
+        return np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64), low_array
+
+    # ---- 坐标映射 ----
+
+    @staticmethod
+    def _x_scale(axis: _Axis, rect: Tuple[float, float, float, float], has_bar: bool):
+        left, _, width, _ = rect
+        if axis.is_category:
+            count = max(len(axis.labels or []), 1)
+            boundary = axis.option.get('boundaryGap')
+            if boundary is None:
+                boundary = has_bar
+            if boundary or count == 1:
+                band = width / count
+                return lambda v: left + (np.asarray(v) + 0.5) * band, band
+            band = width / (count - 1)
+            return lambda v: left + np.asarray(v) * band, band
+        span_ = (axis.upper - axis.lower) or 1.0
+        return lambda v: left + (np.asarray(v) - axis.lower) / span_ * width, width / 20
+
+    @staticmethod
+    def _y_scale(axis: _Axis, rect: Tuple[float, float, float, float]):
+        _, top, _, height = rect
+        span_ = (axis.upper - axis.lower) or 1.0
+        return lambda v: top + height - (np.asarray(v) - axis.lower) / span_ * height
+
+    # ---- 绘制 ----
+
+    def _draw_y_axis(self, axis: _Axis, rect) -> List[str]:
+        option = axis.option
+        if option.get('show') is False:
+            return []
+        left, top, width, height = rect
+        scale = self._y_scale(axis, rect)
+        label_opts = option.get('axisLabel') or {}
+        split = (option.get('splitLine') or {}).get('show', True)
+        step = float(axis.ticks[1] - axis.ticks[0]) if len(axis.ticks) > 1 else 1.0
+
+        parts = []
+        for tick in axis.ticks:
+            y = float(scale(tick))
+            if split:
+                parts.append(
+                    f'<line x1="{_number(left)}" y1="{_number(y)}" x2="{_number(left + width)}" '
+                    f'y2="{_number(y)}" stroke="{_SPLIT_COLOR}" stroke-width="1"/>'
+                )
+            if label_opts.get('show', True) is not False:
+                label = _tick_label(float(tick), step, label_opts.get('formatter'))
+                parts.append(_text(left - 8, y + 4, label, anchor='end'))
+        if option.get('name'):
+            parts.append(_text(left, top - 12, option['name'], anchor='middle'))
+        return parts
+
+    def _draw_x_axis(self, axis: _Axis, rect, has_bar: bool) -> List[str]:
+        option = axis.option
+        if option.get('show') is False:
+            return []
+        left, top, width, height = rect
+        bottom = top + height
+        label_opts = option.get('axisLabel') or {}
+        rotate = float(label_opts.get('rotate') or 0)
+        parts = [
+            f'<line x1="{_number(left)}" y1="{_number(bottom)}" x2="{_number(left + width)}" '
+            f'y2="{_number(bottom)}" stroke="{_AXIS_COLOR}" stroke-width="1"/>'
+        ]
+
+        if axis.is_category:
+            labels = axis.labels or []
+            scale, _ = self._x_scale(axis, rect, has_bar)
+            sample = max((_text_width(str(label), 12) for label in labels[:50]), default=0)
+            spacing = 16 if rotate else sample + 12
+            interval = max(1, math.ceil(len(labels) * spacing / width)) if labels else 1
+            ticks = [(float(scale(idx)), label) for idx, label in enumerate(labels) if idx % interval == 0]
+            split = (option.get('splitLine') or {}).get('show', False)
+        else:
+            scale, _ = self._x_scale(axis, rect, False)
+            step = float(axis.ticks[1] - axis.ticks[0]) if len(axis.ticks) > 1 else 1.0
+            ticks = [(float(scale(tick)), _tick_label(float(tick), step, label_opts.get('formatter')))
+                     for tick in axis.ticks]
+            split = (option.get('splitLine') or {}).get('show', False)
+
+        for x, label in ticks:
+            if split:
+                parts.append(
+                    f'<line x1="{_number(x)}" y1="{_number(top)}" x2="{_number(x)}" y2="{_number(bottom)}" '
+                    f'stroke="{_SPLIT_COLOR}" stroke-width="1"/>'
+                )
+            if label_opts.get('show', True) is not False:
+                if rotate:
+                    parts.append(_text(x, bottom + 16, label, anchor='end', rotate=rotate))
+                else:
+                    parts.append(_text(x, bottom + 20, label))
+
+        name = option.get('name')
+        if name:
+            if option.get('nameLocation') == 'middle':
+                gap = float(option.get('nameGap') or 15)
+                parts.append(_text(left + width / 2, bottom + gap + 12, name))
+            else:
+                parts.append(_text(left + width + 8, bottom + 4, name, anchor='start'))
+        return parts
+
+    def _draw_series(self, series: List[_Series], x_axes, y_axes, grids) -> List[str]:
+        parts = []
+        bars = [s for s in series if s.type == 'bar' and s.visible]
+        for item in series:
+            if not item.visible or not len(item.x):
+                continue
+            x_axis = x_axes[min(item.x_index, len(x_axes) - 1)]
+            y_axis = y_axes[min(item.y_index, len(y_axes) - 1)]
+            grid_index = min(x_axis.grid_index, len(grids) - 1)
+            rect = grids[grid_index]
+            has_bar = any(s.x_index == item.x_index for s in bars)
+            x_scale, band = self._x_scale(x_axis, rect, has_bar)
+            y_scale = self._y_scale(y_axis, rect)
+            xs, ys = x_scale(item.x), y_scale(item.y)
+            clip = f' clip-path="url(#vk-grid-{grid_index})"'
+
+            if item.type == 'bar':
+                group = [s for s in bars if s.x_index == item.x_index]
+                parts.append(self._bar_path(item, group, xs, ys, band, y_scale, y_axis, clip))
+            else:
+                parts.extend(self._line_paths(item, xs, ys, rect, y_scale, y_axis, clip))
+        return parts
+
+    @staticmethod
+    def _baseline(y_scale, axis: _Axis) -> float:
+        """面积和柱子的基线: 0在范围内时为0，否则为离0最近的边界"""
+        return float(y_scale(min(max(0.0, axis.lower), axis.upper)))
+
+    def _line_paths(self, item: _Series, xs, ys, rect, y_scale, y_axis, clip) -> List[str]:
+        runs = self._runs(xs, ys, rect[2])
+        if not runs:
+            return []
+        line = ' '.join(
+            'M' + ' L'.join(f'{_number(x)} {_number(y)}' for x, y in zip(rx, ry)) for rx, ry in runs
+        )
+        parts = []
+        if item.area > 0:
+            base = _number(self._baseline(y_scale, y_axis))
+            area = ' '.join(
+                'M' + ' L'.join(f'{_number(x)} {_number(y)}' for x, y in zip(rx, ry))
+                + f' L{_number(rx[-1])} {base} L{_number(rx[0])} {base} Z'
+                for rx, ry in runs
+            )
+            parts.append(f'<path d="{area}" fill="{item.color}" fill-opacity="{item.area:g}" stroke="none"{clip}/>')
+        dash = {'dashed': ' stroke-dasharray="6 4"', 'dotted': ' stroke-dasharray="2 3"'}.get(item.dash, '')
+        parts.append(
+            f'<path d="{line}" fill="none" stroke="{item.color}" stroke-width="{item.line_width:g}" '
+            f'stroke-linejoin="round"{dash}{clip}/>'
+        )
+        return parts
+
+    @staticmethod
+    def _runs(xs: np.ndarray, ys: np.ndarray, width: float) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """按缺失值拆分为连续片段，点数远多于像素时每个像素列只保留最小和最大值"""
+        valid = np.isfinite(ys)
+        edges = np.flatnonzero(np.diff(np.r_[0, valid.astype(np.int8), 0]))
+        runs = []
+        for start, stop in zip(edges[::2], edges[1::2]):
+            rx, ry = xs[start:stop], ys[start:stop]
+            if len(rx) > 2 * width:
+                buckets = np.floor(rx - rx[0]).astype(np.int64)
+                starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+                low = np.minimum.reduceat(ry, starts)
+                high = np.maximum.reduceat(ry, starts)
+                rx = np.repeat(rx[starts], 2)
+                ry = np.column_stack([high, low]).ravel()
+            runs.append((rx, ry))
+        return runs
+
+    def _bar_path(self, item: _Series, group: List[_Series], xs, ys, band, y_scale, y_axis, clip) -> str:
+        slot = band * 0.7 / max(len(group), 1)
+        offset = (group.index(item) - (len(group) - 1) / 2) * slot
+        bar_width = max(slot * 0.9, 0.5)
+        base = self._baseline(y_scale, y_axis)
+        lows = y_scale(item.low) if item.low is not None else np.full(len(ys), base)
+        valid = np.isfinite(ys) & np.isfinite(lows)
+
+        rects = []
+        for x, y, low in zip(xs[valid] + offset, ys[valid], lows[valid]):
+            top, bottom = min(y, low), max(y, low)
+            rects.append(
+                f'M{_number(x - bar_width / 2)} {_number(top)}h{_number(bar_width)}'
+                f'v{_number(max(bottom - top, 0.5))}h{_number(-bar_width)}Z'
+            )
+        return f'<path d="{"".join(rects)}" fill="{item.color}" stroke="none"{clip}/>'
+
+    def _draw_titles(self) -> List[str]:
+        parts = []
+        for title in _as_list(self.options.get('title')):
+            if title.get('show') is False:
+                continue
+            text, subtext = title.get('text') or '', (title.get('subtext') or '').strip()
+            left = title.get('left')
+            if left in (None, 'left'):
+                x, anchor = 5 + float(title.get('padding') or 5), 'start'
+            elif left == 'center':
+                x, anchor = self.width / 2, 'middle'
+            elif left == 'right':
+                x, anchor = self.width - 10, 'end'
+            else:
+                x, anchor = _pixels(left, self.width, 5), 'start'
+            y = _pixels(title.get('top'), self.height, 5) + 20
+            if text:
+                parts.append(_text(x, y, text, size=18, color=_TEXT_COLOR, anchor=anchor, weight='bold'))
+            if subtext:
+                parts.append(_text(x, y + 20, subtext, anchor=anchor))
+        return parts
+
+    def _draw_legend(self, series: List[_Series]) -> List[str]:
+        legends = _as_list(self.options.get('legend'))
+        if not legends or legends[0].get('show') is False:
+            return []
+        legend = legends[0]
+        colors: Dict[str, Tuple[str, bool]] = {}
+        for item in series:
+            colors.setdefault(item.name, (item.color, item.visible))
+        names = [name for name in (legend.get('data') or list(colors)) if name in colors]
+        if not names:
+            return []
+
+        item_width = float(legend.get('itemWidth') or 25)
+        item_height = float(legend.get('itemHeight') or 14)
+        gap = float(legend.get('itemGap') or 10)
+        widths = [item_width + 5 + _text_width(str(name), 12) for name in names]
+
+        # 按可用宽度换行，每行居中
+        rows, row, used = [], [], 0.0
+        for name, width in zip(names, widths):
+            if row and used + gap + width > self.width * 0.9:
+                rows.append((row, used))
+                row, used = [], 0.0
+            used += (gap if row else 0) + width
+            row.append((name, width))
+        rows.append((row, used))
+
+        top = _pixels(legend.get('top'), self.height, 5)
+        if legend.get('top') is None and self.options.get('title'):
+            top = 40
+        parts = []
+        for row_idx, (row, used) in enumerate(rows):
+            x = (self.width - used) / 2
+            y = top + row_idx * (item_height + 8)
+            for name, width in row:
+                color, visible = colors[name]
+                fill = color if visible else _INACTIVE_COLOR
+                parts.append(
+                    f'<rect x="{_number(x)}" y="{_number(y)}" width="{item_width:g}" height="{item_height:g}" '
+                    f'rx="3" fill="{fill}"/>'
+                )
+                parts.append(_text(x + item_width + 5, y + item_height - 2, name,
+                                   color=_TEXT_COLOR if visible else _INACTIVE_COLOR, anchor='start'))
+                x += width + gap
+        return parts
+
+
+def render_svg(chart: Any, width: Optional[int] = None, height: Optional[int] = None) -> str:
+    """
+    将图表渲染为SVG文本
+
+    Args:
+        chart: pyecharts图表（Line/Bar/Grid）或option字典
+        width: 画布宽度，默认使用图表的像素宽度
+        height: 画布高度，默认使用图表的像素高度
+
+    Returns:
+        str: SVG文本
+    """
+    width, height = _canvas_size(chart, width, height)
+    return SVGRenderer(_plain_options(chart), width, height).render()
+
+
+def svg_to_png(svg: str, scale: float = 1.0) -> bytes:
+    """SVG转PNG，需要cairosvg"""
+    if cairosvg is None:
+        raise ImportError("导出PNG需要cairosvg，请安装: pip install visualkit[image]")
+    return cairosvg.svg2png(bytestring=svg.encode('utf-8'), scale=scale)
+
+
+def _render_task(task: Tuple[dict, int, int, str, float]) -> bytes:
+    """进程池中执行的渲染任务，参数和结果都是可序列化的普通对象"""
+    options, width, height, fmt, scale = task
+    svg = SVGRenderer(options, width, height).render()
+    return svg_to_png(svg, scale) if fmt == 'png' else svg.encode('utf-8')
+
+
+def _worker_pid(_: int) -> int:
+    """用于预热进程池的空任务"""
+    return os.getpid()
+
+
+class ImageExporter:
+    """
+    批量静态图片导出
+
+    用法:
+        with ImageExporter(fmt='png', max_workers=4) as exporter:
+            exporter.save({'close': line, 'seasonal': grid}, directory='report')
+
+    渲染进程池在第一次使用时创建并一直保留，后续批次复用已经启动的进程；
+    max_workers为1时在当前进程中渲染。option在主进程中展开为普通结构后再分发。
+    """
+
+    def __init__(
+        self,
+        fmt: str = 'svg',
+        max_workers: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        scale: float = 1.0
+    ):
+        """
+        Args:
+            fmt: 图片格式，'svg'或'png'
+            max_workers: 渲染进程数，默认为CPU核数
+            width: 画布宽度，默认使用各图表的像素宽度
+            height: 画布高度，默认使用各图表的像素高度
+            scale: PNG的缩放倍数，2时输出高分辨率图片
+        """
+        if fmt not in IMAGE_FORMATS:
+            raise ValueError(f"不支持的图片格式: {fmt}，可选: {', '.join(IMAGE_FORMATS)}")
+        if fmt == 'png' and cairosvg is None:
+            raise ImportError("导出PNG需要cairosvg，请安装: pip install visualkit[image]")
+
+        self.fmt = fmt
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ImageExporter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def warm(self) -> 'ImageExporter':
+        """预先启动所有渲染进程"""
+        if self.max_workers > 1:
+            executor = self._pool()
+            list(executor.map(_worker_pid, range(self.max_workers)))
+        return self
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def render(self, charts: Iterable[Any]) -> List[bytes]:
+        """
+        批量渲染，结果顺序与输入一致
+
+        Args:
+            charts: pyecharts图表或option字典
+
+        Returns:
+            List[bytes]: SVG文本（UTF-8编码）或PNG数据
+        """
+        tasks = [
+            (_plain_options(chart), *_canvas_size(chart, self.width, self.height), self.fmt, self.scale)
+            for chart in charts
+        ]
+        with span('image_export.render', charts=len(tasks), format=self.fmt):
+            if self.max_workers == 1 or len(tasks) <= 1:
+                return [_render_task(task) for task in tasks]
+            chunksize = max(1, len(tasks) // (self.max_workers * 4))
+            return list(self._pool().map(_render_task, tasks, chunksize=chunksize))
+
+    def save(self, charts: Mapping[str, Any], directory: str = '.') -> List[str]:
+        """
+        批量渲染并写出文件
+
+        Args:
+            charts: 文件名（不含扩展名）到图表的映射
+            directory: 输出目录
+
+        Returns:
+            List[str]: 写出的文件路径
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = [os.path.join(directory, f"{name}.{self.fmt}") for name in charts]
+        for path, data in zip(paths, self.render(charts.values())):
+            with open(path, 'wb') as f:
+                f.write(data)
+        return paths
+
+    def close(self) -> None:
+        """关闭渲染进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -1,12 +1,26 @@
 from pyecharts import options as opts
-from pyecharts.charts import Line, Grid, Page
+from pyecharts.charts import Line, Grid
 from pyecharts.commons.utils import JsCode
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-from core.data_processor import DataProcessor
+try:
+    from ..core.calendar_manager import CalendarManager
+    from ..core.data_processor import DataProcessor
+    from ..core.instrumentation import span, traced
+    from ..core.date_parsing import prepare_frame
+    from ..core.frame_protocol import FrameLike, to_pandas
+except ImportError:
+    from core.calendar_manager import CalendarManager
+    from core.data_processor import DataProcessor
+    from core.instrumentation import span, traced
+    from core.date_parsing import prepare_frame
+    from core.frame_protocol import FrameLike, to_pandas
+
+from .dashboard import Dashboard
+from .dataset import SharedDataset, apply_dataset
 
 class SeasonalChart:
     """季节性图表生成器（基于pyecharts）"""
@@ -19,9 +33,10 @@ class SeasonalChart:
     def __init__(self):
         self.data_processor = DataProcessor()
     
+    @traced('seasonal_chart.create_seasonal_line')
     def create_seasonal_line(
         self,
-        df: pd.DataFrame,
+        df: FrameLike,
         date_col: str = 'date',
         value_col: str = 'value',
         title: str = "季节性分析",
@@ -31,121 +46,145 @@ class SeasonalChart:
         spring_range: Tuple[int, int] = (-70, 70),
         show_yoy: bool = True,
         width: str = "100%",
-        height: str = "500px"
+        height: str = "500px",
+        dataset: Union[bool, SharedDataset] = False
     ) -> Line:
-        """创建季节性折线图"""
+        """
+        创建季节性折线图
+        
+        dataset为True时各年份序列通过ECharts dataset引用同一个x轴维度；
+        传入SharedDataset时x轴引用页面级共享数组，需通过DatasetPage渲染；
+        df也可以是pyarrow/polars数据框，只取日期列和数值列，不转换整表
+        """
+        # 非pandas输入转换出的DataFrame归本方法所有，不需要再做防御性拷贝
+        owned = not isinstance(df, pd.DataFrame)
+        df = to_pandas(df, [date_col, value_col])
         
         # 数据准备
-        if calendar_type == 'lunar':
-            processed_df = self._prepare_lunar_data(df, date_col, value_col, spring_range)
-            x_col = 'lunar_day'
-            x_label = "距离春节天数"
-        else:
-            processed_df = self._prepare_gregorian_data(df, date_col, value_col)
-            x_col = 'month'
-            x_label = "月份"
+        with span('seasonal_chart.prepare', calendar_type=calendar_type, rows=len(df)):
+            if calendar_type == 'lunar':
+                processed_df = self._prepare_lunar_data(df, date_col, value_col, spring_range)
+                x_col = 'lunar_day'
+                x_label = "距离春节天数"
+            else:
+                processed_df = self._prepare_gregorian_data(df, date_col, value_col, copy=not owned)
+                x_col = 'month'
+                x_label = "月份"
         
         # 选择最近N年
         latest_years = sorted(processed_df['year'].unique())[-years:]
         chart_data = processed_df[processed_df['year'].isin(latest_years)]
         
         # 计算统计值
-        stats = self.data_processor.calculate_yoy_ytd(
-            df.sort_values(date_col), 
-            value_col, 
-            date_col
-        )
-        
-        # 创建图表
-        line = Line(init_opts=opts.InitOpts(width=width, height=height))
-        
-        # 添加x轴数据
-        x_data = chart_data[x_col].unique().tolist()
-        x_data.sort()
-        line.add_xaxis(x_data)
+        with span('seasonal_chart.stats'):
+            stats = self.data_processor.calculate_yoy_ytd(
+                df.sort_values(date_col), 
+                value_col, 
+                date_col
+            )
         
-        # 为每个年份准备数据，确保没有重复的x值
-        for year in latest_years:
-            year_data = chart_data[chart_data['year'] == year]
-            # 按x_col分组并取平均值，以处理重复值
-            grouped_data = year_data.groupby(x_col)[value_col].mean().reset_index()
-            # 重新索引以确保所有x值都有数据
-            indexed_data = grouped_data.set_index(x_col).reindex(x_data)
-            y_data = indexed_data[value_col].tolist()
+        with span('seasonal_chart.build_options', series=len(latest_years)):
+            # 创建图表
+            line = Line(init_opts=opts.InitOpts(width=width, height=height))
             
-            # 高亮最新年份
-            is_latest = year == latest_years[-1]
-            line.add_yaxis(
-                series_name=str(year),
-                y_axis=y_data,
-                is_symbol_show=is_latest,
-                symbol_size=6 if is_latest else 0,
-                linestyle_opts=opts.LineStyleOpts(
-                    width=3 if is_latest else 2,
-                    color=self.DEFAULT_COLORS[latest_years.index(year) % len(self.DEFAULT_COLORS)]
+            # 添加x轴数据
+            x_data = chart_data[x_col].unique().tolist()
+            x_data.sort()
+            line.add_xaxis(x_data)
+            
+            # 为每个年份准备数据，确保没有重复的x值
+            for year in latest_years:
+                year_data = chart_data[chart_data['year'] == year]
+                # 按x_col分组并取平均值，以处理重复值
+                grouped_data = year_data.groupby(x_col)[value_col].mean().reset_index()
+                # 重新索引以确保所有x值都有数据
+                indexed_data = grouped_data.set_index(x_col).reindex(x_data)
+                y_data = indexed_data[value_col].tolist()
+                
+                # 高亮最新年份
+                is_latest = year == latest_years[-1]
+                line.add_yaxis(
+                    series_name=str(year),
+                    y_axis=y_data,
+                    is_symbol_show=is_latest,
+                    symbol_size=6 if is_latest else 0,
+                    linestyle_opts=opts.LineStyleOpts(
+                        width=3 if is_latest else 2,
+                        color=self.DEFAULT_COLORS[latest_years.index(year) % len(self.DEFAULT_COLORS)]
+                    ),
+                    itemstyle_opts=opts.ItemStyleOpts(
+                        color=self.DEFAULT_COLORS[latest_years.index(year) % len(self.DEFAULT_COLORS)]
+                    ),
+                    label_opts=opts.LabelOpts(is_show=is_latest)
+                )
+            
+            # 全局配置
+            line.set_global_opts(
+                title_opts=opts.TitleOpts(
+                    title=title,
+                    subtitle=f"{subtitle} | 最新值: {stats['latest_value']:.2f} | YoY: {stats['yoy']:.1f}% | YTD: {stats['ytd']:.1f}%",
+                    pos_left="center"
+                ),
+                # dataset模式和[x, y]数据的value为数组，按encode取y值（JsCode会去掉换行，JS中不能写行注释）
+                tooltip_opts=opts.TooltipOpts(
+                    trigger="axis",
+                    axis_pointer_type="cross",
+                    formatter=JsCode("""
+                        function(params) {
+                            let result = params[0].axisValue + '<br/>';
+                            params.forEach(param => {
+                                let value = Array.isArray(param.value) ? param.value[param.encode.y[0]] : param.value;
+                                result += param.marker + param.seriesName + ': ' + (value == null ? '-' : value.toFixed(2)) + '<br/>';
+                            });
+                            return result;
+                        }
+                    """)
                 ),
-                itemstyle_opts=opts.ItemStyleOpts(
-                    color=self.DEFAULT_COLORS[latest_years.index(year) % len(self.DEFAULT_COLORS)]
+                legend_opts=opts.LegendOpts(
+                    type_="scroll",
+                    orient="horizontal",
+                    pos_top="5%",
+                    pos_left="center"
                 ),
-                label_opts=opts.LabelOpts(is_show=is_latest)
+                xaxis_opts=opts.AxisOpts(
+                    type_="category",
+                    boundary_gap=False,
+                    name=x_label,
+                    name_location="middle",
+                    name_gap=30,
+                    axislabel_opts=opts.LabelOpts(rotate=0)
+                ),
+                yaxis_opts=opts.AxisOpts(
+                    type_="value",
+                    splitline_opts=opts.SplitLineOpts(is_show=True),
+                    axislabel_opts=opts.LabelOpts(formatter="{value}")
+                ),
+                datazoom_opts=[
+                    opts.DataZoomOpts(type_="inside", range_start=0, range_end=100),
+                    opts.DataZoomOpts(type_="slider", range_start=0, range_end=100)
+                ]
             )
         
-        # 全局配置
-        line.set_global_opts(
-            title_opts=opts.TitleOpts(
-                title=title,
-                subtitle=f"{subtitle} | 最新值: {stats['latest_value']:.2f} | YoY: {stats['yoy']:.1f}% | YTD: {stats['ytd']:.1f}%",
-                pos_left="center"
-            ),
-            tooltip_opts=opts.TooltipOpts(
-                trigger="axis",
-                axis_pointer_type="cross",
-                formatter=JsCode("""
-                    function(params) {
-                        let result = params[0].axisValue + '<br/>';
-                        params.forEach(param => {
-                            result += param.marker + param.seriesName + ': ' + param.value.toFixed(2) + '<br/>';
-                        });
-                        return result;
-                    }
-                """)
-            ),
-            legend_opts=opts.LegendOpts(
-                type_="scroll",
-                orient="horizontal",
-                pos_top="5%",
-                pos_left="center"
-            ),
-            xaxis_opts=opts.AxisOpts(
-                type_="category",
-                boundary_gap=False,
-                name=x_label,
-                name_location="middle",
-                name_gap=30,
-                axislabel_opts=opts.LabelOpts(rotate=0)
-            ),
-            yaxis_opts=opts.AxisOpts(
-                type_="value",
-                splitline_opts=opts.SplitLineOpts(is_show=True),
-                axislabel_opts=opts.LabelOpts(formatter="{value}")
-            ),
-            datazoom_opts=[
-                opts.DataZoomOpts(type_="inside", range_start=0, range_end=100),
-                opts.DataZoomOpts(type_="slider", range_start=0, range_end=100)
-            ]
-        )
-        
+        if dataset:
+            apply_dataset(line, dataset if isinstance(dataset, SharedDataset) else None)
         return line
     
+    @traced('seasonal_chart.create_seasonal_grid')
     def create_seasonal_grid(
         self,
-        df: pd.DataFrame,
+        df: FrameLike,
         date_col: str = 'date',
         value_cols: List[str] = None,
+        dataset: Union[bool, SharedDataset] = False,
         **kwargs
     ) -> Grid:
-        """创建多指标季节性网格图"""
+        """
+        创建多指标季节性网格图
         
+        dataset为True时x轴相同的子图共用一个ECharts dataset；
+        传入SharedDataset时x轴引用页面级共享数组，需通过DatasetPage渲染
+        """
+        df = to_pandas(df, [date_col] + list(value_cols) if value_cols is not None else None)
         if value_cols is None:
             value_cols = [col for col in df.columns if col != date_col]
         
@@ -176,12 +215,57 @@ class SeasonalChart:
                 )
             )
         
+        if dataset:
+            apply_dataset(grid, dataset if isinstance(dataset, SharedDataset) else None)
         return grid
     
-    def _prepare_gregorian_data(self, df: pd.DataFrame, date_col: str, value_col: str) -> pd.DataFrame:
+    @traced('seasonal_chart.create_seasonal_dashboard')
+    def create_seasonal_dashboard(
+        self,
+        df: FrameLike,
+        date_col: str = 'date',
+        value_cols: List[str] = None,
+        title: str = "季节性分析",
+        columns: int = 2,
+        chart_height: str = "400px",
+        payload: str = 'inline',
+        **kwargs
+    ) -> Dashboard:
+        """
+        创建多指标季节性仪表盘
+        
+        每个指标一个独立图表，option在滚动到可视区域时才加载，
+        适合指标很多、create_seasonal_grid生成的页面过大的场景
+        
+        Args:
+            columns: 每行的图表数
+            chart_height: 每个图表的高度
+            payload: option的存放方式，'inline'（页内压缩）或'sidecar'（旁路文件）
+            **kwargs: 传给create_seasonal_line的参数
+        """
+        df = to_pandas(df, [date_col] + list(value_cols) if value_cols is not None else None)
+        if value_cols is None:
+            value_cols = [col for col in df.columns if col != date_col]
+        
+        kwargs.pop('title', None)
+        dashboard = Dashboard(title, columns=columns, chart_height=chart_height, payload=payload)
+        for col in value_cols:
+            chart = self.create_seasonal_line(
+                df[[date_col, col]].rename(columns={col: 'value'}),
+                date_col=date_col,
+                value_col='value',
+                title=col,
+                **kwargs
+            )
+            dashboard.add(chart)
+        
+        return dashboard
+    
+    def _prepare_gregorian_data(
+        self, df: pd.DataFrame, date_col: str, value_col: str, copy: bool = True
+    ) -> pd.DataFrame:
         """准备公历数据"""
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col])
+        df = prepare_frame(df, date_col, [date_col, value_col], sort=False, copy=copy)
         df['year'] = df[date_col].dt.year
         df['month'] = df[date_col].dt.month
         return df
@@ -194,7 +278,5 @@ class SeasonalChart:
         spring_range: Tuple[int, int]
     ) -> pd.DataFrame:
         """准备农历数据（春节对齐）"""
-        from core.calendar_manager import CalendarManager
-        
         calendar = CalendarManager()
         return calendar.get_lunar_aligned_data(df, date_col, value_col, spring_range)
\ No newline at end of file
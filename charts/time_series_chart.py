@@ -4,11 +4,22 @@
 """
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime
 from pyecharts.charts import Line, Bar
 from pyecharts import options as opts
 from .base_chart import BaseChart
+from .dataset import SharedDataset, apply_dataset
+try:
+    from ..core.instrumentation import span, traced
+    from ..core.date_labels import date_labels
+    from ..core.date_parsing import parse_dates, prepare_frame
+    from ..core.frame_protocol import FrameLike, to_pandas
+except ImportError:
+    from core.instrumentation import span, traced
+    from core.date_labels import date_labels
+    from core.date_parsing import parse_dates, prepare_frame
+    from core.frame_protocol import FrameLike, to_pandas
 
 
 class TimeSeriesChart(BaseChart):
@@ -17,12 +28,13 @@ class TimeSeriesChart(BaseChart):
     def __init__(self):
         super().__init__()
     
-    def create_chart(self, df: pd.DataFrame, **kwargs) -> Line:
+    def create_chart(self, df: FrameLike, **kwargs) -> Line:
         """创建默认时间序列图表"""
         # 如果没有提供特定的参数，使用默认值
         date_col = kwargs.get('date_col', 'date')
         value_cols = kwargs.get('value_cols', [])
         title = kwargs.get('title', '时间序列图')
+        df = to_pandas(df, [date_col] + list(value_cols) if value_cols else None)
         
         # 如果没有指定value_cols，尝试使用所有数值列
         if not value_cols:
@@ -31,9 +43,10 @@ class TimeSeriesChart(BaseChart):
         # 调用现有的create_time_series_line方法
         return self.create_time_series_line(df, date_col, value_cols, title)
     
+    @traced('time_series_chart.create_time_series_line')
     def create_time_series_line(
         self,
-        df: pd.DataFrame,
+        df: FrameLike,
         date_col: str,
         value_cols: List[str],
         title: str = "时间序列图",
@@ -41,101 +54,169 @@ class TimeSeriesChart(BaseChart):
         smooth: bool = False,
         mark_point: bool = False,
         mark_line: bool = False,
-        area: bool = False
+        area: bool = False,
+        dataset: Union[bool, SharedDataset] = False
     ) -> Line:
-        """创建时间序列折线图"""
-        
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col])
-        df = df.sort_values(date_col)
+        """
+        创建时间序列折线图
         
-        # 创建图表
-        chart = Line(init_opts=opts.InitOpts(
-            width=self.chart_config.get('width', '100%'),
-            height=self.chart_config.get('height', '500px')
-        ))
+        dataset为True时各序列通过ECharts dataset引用同一个x轴维度；
+        传入SharedDataset时x轴引用页面级共享数组，需通过DatasetPage渲染；
+        df也可以是pyarrow/polars数据框，只取用到的列
+        """
+        df = to_pandas(df, [date_col] + list(value_cols))
         
-        # 如果需要面积图，设置面积样式
-        if area:
-            chart.set_series_opts(
-                areastyle_opts=opts.AreaStyleOpts(opacity=0.5)
-            )
+        with span('time_series_chart.parse_dates', rows=len(df)):
+            df = prepare_frame(df, date_col, [date_col] + [col for col in value_cols if col != date_col])
         
-        # 添加x轴数据
-        x_data = df[date_col].dt.strftime('%Y-%m-%d').tolist()
-        chart.add_xaxis(x_data)
+        with span('time_series_chart.format_data'):
+            x_data = date_labels(df[date_col])
+            series = {col: df[col].tolist() for col in value_cols}
         
-        # 添加y轴数据
-        for col in value_cols:
-            chart.add_yaxis(
-                series_name=col,
-                y_axis=df[col].tolist(),
-                is_smooth=smooth,
-                is_symbol_show=True,
-                symbol_size=4,
-                linestyle_opts=opts.LineStyleOpts(width=2)
-            )
+        chart = self._build_line(
+            x_data, series, title, subtitle, smooth, mark_point, mark_line, area
+        )
+        if dataset:
+            apply_dataset(chart, dataset if isinstance(dataset, SharedDataset) else None)
+        return chart
+    
+    @traced('time_series_chart.create_incremental_line')
+    def create_incremental_line(
+        self,
+        df: FrameLike,
+        date_col: str,
+        value_cols: List[str],
+        capacity: int = 1024,
+        label_unit: str = 'D',
+        **line_kwargs
+    ) -> 'TimeSeriesBuffer':
+        """
+        创建可增量追加的时间序列折线图
         
-        # 标记点和线
-        mark_point_opts = []
-        mark_line_opts = []
-        
-        if mark_point:
-            mark_point_opts = [
-                opts.MarkPointOpts(
-                    data=[
-                        opts.MarkPointItem(type_="max", name="最大值"),
-                        opts.MarkPointItem(type_="min", name="最小值")
-                    ]
+        Args:
+            df: 初始数据
+            date_col: 日期列
+            value_cols: 数值列
+            capacity: 缓冲区初始容量（不足时自动翻倍）
+            label_unit: x轴标签精度，日线为'D'，实时行情可用's'
+            **line_kwargs: 传给create_time_series_line的图表参数(title, smooth等)
+            
+        Returns:
+            TimeSeriesBuffer: 通过append追加新数据，to_chart/delta输出图表
+        """
+        buffer = TimeSeriesBuffer(
+            value_cols,
+            date_col=date_col,
+            capacity=capacity,
+            label_unit=label_unit,
+            chart=self,
+            **line_kwargs
+        )
+        if df is not None:
+            buffer.append(df)
+        return buffer
+    
+    def _build_line(
+        self,
+        x_data: List[str],
+        series: Dict[str, list],
+        title: str = "时间序列图",
+        subtitle: str = "",
+        smooth: bool = False,
+        mark_point: bool = False,
+        mark_line: bool = False,
+        area: bool = False
+    ) -> Line:
+        """根据已准备好的x轴和序列数据构建折线图"""
+
+        with span('time_series_chart.build_options', points=len(x_data), series=len(series)):
+            # 创建图表
+            chart = Line(init_opts=opts.InitOpts(
+                width=self.chart_config.get('width', '100%'),
+                height=self.chart_config.get('height', '500px')
+            ))
+            
+            # 如果需要面积图，设置面积样式
+            if area:
+                chart.set_series_opts(
+                    areastyle_opts=opts.AreaStyleOpts(opacity=0.5)
                 )
-            ]
-        
-        if mark_line:
-            mark_line_opts = [
-                opts.MarkLineOpts(
-                    data=[
-                        opts.MarkLineItem(type_="average", name="平均值")
-                    ]
+            
+            # 添加x轴数据
+            chart.add_xaxis(x_data)
+            
+            # 添加y轴数据
+            for col, values in series.items():
+                chart.add_yaxis(
+                    series_name=col,
+                    y_axis=values,
+                    is_smooth=smooth,
+                    is_symbol_show=True,
+                    symbol_size=4,
+                    linestyle_opts=opts.LineStyleOpts(width=2)
                 )
-            ]
-        
-        # 设置全局配置
-        chart.set_global_opts(
-            title_opts=opts.TitleOpts(
-                title=title,
-                subtitle=subtitle,
-                pos_left="center"
-            ),
-            tooltip_opts=opts.TooltipOpts(
-                trigger="axis",
-                axis_pointer_type="cross"
-            ),
-            legend_opts=opts.LegendOpts(
-                type_="scroll",
-                orient="horizontal",
-                pos_top="5%",
-                pos_left="center"
-            ),
-            xaxis_opts=opts.AxisOpts(
-                type_="category",
-                boundary_gap=False,
-                axislabel_opts=opts.LabelOpts(rotate=45)
-            ),
-            yaxis_opts=opts.AxisOpts(
-                type_="value",
-                splitline_opts=opts.SplitLineOpts(is_show=True)
-            ),
-            datazoom_opts=[
-                opts.DataZoomOpts(type_="inside", range_start=0, range_end=100),
-                opts.DataZoomOpts(type_="slider", range_start=0, range_end=100)
-            ]
-        )
+            
+            # 标记点和线
+            mark_point_opts = []
+            mark_line_opts = []
+            
+            if mark_point:
+                mark_point_opts = [
+                    opts.MarkPointOpts(
+                        data=[
+                            opts.MarkPointItem(type_="max", name="最大值"),
+                            opts.MarkPointItem(type_="min", name="最小值")
+                        ]
+                    )
+                ]
+            
+            if mark_line:
+                mark_line_opts = [
+                    opts.MarkLineOpts(
+                        data=[
+                            opts.MarkLineItem(type_="average", name="平均值")
+                        ]
+                    )
+                ]
+            
+            # 设置全局配置
+            chart.set_global_opts(
+                title_opts=opts.TitleOpts(
+                    title=title,
+                    subtitle=subtitle,
+                    pos_left="center"
+                ),
+                tooltip_opts=opts.TooltipOpts(
+                    trigger="axis",
+                    axis_pointer_type="cross"
+                ),
+                legend_opts=opts.LegendOpts(
+                    type_="scroll",
+                    orient="horizontal",
+                    pos_top="5%",
+                    pos_left="center"
+                ),
+                xaxis_opts=opts.AxisOpts(
+                    type_="category",
+                    boundary_gap=False,
+                    axislabel_opts=opts.LabelOpts(rotate=45)
+                ),
+                yaxis_opts=opts.AxisOpts(
+                    type_="value",
+                    splitline_opts=opts.SplitLineOpts(is_show=True)
+                ),
+                datazoom_opts=[
+                    opts.DataZoomOpts(type_="inside", range_start=0, range_end=100),
+                    opts.DataZoomOpts(type_="slider", range_start=0, range_end=100)
+                ]
+            )
         
         return chart
     
+    @traced('time_series_chart.create_candlestick_chart')
     def create_candlestick_chart(
         self,
-        df: pd.DataFrame,
+        df: FrameLike,
         date_col: str,
         open_col: str,
         close_col: str,
@@ -146,13 +227,8 @@ class TimeSeriesChart(BaseChart):
     ) -> Bar:
         """创建K线图（简化版，使用柱状图模拟）"""
         
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col])
-        df = df.sort_values(date_col)
-        
-        # 计算涨跌
-        df['change'] = df[close_col] - df[open_col]
-        df['color'] = np.where(df['change'] >= 0, '#ec0000', '#00da3c')
+        df = to_pandas(df, [date_col, open_col, close_col, low_col, high_col])
+        df = prepare_frame(df, date_col, [date_col, open_col, close_col, low_col, high_col])
         
         # 创建图表
         chart = Bar(init_opts=opts.InitOpts(
@@ -160,7 +236,7 @@ class TimeSeriesChart(BaseChart):
             height=self.chart_config.get('height', '500px')
         ))
         
-        x_data = df[date_col].dt.strftime('%Y-%m-%d').tolist()
+        x_data = date_labels(df[date_col])
         chart.add_xaxis(x_data)
         
         # 添加高低范围
@@ -173,9 +249,10 @@ class TimeSeriesChart(BaseChart):
         self.set_global_opts(chart, title, subtitle)
         return chart
     
+    @traced('time_series_chart.create_volume_chart')
     def create_volume_chart(
         self,
-        df: pd.DataFrame,
+        df: FrameLike,
         date_col: str,
         volume_col: str,
         title: str = "成交量图",
@@ -183,16 +260,15 @@ class TimeSeriesChart(BaseChart):
     ) -> Bar:
         """创建成交量柱状图"""
         
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col])
-        df = df.sort_values(date_col)
+        df = to_pandas(df, [date_col, volume_col])
+        df = prepare_frame(df, date_col, [date_col, volume_col])
         
         chart = Bar(init_opts=opts.InitOpts(
             width=self.chart_config.get('width', '100%'),
             height=self.chart_config.get('height', '300px')
         ))
         
-        x_data = df[date_col].dt.strftime('%Y-%m-%d').tolist()
+        x_data = date_labels(df[date_col])
         chart.add_xaxis(x_data)
         chart.add_yaxis(
             series_name=volume_col,
@@ -201,4 +277,168 @@ class TimeSeriesChart(BaseChart):
         )
         
         self.set_global_opts(chart, title, subtitle)
-        return chart
\ No newline at end of file
+        return chart
+
+
+class TimeSeriesBuffer:
+    """时间序列增量缓冲区（基于预分配数组，追加复杂度为O(新增行数)）"""
+    
+    def __init__(
+        self,
+        value_cols: List[str],
+        date_col: str = 'date',
+        capacity: int = 1024,
+        label_unit: str = 'D',
+        chart: Optional[TimeSeriesChart] = None,
+        **line_kwargs
+    ):
+        self.value_cols = list(value_cols)
+        self.date_col = date_col
+        self.label_unit = label_unit
+        self.chart = chart if chart is not None else TimeSeriesChart()
+        self.line_kwargs = line_kwargs
+        
+        capacity = max(int(capacity), 1)
+        self._dates = np.empty(capacity, dtype='datetime64[ns]')
+        self._values = np.empty((capacity, len(self.value_cols)), dtype=np.float64)
+        # 各列输出时的类型：整数列按整数输出，与create_time_series_line一致
+        self._dtypes: Optional[List[np.dtype]] = None
+        self._labels: List[str] = []
+        self._size = 0
+        self._emitted = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def dates(self) -> np.ndarray:
+        """已缓存的日期（只读视图）"""
+        view = self._dates[:self._size]
+        view.flags.writeable = False
+        return view
+    
+    @property
+    def values(self) -> np.ndarray:
+        """已缓存的数值矩阵，列顺序与value_cols一致（只读视图）"""
+        view = self._values[:self._size]
+        view.flags.writeable = False
+        return view
+    
+    def append(self, df: FrameLike) -> int:
+        """
+        追加新数据
+        
+        只对新增行做排序和日期格式化；新数据的日期必须晚于已有的最后一个日期。
+        
+        Returns:
+            int: 追加的行数
+        """
+        if df is None:
+            return 0
+        df = to_pandas(df, [self.date_col] + self.value_cols)
+        if len(df) == 0:
+            return 0
+        
+        dates = parse_dates(df[self.date_col])
+        is_sorted = dates.is_monotonic_increasing
+        dates = dates.to_numpy(dtype='datetime64[ns]')
+        values = df[self.value_cols].to_numpy(dtype=np.float64)
+        dtypes = [
+            df[col].dtype if isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in 'iu' else np.dtype(np.float64)
+            for col in self.value_cols
+        ]
+        
+        if not is_sorted:
+            order = np.argsort(dates, kind='stable')
+            dates = dates[order]
+            values = values[order]
+        
+        if self._size and dates[0] <= self._dates[self._size - 1]:
+            raise ValueError("增量数据的日期必须晚于已有数据的最后日期")
+        
+        n = len(dates)
+        self._reserve(self._size + n)
+        self._dates[self._size:self._size + n] = dates
+        self._values[self._size:self._size + n] = values
+        self._labels.extend(np.datetime_as_string(dates, unit=self.label_unit).tolist())
+        self._size += n
+        # 之前为整数、本次不是整数的列改为按浮点数输出
+        self._dtypes = dtypes if self._dtypes is None else [
+            old if old == new else np.dtype(np.float64) for old, new in zip(self._dtypes, dtypes)
+        ]
+        
+        return n
+    
+    def to_frame(self) -> pd.DataFrame:
+        """导出为DataFrame"""
+        df = pd.DataFrame(
+            {col: self._column(idx, 0, self._size) for idx, col in enumerate(self.value_cols)},
+            columns=self.value_cols
+        )
+        df.insert(0, self.date_col, self._dates[:self._size].copy())
+        return df
+    
+    def to_chart(self) -> Line:
+        """使用全部缓存数据构建完整图表，并将增量游标移到末尾"""
+        series = {
+            col: self._column(idx, 0, self._size).tolist()
+            for idx, col in enumerate(self.value_cols)
+        }
+        self._emitted = self._size
+        return self.chart._build_line(list(self._labels), series, **self.line_kwargs)
+    
+    def to_option(self) -> Dict:
+        """输出完整的ECharts option"""
+        return self.to_chart().get_options()
+    
+    def delta(self) -> Dict:
+        """
+        输出自上次to_chart/delta以来新增的数据
+        
+        Returns:
+            Dict: x_data为新增的x轴标签；append_data中每一项可直接传给
+                ECharts的chart.appendData(...)
+        """
+        start, end = self._emitted, self._size
+        self._emitted = end
+        
+        x_data = self._labels[start:end]
+        append_data = [
+            {
+                'seriesIndex': idx,
+                'data': [
+                    [label, value]
+                    for label, value in zip(x_data, self._column(idx, start, end).tolist())
+                ]
+            }
+            for idx in range(len(self.value_cols))
+        ]
+        
+        return {
+            'start': start,
+            'x_data': x_data,
+            'append_data': append_data
+        }
+    
+    def _column(self, idx: int, start: int, end: int) -> np.ndarray:
+        """第idx列[start, end)行的数据，整数列转换回原整数类型"""
+        values = self._values[start:end, idx]
+        if self._dtypes is None or self._dtypes[idx].kind == 'f':
+            return values.copy()
+        return values.astype(self._dtypes[idx])
+    
+    def _reserve(self, size: int) -> None:
+        """确保缓冲区容量足够，不足时按倍数扩容"""
+        capacity = len(self._dates)
+        if size <= capacity:
+            return
+        
+        while capacity < size:
+            capacity *= 2
+        
+        dates = np.empty(capacity, dtype='datetime64[ns]')
+        values = np.empty((capacity, len(self.value_cols)), dtype=np.float64)
+        dates[:self._size] = self._dates[:self._size]
+        values[:self._size] = self._values[:self._size]
+        self._dates = dates
+        self._values = values
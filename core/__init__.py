@@ -6,11 +6,33 @@
 from .data_processor import DataProcessor
 from .calendar_manager import CalendarManager
 from .wind_client import WindClient
+from .windpy_client import WindPyClient
+from .trading_calendar import TradingCalendar
+from .constituent_store import ConstituentStore
+from .timeseries_store import TimeSeriesStore
+from .single_flight import SingleFlight
+from .symbol_master import SymbolMaster
+from .economic_indicators import EconomicIndicatorCatalog
+from .instrumentation import MemorySink, LoggingSink, OpenTelemetrySink, instrument, set_sink
+from .memory_profile import MemoryProfilingSink, profile_memory, set_copy_on_write
+from .date_parsing import parse_dates, prepare_frame
+from .date_labels import DateLabelCache, date_labels
+from .frame_protocol import FrameLike, frame_kind, to_pandas
+
+_CORE_ALL = [
+    'DataProcessor', 'CalendarManager', 'WindClient', 'WindPyClient',
+    'TradingCalendar', 'ConstituentStore', 'TimeSeriesStore', 'SingleFlight',
+    'SymbolMaster', 'EconomicIndicatorCatalog',
+    'MemorySink', 'LoggingSink', 'OpenTelemetrySink', 'instrument', 'set_sink',
+    'MemoryProfilingSink', 'profile_memory', 'set_copy_on_write',
+    'parse_dates', 'prepare_frame', 'DateLabelCache', 'date_labels',
+    'FrameLike', 'frame_kind', 'to_pandas'
+]
 
 # 新增akshare客户端支持
 try:
-    from .akshare_client import AkShareClient
-    __all__ = ['DataProcessor', 'CalendarManager', 'WindClient', 'AkShareClient']
+    from .akshare_client import AkShareClient, AsyncAkShareClient
+    __all__ = _CORE_ALL + ['AkShareClient', 'AsyncAkShareClient']
 except ImportError:
     # akshare未安装时跳过
-    __all__ = ['DataProcessor', 'CalendarManager', 'WindClient']
\ No newline at end of file
+    __all__ = _CORE_ALL
\ No newline at end of file
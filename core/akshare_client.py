@@ -3,19 +3,93 @@ akshare数据接口模块
 提供通过akshare获取金融和市场数据的便捷接口
 """
 
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import akshare as ak
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 from datetime import datetime, timedelta
 import warnings
 
+from .economic_indicators import EconomicIndicatorCatalog
+from .instrumentation import span, traced
+from .single_flight import SingleFlight, single_flight
+from .symbol_master import SymbolMaster
+
 warnings.filterwarnings('ignore')
 
+# 同步接口共享的单飞合并器，相同参数的并发请求只访问一次上游
+akshare_flight = SingleFlight()
+
+
+def _write_through(source: str) -> Callable:
+    """装饰器：设置了AkShareClient.store时，优先从本地存储读取并将新数据写入存储"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+            store = AkShareClient.store
+            if store is None:
+                return func(symbol, start_date, end_date)
+            
+            if store.covers(source, symbol, start_date, end_date):
+                with span('akshare.store_read', source=source, symbol=symbol):
+                    return store.read(source, symbol, start_date, end_date)
+            
+            df = func(symbol, start_date, end_date)
+            with span('akshare.store_write', source=source, symbol=symbol, rows=len(df)):
+                store.write(df, source, symbol, start_date, end_date)
+            return df
+        return wrapper
+    return decorator
+
 
 class AkShareClient:
     """akshare数据客户端"""
     
+    # 可选的本地时间序列存储（TimeSeriesStore）
+    store = None
+    
+    # 代码主数据缓存，首次使用时创建
+    symbol_master: Optional[SymbolMaster] = None
+    
+    # 经济指标目录，首次使用时创建
+    indicator_catalog: Optional[EconomicIndicatorCatalog] = None
+    
+    @staticmethod
+    def set_store(store) -> None:
+        """设置本地时间序列存储，None表示关闭"""
+        AkShareClient.store = store
+    
+    @staticmethod
+    def set_symbol_master(master: Optional[SymbolMaster]) -> None:
+        """设置代码主数据缓存（如指定缓存目录），None表示恢复默认"""
+        AkShareClient.symbol_master = master
+    
+    @staticmethod
+    def get_symbol_master() -> SymbolMaster:
+        """获取代码主数据缓存"""
+        if AkShareClient.symbol_master is None:
+            AkShareClient.symbol_master = SymbolMaster()
+        return AkShareClient.symbol_master
+    
     @staticmethod
+    def get_indicator_catalog() -> EconomicIndicatorCatalog:
+        """获取经济指标目录"""
+        if AkShareClient.indicator_catalog is None:
+            AkShareClient.indicator_catalog = EconomicIndicatorCatalog()
+        return AkShareClient.indicator_catalog
+    
+    @staticmethod
+    def flight_metrics() -> Dict[str, int]:
+        """返回请求合并统计（calls, executions, deduplicated, errors）"""
+        return akshare_flight.metrics()
+    
+    @staticmethod
+    @traced('akshare.get_stock_daily')
+    @single_flight(akshare_flight)
+    @_write_through('akshare_stock')
     def get_stock_daily(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         获取股票日线数据
@@ -71,6 +145,9 @@ class AkShareClient:
             raise RuntimeError(f"获取股票数据失败: {str(e)}")
     
     @staticmethod
+    @traced('akshare.get_index_daily')
+    @single_flight(akshare_flight)
+    @_write_through('akshare_index')
     def get_index_daily(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         获取指数日线数据
@@ -113,6 +190,9 @@ class AkShareClient:
             raise RuntimeError(f"获取指数数据失败: {str(e)}")
     
     @staticmethod
+    @traced('akshare.get_futures_daily')
+    @single_flight(akshare_flight)
+    @_write_through('akshare_futures')
     def get_futures_daily(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         获取期货日线数据
@@ -153,12 +233,14 @@ class AkShareClient:
             raise RuntimeError(f"获取期货数据失败: {str(e)}")
     
     @staticmethod
+    @traced('akshare.get_economic_indicator')
+    @single_flight(akshare_flight)
     def get_economic_indicator(indicator: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         获取经济指标数据
         
         Args:
-            indicator: 指标名称 (如: CPI, PPI, GDP)
+            indicator: 指标名称 (如: CPI, PPI, GDP，完整列表见ECONOMIC_INDICATORS)
             start_date: 开始日期 (格式: YYYY-MM-DD)
             end_date: 结束日期 (格式: YYYY-MM-DD)
             
@@ -166,29 +248,26 @@ class AkShareClient:
             DataFrame: 包含日期和指标值
         """
         try:
-            if indicator.upper() == 'CPI':
-                # 获取CPI数据
-                data = ak.macro_china_cpi()
-                data = data.rename(columns={
-                    '日期': 'date',
-                    '今值': 'value'
-                })
-            elif indicator.upper() == 'PPI':
-                # 获取PPI数据
-                data = ak.macro_china_ppi()
-                data = data.rename(columns={
-                    '日期': 'date',
-                    '今值': 'value'
-                })
-            else:
-                raise ValueError(f"不支持的经济指标: {indicator}")
-            
-            data['date'] = pd.to_datetime(data['date'])
-            mask = (data['date'] >= pd.to_datetime(start_date)) & \
-                   (data['date'] <= pd.to_datetime(end_date))
-            
-            return data[['date', 'value']]
+            return AkShareClient.get_indicator_catalog().get(indicator, start_date, end_date)
+        except Exception as e:
+            raise RuntimeError(f"获取经济指标数据失败: {str(e)}")
+    
+    @staticmethod
+    @traced('akshare.get_economic_indicators')
+    def get_economic_indicators(indicators: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        获取多个经济指标，按日期对齐为宽表
+        
+        Args:
+            indicators: 指标名称列表 (如: ["CPI", "PPI", "M2"])
+            start_date: 开始日期 (格式: YYYY-MM-DD)
+            end_date: 结束日期 (格式: YYYY-MM-DD)
             
+        Returns:
+            DataFrame: date列和每个指标一列
+        """
+        try:
+            return AkShareClient.get_indicator_catalog().get_many(list(indicators), start_date, end_date)
         except Exception as e:
             raise RuntimeError(f"获取经济指标数据失败: {str(e)}")
     
@@ -217,30 +296,124 @@ class AkShareClient:
             raise ValueError(f"不支持的数据类型: {data_type}")
     
     @staticmethod
-    def list_available_symbols(data_type: str) -> List[str]:
+    @traced('akshare.list_available_symbols')
+    @single_flight(akshare_flight)
+    def list_available_symbols(
+        data_type: str,
+        market: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
         """
-        列出可用的数据代码
+        列出可用的数据代码（来自每日刷新的本地代码表缓存）
         
         Args:
             data_type: 数据类型 (stock, index, futures)
+            market: 市场过滤 (如: SH, SZ, BJ, SHFE)
+            limit: 最多返回的数量，None表示全部
             
         Returns:
             List[str]: 可用的代码列表
         """
         try:
-            if data_type == "stock":
-                # 获取A股股票列表
-                stock_list = ak.stock_zh_a_spot()
-                return stock_list['代码'].tolist()[:50]  # 返回前50个
-            elif data_type == "index":
-                # 获取指数列表
-                index_list = ak.index_stock_zh()
-                return index_list['代码'].tolist()[:20]  # 返回前20个
-            elif data_type == "futures":
-                # 获取期货列表
-                futures_list = ak.futures_display_main_sina()
-                return futures_list['symbol'].tolist()[:30]  # 返回前30个
-            else:
-                return []
+            universe = AkShareClient.get_symbol_master().universe(data_type)
         except Exception:
-            return []
\ No newline at end of file
+            return []
+        
+        if market is not None:
+            universe = universe[universe['market'] == market.upper()]
+        codes = universe['code'].tolist()
+        return codes if limit is None else codes[:limit]
+    
+    @staticmethod
+    def search_symbols(
+        query: str,
+        data_type: str = "stock",
+        market: Optional[str] = None,
+        limit: int = 20
+    ) -> pd.DataFrame:
+        """
+        按代码或名称搜索（前缀优先，其次为包含匹配）
+        
+        Args:
+            query: 代码或名称片段 (如: 600, 平安)
+            data_type: 数据类型 (stock, index, futures)
+            market: 市场过滤 (如: SH, SZ, BJ)
+            limit: 最多返回的条数
+            
+        Returns:
+            DataFrame: code, name, market, type
+        """
+        return AkShareClient.get_symbol_master().search(query, data_type, market, limit)
+
+
+class AsyncAkShareClient:
+    """
+    akshare异步客户端
+    
+    所有实例共享一个有界线程池；同一方法、相同参数的并发请求只发起一次，
+    共享同一个结果（返回的DataFrame为同一对象，调用方不应原地修改）。
+    """
+    
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    
+    def __init__(self, max_workers: int = 8):
+        """
+        Args:
+            max_workers: 共享线程池的线程数，仅在首次创建线程池时生效
+        """
+        self.max_workers = max_workers
+        self.flight = SingleFlight()
+    
+    @property
+    def coalesced_calls(self) -> int:
+        """被合并的请求数"""
+        return self.flight.metrics()['deduplicated']
+    
+    @classmethod
+    def get_executor(cls, max_workers: int = 8) -> ThreadPoolExecutor:
+        """获取共享线程池"""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=max_workers,
+                        thread_name_prefix='akshare'
+                    )
+        return cls._executor
+    
+    @classmethod
+    def shutdown(cls, wait: bool = True) -> None:
+        """关闭共享线程池"""
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=wait, cancel_futures=True)
+                cls._executor = None
+    
+    async def get_stock_daily(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """异步获取股票日线数据，参数同AkShareClient.get_stock_daily"""
+        return await self._run('get_stock_daily', symbol, start_date, end_date)
+    
+    async def get_index_daily(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """异步获取指数日线数据，参数同AkShareClient.get_index_daily"""
+        return await self._run('get_index_daily', symbol, start_date, end_date)
+    
+    async def get_futures_daily(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """异步获取期货日线数据，参数同AkShareClient.get_futures_daily"""
+        return await self._run('get_futures_daily', symbol, start_date, end_date)
+    
+    async def get_economic_indicator(self, indicator: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """异步获取经济指标数据，参数同AkShareClient.get_economic_indicator"""
+        return await self._run('get_economic_indicator', indicator, start_date, end_date)
+    
+    async def _run(self, method: str, *args) -> pd.DataFrame:
+        """在共享线程池中执行，合并相同的并发请求"""
+        loop = asyncio.get_running_loop()
+        return await self.flight.do_async(
+            (method,) + args,
+            lambda: loop.run_in_executor(
+                self.get_executor(self.max_workers),
+                getattr(AkShareClient, method),
+                *args
+            )
+        )
@@ -2,6 +2,9 @@ import pandas as pd
 from datetime import datetime
 from typing import Tuple
 
+from .instrumentation import span, traced
+from .date_parsing import prepare_frame
+
 class CalendarManager:
     """日历管理器（处理农历春节对齐等）"""
     
@@ -12,6 +15,7 @@ class CalendarManager:
         2025: '2025-01-29',
     }
     
+    @traced('calendar.lunar_align')
     def get_lunar_aligned_data(
         self, 
         df: pd.DataFrame, 
@@ -21,11 +25,11 @@ class CalendarManager:
     ) -> pd.DataFrame:
         """获取春节对齐的数据"""
         
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col])
+        with span('calendar.parse_dates', rows=len(df)):
+            df = prepare_frame(df, date_col, [date_col, value_col], sort=False)
         
         # 获取有效年份
-        valid_years = [y for y in df['date'].dt.year.unique() 
+        valid_years = [y for y in df[date_col].dt.year.unique() 
                       if y in self.SPRING_FESTIVAL_DATES]
         
         processed_data = []
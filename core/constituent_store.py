@@ -0,0 +1,266 @@
+"""
+板块成分股时点存储
+以列式数组保存 (code, sector, in_date, out_date) 区间记录并持久化到本地，
+支持按日期查询成分股和生成区间内的成分矩阵
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .trading_calendar import TradingCalendar
+
+
+# 仍在板块内的记录out_date为NaT，查询时视为无穷远
+_OPEN_END = np.datetime64('9999-12-31', 'D')
+
+
+class ConstituentStore:
+    """板块成分股时点存储"""
+
+    COLUMNS = ('code', 'sector', 'in_date', 'out_date')
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: 本地存储文件(.npz)，存在时自动加载
+        """
+        self.path = Path(path) if path is not None else None
+        self._code = np.array([], dtype=str)
+        self._sector = np.array([], dtype=str)
+        self._in = np.array([], dtype='datetime64[D]')
+        self._out = np.array([], dtype='datetime64[D]')
+        # 各板块数据可信的日期范围（首个到最后一个快照），范围外的日期需重新获取
+        self._coverage: Dict[str, Tuple[np.datetime64, np.datetime64]] = {}
+        self._names: Dict[str, str] = {}
+
+        if self.path is not None and self.path.exists():
+            self.load(self.path)
+
+    def __len__(self) -> int:
+        return len(self._code)
+
+    @property
+    def sectors(self) -> np.ndarray:
+        """已存储的板块代码"""
+        return np.unique(self._sector)
+
+    def has_sector(self, sector: str) -> bool:
+        """是否存储了该板块"""
+        left, right = self._sector_bounds(sector)
+        return right > left
+
+    def coverage(self, sector: str) -> Optional[Tuple[np.datetime64, np.datetime64]]:
+        """板块数据覆盖的日期范围(首个快照, 最后一个快照)，未存储时返回None"""
+        return self._coverage.get(sector)
+
+    def covers(self, sector: str, date: str) -> bool:
+        """date是否在板块的覆盖范围内"""
+        bounds = self._coverage.get(sector)
+        if bounds is None:
+            return False
+        date = np.datetime64(pd.Timestamp(date), 'D')
+        return bounds[0] <= date <= bounds[1]
+
+    def names(self, codes: Iterable[str]) -> list:
+        """代码对应的名称，未记录的为None"""
+        return [self._names.get(code) for code in codes]
+
+    def add(self, records: pd.DataFrame) -> None:
+        """
+        添加区间记录
+
+        Args:
+            records: 包含 code, sector, in_date, out_date 列的DataFrame，
+                out_date为空表示仍在板块内
+        """
+        missing = [col for col in self.COLUMNS if col not in records.columns]
+        if missing:
+            raise KeyError(f"缺少列: {missing}")
+
+        ins, outs = self._to_days(records['in_date']), self._to_days(records['out_date'])
+        sectors = records['sector'].to_numpy(dtype=str)
+        self._set(
+            np.concatenate([self._code, records['code'].to_numpy(dtype=str)]),
+            np.concatenate([self._sector, sectors]),
+            np.concatenate([self._in, ins]),
+            np.concatenate([self._out, outs])
+        )
+        # 区间记录覆盖从最早纳入日期到最晚的纳入/剔除日期
+        for sector in np.unique(sectors):
+            mask = sectors == sector
+            dates = np.concatenate([ins[mask], outs[mask][~np.isnat(outs[mask])]])
+            self._extend_coverage(sector, dates.min(), dates.max())
+        if 'name' in records.columns:
+            self._names.update(zip(records['code'].astype(str), records['name']))
+
+    def add_snapshot(
+        self,
+        sector: str,
+        date: str,
+        codes: Iterable[str],
+        names: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        根据某日的成分股快照更新区间
+
+        新出现的代码以date为纳入日期，当前在板块内但快照中缺失的代码以date为剔除日期。
+        快照需按日期先后依次添加，早于已有最后一个快照的日期会抛出ValueError。
+
+        Args:
+            names: 与codes对应的名称
+        """
+        date = np.datetime64(pd.Timestamp(date), 'D')
+        bounds = self._coverage.get(sector)
+        if bounds is not None and date < bounds[1]:
+            raise ValueError(f"板块{sector}的快照需按日期先后添加，{date}早于已有快照{bounds[1]}")
+
+        codes = list(codes)
+        if names is not None:
+            self._names.update(zip(map(str, codes), names))
+        codes = np.unique(np.asarray(codes, dtype=str))
+
+        left, right = self._sector_bounds(sector)
+        current = self._active_mask(left, right, date)
+        active_codes = self._code[left:right][current]
+
+        out = self._out.copy()
+        leaving = np.flatnonzero(current)[~np.isin(active_codes, codes)] + left
+        out[leaving] = date
+
+        joining = codes[~np.isin(codes, active_codes)]
+        self._set(
+            np.concatenate([self._code, joining]),
+            np.concatenate([self._sector, np.full(len(joining), sector)]),
+            np.concatenate([self._in, np.full(len(joining), date)]),
+            np.concatenate([out, np.full(len(joining), np.datetime64('NaT'), dtype='datetime64[D]')])
+        )
+        self._extend_coverage(sector, date, date)
+
+    def members(self, sector: str, date: str) -> np.ndarray:
+        """返回某日板块内的成分股代码"""
+        date = np.datetime64(pd.Timestamp(date), 'D')
+        left, right = self._sector_bounds(sector)
+        return np.unique(self._code[left:right][self._active_mask(left, right, date)])
+
+    def membership_matrix(
+        self,
+        sector: str,
+        start_date: str,
+        end_date: str,
+        dates: Optional[np.ndarray] = None,
+        exchange: str = "SZSE"
+    ) -> pd.DataFrame:
+        """
+        生成区间内的成分矩阵
+
+        Args:
+            dates: 指定日期序列，默认使用exchange的交易日
+
+        Returns:
+            DataFrame: 行为日期、列为代码的布尔矩阵
+        """
+        if dates is None:
+            dates = TradingCalendar.get(exchange).trading_days(start_date, end_date)
+        dates = np.asarray(dates, dtype='datetime64[D]')
+
+        left, right = self._sector_bounds(sector)
+        codes, ins, outs = self._code[left:right], self._in[left:right], self._out[left:right]
+        outs = np.where(np.isnat(outs), _OPEN_END, outs)
+
+        # 只保留与查询区间有交集的区间，并按代码排序以便合并同一代码的多段区间
+        if len(dates):
+            overlap = (ins <= dates[-1]) & (outs > dates[0])
+            codes, ins, outs = codes[overlap], ins[overlap], outs[overlap]
+        order = np.argsort(codes, kind='stable')
+        codes, ins, outs = codes[order], ins[order], outs[order]
+
+        active = (ins[None, :] <= dates[:, None]) & (dates[:, None] < outs[None, :])
+        unique_codes, starts = np.unique(codes, return_index=True)
+        if len(unique_codes):
+            matrix = np.logical_or.reduceat(active, starts, axis=1)
+        else:
+            matrix = np.zeros((len(dates), 0), dtype=bool)
+
+        return pd.DataFrame(
+            matrix,
+            index=pd.DatetimeIndex(dates.astype('datetime64[ns]'), name='date'),
+            columns=unique_codes
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """导出全部区间记录"""
+        return pd.DataFrame({
+            'code': self._code,
+            'sector': self._sector,
+            'in_date': self._in.astype('datetime64[ns]'),
+            'out_date': self._out.astype('datetime64[ns]')
+        })
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """保存到本地文件"""
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("未指定存储路径")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        coverage = sorted(self._coverage.items())
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                code=self._code, sector=self._sector, in_date=self._in, out_date=self._out,
+                coverage_sector=np.array([sector for sector, _ in coverage], dtype=str),
+                coverage_first=np.array([bounds[0] for _, bounds in coverage], dtype='datetime64[D]'),
+                coverage_last=np.array([bounds[1] for _, bounds in coverage], dtype='datetime64[D]'),
+                name_code=np.array(list(self._names), dtype=str),
+                name_value=np.array([str(name) for name in self._names.values()], dtype=str)
+            )
+
+    def load(self, path: Union[str, Path]) -> None:
+        """从本地文件加载"""
+        with np.load(path) as data:
+            self._set(data['code'], data['sector'], data['in_date'], data['out_date'])
+            if 'coverage_sector' in data:
+                self._coverage = {
+                    str(sector): (first, last)
+                    for sector, first, last in zip(data['coverage_sector'], data['coverage_first'], data['coverage_last'])
+                }
+                self._names = dict(zip(data['name_code'].tolist(), data['name_value'].tolist()))
+            else:
+                # 旧版本文件没有覆盖范围，按区间记录推断
+                self._coverage = {}
+                for sector in np.unique(self._sector):
+                    left, right = self._sector_bounds(sector)
+                    outs = self._out[left:right]
+                    dates = np.concatenate([self._in[left:right], outs[~np.isnat(outs)]])
+                    self._extend_coverage(str(sector), dates.min(), dates.max())
+
+    def _extend_coverage(self, sector: str, first: np.datetime64, last: np.datetime64) -> None:
+        bounds = self._coverage.get(sector)
+        if bounds is not None:
+            first, last = min(first, bounds[0]), max(last, bounds[1])
+        self._coverage[sector] = (first, last)
+
+    def _set(self, code, sector, in_date, out_date) -> None:
+        """按 (sector, in_date) 排序后保存各列"""
+        order = np.lexsort((in_date, sector))
+        self._code = code[order]
+        self._sector = sector[order]
+        self._in = in_date[order]
+        self._out = out_date[order]
+
+    def _sector_bounds(self, sector: str):
+        """板块在排序数组中的位置区间"""
+        left = np.searchsorted(self._sector, sector, side='left')
+        right = np.searchsorted(self._sector, sector, side='right')
+        return left, right
+
+    def _active_mask(self, left: int, right: int, date: np.datetime64) -> np.ndarray:
+        """板块区间内在date仍有效的记录"""
+        ins, outs = self._in[left:right], self._out[left:right]
+        return (ins <= date) & (np.isnat(outs) | (date < outs))
+
+    @staticmethod
+    def _to_days(values) -> np.ndarray:
+        """转换为datetime64[D]数组"""
+        return pd.to_datetime(values).to_numpy().astype('datetime64[D]')
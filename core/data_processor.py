@@ -3,6 +3,10 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from .instrumentation import span, traced
+from .date_parsing import prepare_frame
+from .frame_protocol import FrameLike, to_pandas
+
 class DataProcessor:
     """数据处理核心类"""
     
@@ -33,11 +37,19 @@ class DataProcessor:
         }
     
     @staticmethod
-    def pivot_for_seasonal(df: pd.DataFrame, date_col: str, value_col: str, 
+    @traced('data_processor.pivot_for_seasonal')
+    def pivot_for_seasonal(df: FrameLike, date_col: str, value_col: str, 
                           group_by: str = 'year') -> pd.DataFrame:
-        """为季节性分析准备透视表"""
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col])
+        """
+        为季节性分析准备透视表
+
+        df也可以是pyarrow/polars数据框，只取日期列和数值列；
+        转换出的DataFrame归本方法所有，不再做防御性拷贝
+        """
+        owned = not isinstance(df, pd.DataFrame)
+        df = to_pandas(df, [date_col, value_col])
+        with span('data_processor.parse_dates', rows=len(df)):
+            df = prepare_frame(df, date_col, [date_col, value_col], sort=False, copy=not owned)
         df[group_by] = df[date_col].dt.year
         
         # 按月份分组
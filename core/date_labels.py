@@ -0,0 +1,167 @@
+"""
+日期标签缓存
+按日期数组内容的哈希和格式缓存x轴标签，相同坐标轴的多个图表共享同一个标签列表；
+常用的ISO格式用numpy向量化生成，连续重复的日期只格式化一次
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .date_parsing import parse_dates
+
+
+# strftime格式 -> (numpy日期单位, 日期与时间之间的分隔符)
+_ISO_FORMATS: Dict[str, Tuple[str, Optional[str]]] = {
+    '%Y': ('Y', None),
+    '%Y-%m': ('M', None),
+    '%Y-%m-%d': ('D', None),
+    '%Y-%m-%d %H:%M': ('m', ' '),
+    '%Y-%m-%d %H:%M:%S': ('s', ' '),
+    '%Y-%m-%dT%H:%M:%S': ('s', None)
+}
+
+# 分隔符在ISO字符串中的位置（YYYY-MM-DD之后）
+_SEPARATOR_POS = 10
+
+
+def _as_datetime64(dates) -> np.ndarray:
+    """Series/Index/数组统一为无时区的datetime64数组（带时区时取当地时间）"""
+    if isinstance(dates, pd.Series):
+        dates = parse_dates(dates)
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy()
+
+
+def _iso_strings(values: np.ndarray, unit: str, separator: Optional[str]) -> Optional[np.ndarray]:
+    """用numpy生成ISO格式字符串，年份超出四位等无法按固定宽度处理时返回None"""
+    text = np.datetime_as_string(values, unit=unit)
+    if separator is None:
+        return text
+    if text.dtype.itemsize // 4 <= _SEPARATOR_POS:
+        return None
+    # 定宽UTF-32字符串按码位视图直接改写日期与时间之间的'T'
+    codes = text.view(np.uint32).reshape(len(text), -1)
+    if not (codes[:, _SEPARATOR_POS] == ord('T')).all():
+        return None
+    codes[:, _SEPARATOR_POS] = ord(separator)
+    return text
+
+
+def format_date_labels(values: np.ndarray, format: str = '%Y-%m-%d') -> List[str]:
+    """
+    将datetime64数组格式化为标签列表，不经过缓存
+
+    结果与Series.dt.strftime(format).tolist()一致（NaT为NaN）
+    """
+    if len(values) == 0:
+        return []
+
+    iso = _ISO_FORMATS.get(format)
+    if iso is not None:
+        values = values.astype(f'datetime64[{iso[0]}]')
+
+    # 按连续相同的值压缩：日内数据的日标签大量重复，只格式化每段的第一个
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    runs = values[starts]
+
+    text = None
+    if iso is not None and not np.isnat(runs).any():
+        text = _iso_strings(runs, *iso)
+    if text is None:
+        text = pd.DatetimeIndex(runs).strftime(format).to_numpy(dtype=object)
+
+    if len(runs) < len(values):
+        counts = np.diff(np.append(starts, len(values)))
+        text = np.repeat(text.astype(object), counts)
+    return text.tolist()
+
+
+class DateLabelCache:
+    """
+    日期标签缓存
+
+    以(日期数组的哈希, 格式)为键，按LRU淘汰，缓存的标签总数不超过max_labels。
+    返回的列表在多个图表之间共享，调用方不应原地修改。
+    """
+
+    def __init__(self, max_labels: int = 1_000_000):
+        """
+        Args:
+            max_labels: 缓存的标签总数上限，超过上限的单个数组不缓存
+        """
+        self.max_labels = max_labels
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, str, str], List[str]]' = OrderedDict()
+        self._size = 0
+        self._metrics = {'hits': 0, 'misses': 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, dates, format: str = '%Y-%m-%d') -> List[str]:
+        """
+        获取日期标签
+
+        Args:
+            dates: 日期Series、Index或数组
+            format: strftime格式
+
+        Returns:
+            List[str]: 标签列表，与相同日期、相同格式的其他调用共享
+        """
+        values = _as_datetime64(dates)
+        digest = hashlib.blake2b(values.view(np.int64).tobytes(), digest_size=16).hexdigest()
+        key = (digest, values.dtype.str, format)
+
+        with self._lock:
+            labels = self._entries.get(key)
+            if labels is not None:
+                self._entries.move_to_end(key)
+                self._metrics['hits'] += 1
+                return labels
+            self._metrics['misses'] += 1
+
+        labels = format_date_labels(values, format)
+        if len(labels) > self.max_labels:
+            return labels
+
+        with self._lock:
+            # 其他线程可能已经放入了相同的标签
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = labels
+            self._size += len(labels)
+            while self._size > self.max_labels:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return labels
+
+    def metrics(self) -> Dict[str, int]:
+        """命中统计: hits, misses, entries, labels"""
+        with self._lock:
+            return {**self._metrics, 'entries': len(self._entries), 'labels': self._size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_default_cache = DateLabelCache()
+
+
+def date_labels(dates, format: str = '%Y-%m-%d') -> List[str]:
+    """使用全局缓存获取日期标签"""
+    return _default_cache.get(dates, format)
+
+
+def get_label_cache() -> DateLabelCache:
+    """全局日期标签缓存"""
+    return _default_cache
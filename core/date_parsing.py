@@ -0,0 +1,81 @@
+"""
+日期列快速路径
+已是datetime64的日期列不再重复解析，已按日期升序的数据不再重复排序；
+字符串日期按推断出的固定格式解析，重复的日期字符串只解析一次
+"""
+from typing import List, Optional
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from pandas.tseries.api import guess_datetime_format
+
+from .memory_profile import defensive_copy
+
+
+def guess_date_format(values: pd.Series) -> Optional[str]:
+    """根据第一个非空字符串推断日期格式，无法推断时返回None"""
+    first = values.first_valid_index()
+    if first is None:
+        return None
+    sample = values[first]
+    if not isinstance(sample, str):
+        return None
+    return guess_datetime_format(sample)
+
+
+def parse_dates(values: pd.Series, format: Optional[str] = None) -> pd.Series:
+    """
+    将日期列解析为datetime64
+
+    已是datetime64（含带时区）时原样返回，不产生拷贝；
+    否则按指定或推断出的格式解析，相同的日期字符串只解析一次
+
+    Args:
+        values: 日期列
+        format: 日期格式，如'%Y-%m-%d'，None表示根据首个值推断
+    """
+    if is_datetime64_any_dtype(values.dtype):
+        return values
+    if format is None:
+        format = guess_date_format(values)
+    return pd.to_datetime(values, format=format, cache=True)
+
+
+def prepare_frame(
+    df: pd.DataFrame,
+    date_col: str,
+    columns: Optional[List[str]] = None,
+    sort: bool = True,
+    copy: bool = False,
+    format: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    返回日期列为datetime64（sort=True时按日期升序）的DataFrame
+
+    日期列已解析且有序时直接返回输入，不解析、不排序也不拷贝，因此copy=False时
+    返回值可能就是输入本身，不要原地修改
+
+    Args:
+        df: 输入数据
+        date_col: 日期列名
+        columns: 需要拷贝时只保留这些列，None表示全部
+        sort: 是否保证按日期升序
+        copy: 是否保证返回值可以安全修改
+        format: 字符串日期的格式，None表示推断
+    """
+    dates = df[date_col]
+    needs_parse = not is_datetime64_any_dtype(dates.dtype)
+    if needs_parse:
+        dates = parse_dates(dates, format)
+    # O(n)的有序性检查远快于排序
+    needs_sort = sort and not dates.is_monotonic_increasing
+
+    if not (needs_parse or needs_sort or copy):
+        return df
+
+    df = defensive_copy(df, columns)
+    if needs_parse:
+        df[date_col] = dates
+    if needs_sort:
+        df = df.sort_values(date_col, kind='stable')
+    return df
@@ -0,0 +1,187 @@
+"""
+经济指标目录
+以声明式注册表将指标名映射到akshare函数和列映射，
+每个指标的完整序列缓存到本地，区间查询通过二分查找切片
+"""
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# 金十数据中心的宏观报告统一返回 商品, 日期, 今值, 预测值, 前值
+_JIN10_COLUMNS = {'日期': 'date', '今值': 'value'}
+
+# 指标名 -> akshare函数名、列映射（映射到date/value）和说明
+ECONOMIC_INDICATORS: Dict[str, Dict] = {
+    'CPI': {'func': 'macro_china_cpi_yearly', 'columns': _JIN10_COLUMNS, 'description': '中国CPI年率'},
+    'PPI': {'func': 'macro_china_ppi_yearly', 'columns': _JIN10_COLUMNS, 'description': '中国PPI年率'},
+    'GDP': {'func': 'macro_china_gdp_yearly', 'columns': _JIN10_COLUMNS, 'description': '中国GDP年率'},
+    'M2': {'func': 'macro_china_m2_yearly', 'columns': _JIN10_COLUMNS, 'description': '中国M2货币供应年率'},
+    'PMI': {'func': 'macro_china_pmi_yearly', 'columns': _JIN10_COLUMNS, 'description': '中国官方制造业PMI'},
+    'EXPORTS': {'func': 'macro_china_exports_yoy', 'columns': _JIN10_COLUMNS, 'description': '中国以美元计算出口年率'},
+    'IMPORTS': {'func': 'macro_china_imports_yoy', 'columns': _JIN10_COLUMNS, 'description': '中国以美元计算进口年率'},
+    'INDUSTRIAL_PRODUCTION': {
+        'func': 'macro_china_industrial_production_yoy',
+        'columns': _JIN10_COLUMNS,
+        'description': '中国规模以上工业增加值年率'
+    },
+    'LPR1Y': {'func': 'macro_china_lpr', 'columns': {'TRADE_DATE': 'date', 'LPR1Y': 'value'}, 'description': '1年期贷款市场报价利率'},
+    'LPR5Y': {'func': 'macro_china_lpr', 'columns': {'TRADE_DATE': 'date', 'LPR5Y': 'value'}, 'description': '5年期贷款市场报价利率'},
+}
+
+
+class EconomicIndicatorCatalog:
+    """经济指标目录（完整序列本地缓存，每日刷新一次）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        indicators: Optional[Dict[str, Dict]] = None
+    ):
+        """
+        Args:
+            cache_dir: 本地缓存目录，默认 ~/.visualkit/indicators
+            indicators: 指标注册表，默认使用ECONOMIC_INDICATORS
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / '.visualkit' / 'indicators'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.indicators = dict(ECONOMIC_INDICATORS if indicators is None else indicators)
+        # 指标名 -> (加载日期, 排序后的日期数组, 数值数组)
+        self._series: Dict[str, Tuple[date, np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        func: Union[str, Callable[[], pd.DataFrame]],
+        columns: Dict[str, str],
+        description: str = ''
+    ) -> None:
+        """
+        注册指标
+
+        Args:
+            name: 指标名（不区分大小写）
+            func: akshare函数名或返回DataFrame的函数
+            columns: 原始列名到date/value的映射
+            description: 说明
+        """
+        if sorted(columns.values()) != ['date', 'value']:
+            raise ValueError("columns需映射出date和value两列")
+        self.indicators[name.upper()] = {'func': func, 'columns': dict(columns), 'description': description}
+
+    def available(self) -> pd.DataFrame:
+        """列出已注册的指标"""
+        return pd.DataFrame([
+            {'indicator': name, 'description': spec.get('description', '')}
+            for name, spec in self.indicators.items()
+        ])
+
+    def get(self, indicator: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        获取单个指标在区间内的数据
+
+        Returns:
+            DataFrame: date, value
+        """
+        dates, values = self._slice(indicator, start_date, end_date)
+        return pd.DataFrame({'date': dates.astype('datetime64[ns]'), 'value': values})
+
+    def get_many(
+        self,
+        indicators: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        获取多个指标并按日期对齐为宽表
+
+        Returns:
+            DataFrame: date列和每个指标一列，某指标当日无数据时为NaN
+        """
+        slices = [self._slice(indicator, start_date, end_date) for indicator in indicators]
+        dates = np.unique(np.concatenate([s[0] for s in slices])) if slices else np.array([], dtype='datetime64[D]')
+
+        result = {'date': dates.astype('datetime64[ns]')}
+        for indicator, (series_dates, values) in zip(indicators, slices):
+            column = np.full(len(dates), np.nan)
+            column[np.searchsorted(dates, series_dates)] = values
+            result[indicator.upper()] = column
+        return pd.DataFrame(result)
+
+    def refresh(self, indicator: str) -> None:
+        """强制重新下载指标的完整序列"""
+        name = self._name(indicator)
+        with self._lock:
+            dates, values = self._download(name)
+            self._series[name] = (date.today(), dates, values)
+
+    def _slice(self, indicator: str, start_date: Optional[str], end_date: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """在缓存的排序日期上二分查找区间"""
+        dates, values = self._load(self._name(indicator))
+        left = 0 if start_date is None else np.searchsorted(
+            dates, np.datetime64(pd.Timestamp(start_date), 'D'), side='left'
+        )
+        right = len(dates) if end_date is None else np.searchsorted(
+            dates, np.datetime64(pd.Timestamp(end_date), 'D'), side='right'
+        )
+        return dates[left:right], values[left:right]
+
+    def _load(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """获取当日有效的完整序列，过期时从本地缓存或akshare刷新"""
+        today = date.today()
+        cached = self._series.get(name)
+        if cached is not None and cached[0] == today:
+            return cached[1], cached[2]
+
+        with self._lock:
+            cached = self._series.get(name)
+            if cached is not None and cached[0] == today:
+                return cached[1], cached[2]
+
+            path = self._cache_path(name)
+            if path.exists() and datetime.fromtimestamp(path.stat().st_mtime).date() == today:
+                with np.load(path) as data:
+                    dates, values = data['date'], data['value']
+            else:
+                dates, values = self._download(name)
+
+            self._series[name] = (today, dates, values)
+            return dates, values
+
+    def _download(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """下载完整序列，按日期排序去重后写入本地缓存"""
+        spec = self.indicators[name]
+        func = spec['func']
+        if isinstance(func, str):
+            import akshare as ak
+            func = getattr(ak, func)
+
+        raw = func()
+        data = raw[list(spec['columns'])].rename(columns=spec['columns'])
+        data['date'] = pd.to_datetime(data['date'], errors='coerce')
+        data['value'] = pd.to_numeric(data['value'], errors='coerce')
+        # 未公布的期数今值为空，不进入缓存
+        data = data.dropna().drop_duplicates('date', keep='last').sort_values('date')
+
+        dates = data['date'].to_numpy().astype('datetime64[D]')
+        values = data['value'].to_numpy(dtype=np.float64)
+        with open(self._cache_path(name), 'wb') as f:
+            np.savez(f, date=dates, value=values)
+        return dates, values
+
+    def _name(self, indicator: str) -> str:
+        name = indicator.upper()
+        if name not in self.indicators:
+            raise ValueError(f"不支持的经济指标: {indicator}")
+        return name
+
+    def _cache_path(self, name: str) -> Path:
+        return self.cache_dir / f"indicator_{name}.npz"
@@ -0,0 +1,152 @@
+"""
+数据框协议
+图表和数据处理方法除pandas外还接受pyarrow Table/RecordBatch、polars DataFrame/LazyFrame，
+以及实现了Arrow PyCapsule（__arrow_c_stream__）或数据框交换协议（__dataframe__）的对象。
+只取出用到的列，数值和时间列在没有缺失值时直接引用原有内存（只读的NumPy视图），不复制整表
+"""
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import current_span, span
+
+try:
+    import pyarrow as pa
+except ImportError:
+    # pyarrow为可选依赖: pip install visualkit[storage]
+    pa = None
+
+try:
+    import polars as pl
+except ImportError:
+    # polars为可选依赖: pip install visualkit[dataframe]
+    pl = None
+
+if TYPE_CHECKING:
+    FrameLike = Union[pd.DataFrame, 'pa.Table', 'pa.RecordBatch', 'pl.DataFrame', 'pl.LazyFrame']
+else:
+    FrameLike = Any
+
+
+def frame_kind(data: Any) -> str:
+    """
+    识别数据框类型
+
+    Returns:
+        str: 'pandas'、'arrow'、'polars'、'arrow_stream'或'interchange'
+
+    Raises:
+        TypeError: 不是可识别的数据框
+    """
+    if isinstance(data, pd.DataFrame):
+        return 'pandas'
+    if pa is not None and isinstance(data, (pa.Table, pa.RecordBatch)):
+        return 'arrow'
+    if pl is not None and isinstance(data, (pl.DataFrame, pl.LazyFrame)):
+        return 'polars'
+    if pa is not None and hasattr(data, '__arrow_c_stream__'):
+        return 'arrow_stream'
+    if hasattr(data, '__dataframe__'):
+        return 'interchange'
+    raise TypeError(f"不支持的数据类型: {type(data).__name__}，需要pandas、pyarrow或polars数据框")
+
+
+def frame_columns(data: Any) -> List[str]:
+    """数据框的列名"""
+    kind = frame_kind(data)
+    if kind == 'pandas':
+        return list(data.columns)
+    if kind == 'arrow':
+        return list(data.schema.names)
+    if kind == 'polars':
+        return list(data.collect_schema().names() if isinstance(data, pl.LazyFrame) else data.columns)
+    if kind == 'arrow_stream':
+        # 只读取schema，不消费数据流
+        schema = pa.schema(data) if hasattr(data, '__arrow_c_schema__') else pa.table(data).schema
+        return list(schema.names)
+    return list(data.__dataframe__().column_names())
+
+
+def _unique(columns: Iterable[Optional[str]]) -> List[str]:
+    """去掉None和重复列名，保持顺序"""
+    seen = []
+    for column in columns:
+        if column is not None and column not in seen:
+            seen.append(column)
+    return seen
+
+
+def _arrow_column(column: 'pa.ChunkedArray') -> Any:
+    """Arrow列转为NumPy数组，单块且无缺失的数值/时间列为零拷贝视图"""
+    tz_aware = pa.types.is_timestamp(column.type) and column.type.tz is not None
+    if column.num_chunks == 1 and not tz_aware:
+        try:
+            return column.chunk(0).to_numpy(zero_copy_only=True)
+        except (pa.ArrowInvalid, NotImplementedError):
+            pass
+    # 有缺失值、多块、字符串或带时区等情况交给pyarrow按pandas语义转换
+    values = column.to_pandas(date_as_object=False)
+    current_span().add('copied_bytes', int(values.memory_usage(index=False, deep=False)))
+    return values
+
+
+def _polars_column(series: 'pl.Series') -> Any:
+    """polars列转为NumPy数组，无缺失的数值/时间列为零拷贝视图"""
+    try:
+        return series.to_numpy(allow_copy=False)
+    except RuntimeError:
+        values = series.to_numpy()
+        current_span().add('copied_bytes', int(values.nbytes))
+        return values
+
+
+def to_pandas(data: Any, columns: Optional[Iterable[Optional[str]]] = None) -> pd.DataFrame:
+    """
+    将数据框转为只包含所需列的pandas DataFrame
+
+    pandas输入原样返回；其他类型只转换columns中的列（未指定时转换全部列），
+    能零拷贝的列直接引用原内存，需要复制的字节数记入当前span的copied_bytes。
+    零拷贝的列是只读的，需要修改时由调用方先拷贝（defensive_copy/prepare_frame）
+
+    Args:
+        data: pandas/pyarrow/polars数据框
+        columns: 需要的列名，可包含None和重复值
+
+    Returns:
+        pd.DataFrame
+    """
+    kind = frame_kind(data)
+    if kind == 'pandas':
+        return data
+
+    if kind == 'arrow_stream':
+        # 流只能读取一次，先物化为Table（Arrow缓冲区不复制）
+        data, kind = pa.table(data), 'arrow'
+    elif kind == 'arrow' and isinstance(data, pa.RecordBatch):
+        data = pa.Table.from_batches([data])
+
+    names = _unique(columns) if columns is not None else None
+    if names is not None:
+        missing = [name for name in names if name not in frame_columns(data)]
+        if missing:
+            raise KeyError(f"数据中缺少列: {', '.join(missing)}")
+
+    with span('frame.to_pandas', source=kind, columns=len(names) if names is not None else -1):
+        if kind == 'arrow':
+            table = data.select(names) if names is not None else data
+            arrays = {name: _arrow_column(table.column(name)) for name in table.schema.names}
+        elif kind == 'polars':
+            if isinstance(data, pl.LazyFrame):
+                # 列裁剪下推到polars的查询计划
+                data = data.select(names).collect() if names is not None else data.collect()
+            frame = data.select(names) if names is not None else data
+            arrays = {name: _polars_column(frame.get_column(name)) for name in frame.columns}
+        else:
+            exchange = data.__dataframe__()
+            if names is not None:
+                exchange = exchange.select_columns_by_name(names)
+            return pd.api.interchange.from_dataframe(exchange, allow_copy=True)
+
+        # 按列传入且copy=False时pandas不合并为二维块，各列保持原有内存
+        return pd.DataFrame(arrays, copy=False)
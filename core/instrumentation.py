@@ -0,0 +1,258 @@
+"""
+性能埋点
+以上下文管理器记录各处理阶段（数据获取、日期解析、日历对齐、透视、option构建、渲染）的耗时，
+结果输出到可替换的sink；未设置sink时span为空操作
+"""
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+
+class Span:
+    """一次阶段计时"""
+
+    __slots__ = ('name', 'attributes', 'parent', 'depth', 'start', 'end', 'error', 'handle', '_sink', '_token')
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional['Span'], sink):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.start = 0.0
+        self.end = 0.0
+        self.error: Optional[BaseException] = None
+        # sink自定义的句柄（如OpenTelemetry的span）
+        self.handle = None
+        self._sink = sink
+
+    @property
+    def duration(self) -> float:
+        """耗时（秒）"""
+        return self.end - self.start
+
+    def set(self, **attributes) -> None:
+        """补充属性，如行数"""
+        self.attributes.update(attributes)
+
+    def add(self, name: str, value) -> None:
+        """累加计数属性，如拷贝字节数"""
+        self.attributes[name] = self.attributes.get(name, 0) + value
+
+    def __enter__(self) -> 'Span':
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        self._sink.start(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter()
+        self.error = exc
+        _current.reset(self._token)
+        self._sink.end(self)
+
+
+class _NoopSpan:
+    """未启用埋点时返回的空span"""
+
+    __slots__ = ()
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def add(self, name: str, value) -> None:
+        pass
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: contextvars.ContextVar = contextvars.ContextVar('visualkit_span', default=None)
+_sink = None
+
+
+def span(name: str, **attributes):
+    """
+    记录一个阶段的耗时
+
+    用法:
+        with span('calendar.lunar_align', rows=len(df)) as s:
+            ...
+            s.set(years=len(years))
+    """
+    sink = _sink
+    if sink is None:
+        return _NOOP
+    return Span(name, attributes, _current.get(), sink)
+
+
+def current_span():
+    """当前线程/协程所在的span，不在span内或未启用时返回空span"""
+    current = _current.get()
+    return current if current is not None else _NOOP
+
+
+def traced(name: str) -> Callable:
+    """装饰器：以span包裹整个函数，返回DataFrame时记录行数"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _sink is None:
+                return func(*args, **kwargs)
+            with span(name) as s:
+                result = func(*args, **kwargs)
+                if isinstance(result, pd.DataFrame):
+                    s.set(rows=len(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def set_sink(sink) -> None:
+    """设置全局sink，None表示关闭埋点"""
+    global _sink
+    _sink = sink
+
+
+def get_sink():
+    """当前的sink"""
+    return _sink
+
+
+@contextlib.contextmanager
+def instrument(sink=None):
+    """
+    临时启用埋点，默认记录到MemorySink
+
+    用法:
+        with instrument() as sink:
+            chart.create_seasonal_line(df)
+        print(sink.summary())
+    """
+    sink = sink if sink is not None else MemorySink()
+    previous = get_sink()
+    set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+
+class MemorySink:
+    """在内存中保存span记录，用于测试和交互式分析"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records: List[Dict[str, Any]] = []
+
+    def start(self, span: Span) -> None:
+        pass
+
+    def end(self, span: Span) -> None:
+        record = {
+            'name': span.name,
+            'parent': span.parent.name if span.parent is not None else None,
+            'depth': span.depth,
+            'duration': span.duration,
+            'error': type(span.error).__name__ if span.error is not None else None,
+            **span.attributes
+        }
+        with self._lock:
+            self.records.append(record)
+
+    def to_frame(self) -> pd.DataFrame:
+        """全部记录（按结束顺序）"""
+        with self._lock:
+            return pd.DataFrame(self.records)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        按阶段汇总: count, total, mean, max（秒），按总耗时降序；
+        有内存记录时附加 copied_bytes（合计）、peak_alloc 和 peak_rss（最大值）
+        """
+        df = self.to_frame()
+        if df.empty:
+            return pd.DataFrame(columns=['count', 'total', 'mean', 'max'])
+
+        aggregations = {
+            'count': ('duration', 'count'),
+            'total': ('duration', 'sum'),
+            'mean': ('duration', 'mean'),
+            'max': ('duration', 'max')
+        }
+        if 'copied_bytes' in df.columns:
+            aggregations['copied_bytes'] = ('copied_bytes', 'sum')
+        for column in ('peak_alloc', 'peak_rss'):
+            if column in df.columns:
+                aggregations[column] = (column, 'max')
+
+        return df.groupby('name').agg(**aggregations).sort_values('total', ascending=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+
+class LoggingSink:
+    """将span结束事件写入日志"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG):
+        self.logger = logger if logger is not None else logging.getLogger('visualkit.instrumentation')
+        self.level = level
+
+    def start(self, span: Span) -> None:
+        pass
+
+    def end(self, span: Span) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+        attributes = ' '.join(f"{key}={value}" for key, value in span.attributes.items())
+        status = f" error={type(span.error).__name__}" if span.error is not None else ''
+        self.logger.log(
+            self.level, "%s%s %.3fms %s%s",
+            '  ' * span.depth, span.name, span.duration * 1000, attributes, status
+        )
+
+
+class OpenTelemetrySink:
+    """转发到OpenTelemetry tracer，嵌套关系与visualkit的span一致"""
+
+    def __init__(self, tracer=None):
+        """
+        Args:
+            tracer: OpenTelemetry的Tracer，默认使用全局TracerProvider创建
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError("OpenTelemetrySink需要opentelemetry-api，请安装: pip install opentelemetry-api")
+
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer('visualkit')
+
+    def start(self, span: Span) -> None:
+        context = None
+        if span.parent is not None and span.parent.handle is not None:
+            context = self._trace.set_span_in_context(span.parent.handle)
+        span.handle = self.tracer.start_span(span.name, context=context)
+
+    def end(self, span: Span) -> None:
+        handle = span.handle
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                handle.set_attribute(key, value)
+            else:
+                handle.set_attribute(key, str(value))
+        if span.error is not None:
+            handle.record_exception(span.error)
+            handle.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        handle.end()
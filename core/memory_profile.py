@@ -0,0 +1,165 @@
+"""
+内存分析与拷贝策略
+记录各处理阶段的内存峰值和拷贝字节数；可开启pandas的copy-on-write，
+开启后方法内部的防御性拷贝退化为浅拷贝，只在真正写入时复制
+"""
+import contextlib
+import os
+import sys
+import tracemalloc
+from typing import List, Optional
+
+import pandas as pd
+
+from .instrumentation import MemorySink, Span, current_span, get_sink, instrument
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def copy_on_write_enabled() -> bool:
+    """pandas是否启用了copy-on-write"""
+    try:
+        return bool(pd.get_option('mode.copy_on_write'))
+    except KeyError:
+        # pandas 3.0起copy-on-write为唯一行为，选项已移除
+        return True
+
+
+def set_copy_on_write(enabled: bool = True) -> None:
+    """
+    全局开启或关闭pandas的copy-on-write
+
+    开启后各处理方法不再对输入做完整的深拷贝，峰值内存约降为输入的小倍数；
+    注意这会改变pandas的链式赋值语义，影响整个进程
+    """
+    pd.set_option('mode.copy_on_write', enabled)
+
+
+def defensive_copy(df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    方法修改输入前的防御性拷贝
+
+    copy-on-write开启时返回浅拷贝，修改时才按列复制；否则深拷贝，
+    并将拷贝的字节数累加到当前span的copied_bytes
+
+    Args:
+        df: 输入数据
+        columns: 只保留这些列，其余列不参与拷贝
+
+    Returns:
+        可安全修改的DataFrame
+    """
+    if columns is not None:
+        # 非copy-on-write下按列选取本身就会复制所选列
+        result = df.loc[:, columns]
+    elif copy_on_write_enabled():
+        return df.copy(deep=False)
+    else:
+        result = df.copy()
+
+    if not copy_on_write_enabled():
+        record_copy(result)
+    return result
+
+
+def record_copy(df: pd.DataFrame) -> None:
+    """将df占用的字节数记入当前span的copied_bytes（未启用埋点时为空操作）"""
+    if get_sink() is None:
+        return
+    current_span().add('copied_bytes', int(df.memory_usage(index=True).sum()))
+
+
+def _current_rss() -> Optional[int]:
+    """当前进程的常驻内存（字节），无法获取时返回None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss() -> Optional[int]:
+    """进程启动以来的常驻内存峰值（字节），无法获取时返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux单位为KB，macOS为字节
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryProfilingSink(MemorySink):
+    """
+    在MemorySink的基础上记录每个阶段的内存:
+        peak_alloc: 阶段内Python/numpy分配的峰值增量（字节，tracemalloc，含子阶段）
+        rss: 阶段结束时的常驻内存（字节）
+        peak_rss: 阶段结束时的进程常驻内存峰值（字节）
+    配合defensive_copy记录的copied_bytes可定位多余的拷贝
+
+    tracemalloc是进程级的，请在单线程中分析；开启后运行速度会明显下降
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._owns_tracing = False
+
+    def start(self, span: Span) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+        current, peak = tracemalloc.get_traced_memory()
+        parent = span.parent
+        if parent is not None and isinstance(parent.handle, list):
+            # 重置前把父阶段到目前为止的峰值保存下来
+            parent.handle[1] = max(parent.handle[1], peak)
+        tracemalloc.reset_peak()
+        # [阶段开始时的已分配量, 子阶段内的峰值]
+        span.handle = [current, current]
+
+    def end(self, span: Span) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        base, child_peak = span.handle
+        peak = max(peak, child_peak)
+
+        parent = span.parent
+        if parent is not None and isinstance(parent.handle, list):
+            parent.handle[1] = max(parent.handle[1], peak)
+
+        span.set(peak_alloc=peak - base, rss=_current_rss(), peak_rss=_peak_rss())
+        super().end(span)
+
+    def close(self) -> None:
+        """停止由本sink开启的tracemalloc"""
+        if self._owns_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._owns_tracing = False
+
+
+@contextlib.contextmanager
+def profile_memory(copy_on_write: Optional[bool] = None):
+    """
+    临时启用内存分析
+
+    用法:
+        with profile_memory(copy_on_write=True) as sink:
+            chart.create_seasonal_line(df)
+        print(sink.summary()[['total', 'copied_bytes', 'peak_alloc']])
+
+    Args:
+        copy_on_write: 分析期间临时设置copy-on-write，None表示保持现状
+    """
+    previous = copy_on_write_enabled()
+    if copy_on_write is not None:
+        set_copy_on_write(copy_on_write)
+
+    sink = MemoryProfilingSink()
+    try:
+        with instrument(sink):
+            yield sink
+    finally:
+        sink.close()
+        if copy_on_write is not None:
+            set_copy_on_write(previous)
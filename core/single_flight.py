@@ -0,0 +1,123 @@
+"""
+单飞请求合并
+相同key的并发调用只执行一次，所有调用方共享同一个结果或异常
+"""
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """一次正在执行的调用"""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    单飞请求合并器
+
+    同步调用用do，协程用do_async；两者各自维护进行中的请求，共用统计指标。
+    共享的结果是同一个对象，调用方不应原地修改。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # key -> [future, 等待者数量]
+        self._async_calls: Dict[Hashable, list] = {}
+        self._metrics = {'calls': 0, 'executions': 0, 'deduplicated': 0, 'errors': 0}
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """执行func，同一key已有调用在进行时等待并复用其结果"""
+        with self._lock:
+            self._metrics['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._metrics['executions'] += 1
+            else:
+                self._metrics['deduplicated'] += 1
+
+        if leader:
+            try:
+                call.result = func(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self._metrics['errors'] += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+        else:
+            call.event.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: Hashable, factory: Callable[[], Awaitable]) -> Any:
+        """
+        协程版本：factory返回可等待对象，同一key只调用一次factory
+
+        单个调用方取消不影响其他等待者；最后一个等待者取消时取消底层任务。
+        """
+        with self._lock:
+            self._metrics['calls'] += 1
+            entry = self._async_calls.get(key)
+            leader = entry is None
+            if leader:
+                self._metrics['executions'] += 1
+                entry = self._async_calls[key] = [asyncio.ensure_future(factory()), 0]
+            else:
+                self._metrics['deduplicated'] += 1
+
+        if leader:
+            def done(fut, key=key, entry=entry):
+                with self._lock:
+                    if self._async_calls.get(key) is entry:
+                        del self._async_calls[key]
+                    if not fut.cancelled() and fut.exception() is not None:
+                        self._metrics['errors'] += 1
+
+            entry[0].add_done_callback(done)
+
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0])
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not entry[0].done():
+                entry[0].cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def metrics(self) -> Dict[str, int]:
+        """返回调用统计: calls 总调用数, executions 实际执行数, deduplicated 被合并数, errors 失败数"""
+        with self._lock:
+            return dict(self._metrics)
+
+    def reset_metrics(self) -> None:
+        """清零统计指标"""
+        with self._lock:
+            for name in self._metrics:
+                self._metrics[name] = 0
+
+
+def single_flight(group: SingleFlight) -> Callable:
+    """装饰器：以 函数名 + 参数 为key合并并发调用"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            return group.do(key, func, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,230 @@
+"""
+代码主数据缓存
+本地保存完整的股票/指数/期货代码表并每日刷新，
+通过预建索引提供代码与名称的前缀/模糊搜索
+"""
+import threading
+import warnings
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _load_stock() -> pd.DataFrame:
+    """下载A股代码表"""
+    import akshare as ak
+
+    df = ak.stock_zh_a_spot()
+    return pd.DataFrame({'code': df['代码'].astype(str), 'name': df['名称'].astype(str)})
+
+
+def _load_index() -> pd.DataFrame:
+    """下载指数代码表"""
+    import akshare as ak
+
+    df = ak.stock_zh_index_spot_sina()
+    return pd.DataFrame({'code': df['代码'].astype(str), 'name': df['名称'].astype(str)})
+
+
+def _load_futures() -> pd.DataFrame:
+    """下载期货主力合约代码表"""
+    import akshare as ak
+
+    df = ak.futures_display_main_sina()
+    result = pd.DataFrame({'code': df['symbol'].astype(str), 'name': df['name'].astype(str)})
+    result['market'] = df['exchange'].astype(str).str.upper()
+    return result
+
+
+class _SymbolIndex:
+    """单一类型代码表的搜索索引"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self.codes = self.df['code'].str.lower().to_numpy(dtype=str)
+        self.names = self.df['name'].to_numpy(dtype=str)
+
+        # 排序后的代码/名称，用于searchsorted前缀查找
+        self.code_order = np.argsort(self.codes, kind='stable')
+        self.sorted_codes = self.codes[self.code_order]
+        self.name_order = np.argsort(self.names, kind='stable')
+        self.sorted_names = self.names[self.name_order]
+
+        # 二元字符倒排索引，用于子串模糊匹配
+        postings: Dict[str, set] = defaultdict(set)
+        for row, (code, name) in enumerate(zip(self.codes, self.names)):
+            text = f"{code} {name.lower()}"
+            for i in range(len(text) - 1):
+                postings[text[i:i + 2]].add(row)
+        self.bigrams = {key: np.fromiter(rows, dtype=np.int64) for key, rows in postings.items()}
+
+    def prefix(self, sorted_values: np.ndarray, order: np.ndarray, query: str) -> np.ndarray:
+        """返回以query开头的行号"""
+        left = np.searchsorted(sorted_values, query, side='left')
+        right = np.searchsorted(sorted_values, query + '￿', side='right')
+        return order[left:right]
+
+    def contains(self, query: str) -> np.ndarray:
+        """返回代码或名称包含query的行号"""
+        if len(query) < 2:
+            mask = np.char.find(self.codes, query) >= 0
+            mask |= np.char.find(np.char.lower(self.names), query) >= 0
+            return np.flatnonzero(mask)
+
+        candidates = None
+        for i in range(len(query) - 1):
+            rows = self.bigrams.get(query[i:i + 2])
+            if rows is None:
+                return np.array([], dtype=np.int64)
+            candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+
+        # 二元组全部命中不代表连续出现，需要再校验一次
+        texts = np.char.add(np.char.add(self.codes[candidates], ' '), np.char.lower(self.names[candidates]))
+        return np.sort(candidates[np.char.find(texts, query) >= 0])
+
+    def search(self, query: str, limit: int) -> pd.DataFrame:
+        """按 代码精确 > 代码前缀 > 名称前缀 > 包含 的顺序返回结果"""
+        query = query.strip().lower()
+        groups = [
+            np.flatnonzero(self.codes == query),
+            self.prefix(self.sorted_codes, self.code_order, query),
+            self.prefix(self.sorted_names, self.name_order, query),
+            self.contains(query)
+        ]
+        rows = pd.unique(np.concatenate(groups))[:limit]
+        return self.df.iloc[rows].reset_index(drop=True)
+
+
+class SymbolMaster:
+    """代码主数据缓存（按类型本地保存，每日刷新一次）"""
+
+    LOADERS: Dict[str, Callable[[], pd.DataFrame]] = {
+        'stock': _load_stock,
+        'index': _load_index,
+        'futures': _load_futures,
+    }
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            cache_dir: 本地缓存目录，默认 ~/.visualkit/symbols
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / '.visualkit' / 'symbols'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._indexes: Dict[str, _SymbolIndex] = {}
+        self._loaded_on: Dict[str, date] = {}
+        self._lock = threading.Lock()
+
+    def universe(self, data_type: str = 'stock') -> pd.DataFrame:
+        """返回完整代码表（code, name, market, type）"""
+        return self._index(data_type).df
+
+    def codes(self, data_type: str = 'stock') -> List[str]:
+        """返回全部代码"""
+        return self._index(data_type).df['code'].tolist()
+
+    def search(
+        self,
+        query: str,
+        data_type: str = 'stock',
+        market: Optional[str] = None,
+        limit: int = 20
+    ) -> pd.DataFrame:
+        """
+        按代码或名称搜索
+
+        Args:
+            query: 代码或名称片段，支持前缀和子串匹配
+            data_type: stock, index, futures
+            market: 市场过滤，如 SH, SZ, BJ, SHFE
+            limit: 最多返回的条数
+
+        Returns:
+            DataFrame: code, name, market, type
+        """
+        index = self._index(data_type)
+        if market is None:
+            return index.search(query, limit)
+
+        result = index.search(query, len(index.df))
+        return result[result['market'] == market.upper()].head(limit).reset_index(drop=True)
+
+    def refresh(self, data_type: str = 'stock') -> pd.DataFrame:
+        """强制从akshare重新下载代码表"""
+        with self._lock:
+            df = self._download(data_type)
+            self._set(data_type, df, date.today())
+        return df
+
+    def _index(self, data_type: str) -> _SymbolIndex:
+        """获取当日有效的索引，过期时从本地缓存或akshare刷新"""
+        if data_type not in self.LOADERS:
+            raise ValueError(f"不支持的数据类型: {data_type}")
+
+        today = date.today()
+        if self._loaded_on.get(data_type) == today:
+            return self._indexes[data_type]
+
+        with self._lock:
+            if self._loaded_on.get(data_type) == today:
+                return self._indexes[data_type]
+
+            path = self._cache_path(data_type)
+            cached_on = datetime.fromtimestamp(path.stat().st_mtime).date() if path.exists() else None
+
+            if cached_on == today:
+                df = pd.read_csv(path, dtype=str, keep_default_na=False)
+            else:
+                try:
+                    df = self._download(data_type)
+                except Exception as e:
+                    if cached_on is None:
+                        raise RuntimeError(f"获取代码表失败: {e}")
+                    # 下载失败时继续使用旧缓存，下次访问再尝试刷新
+                    warnings.warn(f"刷新代码表失败，使用{cached_on}的缓存: {e}")
+                    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+                    today = None
+
+            self._set(data_type, df, today)
+            return self._indexes[data_type]
+
+    def _download(self, data_type: str) -> pd.DataFrame:
+        """下载并标准化代码表，写入本地缓存"""
+        df = self.LOADERS[data_type]()
+        if 'market' not in df.columns:
+            df['market'] = self._infer_market(df['code'])
+        df['type'] = data_type
+        df = df[['code', 'name', 'market', 'type']].drop_duplicates('code')
+        df.to_csv(self._cache_path(data_type), index=False)
+        return df
+
+    def _set(self, data_type: str, df: pd.DataFrame, loaded_on: Optional[date]) -> None:
+        """构建索引"""
+        self._indexes[data_type] = _SymbolIndex(df)
+        if loaded_on is None:
+            self._loaded_on.pop(data_type, None)
+        else:
+            self._loaded_on[data_type] = loaded_on
+
+    def _cache_path(self, data_type: str) -> Path:
+        return self.cache_dir / f"symbols_{data_type}.csv"
+
+    @staticmethod
+    def _infer_market(codes: pd.Series) -> np.ndarray:
+        """根据代码前缀推断市场"""
+        codes = codes.str.lower()
+        prefix = codes.str[:2]
+        digits = codes.str.lstrip('abcdefghijklmnopqrstuvwxyz').str[:1]
+        return np.select(
+            [prefix.isin(['sh', 'sz', 'bj']), digits.isin(['6', '5', '9']),
+             digits.isin(['0', '1', '2', '3']), digits.isin(['4', '8'])],
+            [prefix.str.upper(), 'SH', 'SZ', 'BJ'],
+            default=''
+        )
@@ -0,0 +1,311 @@
+"""
+本地列式时间序列存储
+以Parquet按 source/symbol/year 分区保存各数据客户端的结果，
+读取时下推日期过滤条件并通过内存映射加载Arrow数据
+"""
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+from urllib.parse import quote
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:
+    # pyarrow为可选依赖: pip install visualkit[storage]
+    pa = None
+
+
+class TimeSeriesStore:
+    """Parquet分区时间序列存储"""
+
+    PARTITION_COLS = ('source', 'symbol', 'year')
+    COVERAGE_FILE = '_coverage.json'
+
+    def __init__(self, root: Union[str, Path], date_col: str = 'date'):
+        """
+        Args:
+            root: 存储根目录
+            date_col: 日期列名
+        """
+        if pa is None:
+            raise ImportError("TimeSeriesStore需要pyarrow，请安装: pip install visualkit[storage]")
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.date_col = date_col
+        self._lock = threading.Lock()
+        self._filesystem = pafs.LocalFileSystem(use_mmap=True)
+        self._partitioning = ds.partitioning(
+            pa.schema([
+                ('source', pa.string()),
+                ('symbol', pa.string()),
+                ('year', pa.int16())
+            ]),
+            flavor='hive'
+        )
+        self._coverage = self._load_coverage()
+        self._batch_depth = 0
+        self._coverage_dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator['TimeSeriesStore']:
+        """
+        批量写入，期间各次write的覆盖区间只在退出时保存一次
+
+        用法:
+            with store.batch():
+                for symbol, df in frames.items():
+                    store.write(df, 'wind', symbol)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._coverage_dirty:
+                    self._save_coverage()
+
+    def write(
+        self,
+        df: pd.DataFrame,
+        source: str,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> None:
+        """
+        写入数据，与已有数据按日期和列合并（同一日期以新数据为准，本次未包含的列保留已有值）
+
+        Args:
+            df: 包含日期列的数据
+            source: 数据来源，如 akshare_stock、wind
+            symbol: 标的代码
+            start_date: 本次请求的开始日期，用于记录各列的覆盖区间，默认取数据最小日期
+            end_date: 本次请求的结束日期，默认取数据最大日期
+        """
+        if len(df):
+            df = df.copy()
+            df[self.date_col] = pd.to_datetime(df[self.date_col])
+            years = df[self.date_col].dt.year
+
+            with self._lock:
+                for year, part in df.groupby(years, sort=True):
+                    self._write_partition(part, source, symbol, int(year))
+
+        start = start_date if start_date is not None else (df[self.date_col].min() if len(df) else None)
+        end = end_date if end_date is not None else (df[self.date_col].max() if len(df) else None)
+        fields = [col for col in df.columns if col != self.date_col and col not in self.PARTITION_COLS]
+        if start is not None and end is not None:
+            self._add_coverage(source, symbol, fields, start, end)
+
+    def read(
+        self,
+        source: str,
+        symbol: Optional[Union[str, List[str]]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_arrow: bool = False
+    ) -> Union[pd.DataFrame, 'pa.Table']:
+        """
+        读取数据，日期和分区条件下推到Parquet扫描
+
+        Args:
+            source: 数据来源
+            symbol: 标的代码或代码列表，None表示全部
+            start_date: 开始日期（含）
+            end_date: 结束日期（含）
+            columns: 需要的数值列，None表示全部
+            as_arrow: 为True时返回pyarrow.Table
+
+        Returns:
+            按日期排序的数据；读取多个标的时保留symbol列
+        """
+        start = pd.Timestamp(start_date) if start_date is not None else None
+        end = pd.Timestamp(end_date) if end_date is not None else None
+
+        # 按分区目录裁剪需要扫描的文件
+        files = self._partition_files(source, symbol, start, end)
+        if not files:
+            return pa.table({}) if as_arrow else pd.DataFrame()
+
+        # 各分区写入的列可能不同，统一schema后缺少的列读为空值
+        schema = pa.unify_schemas([pq.read_schema(path) for path in files] + [self._partitioning.schema])
+        dataset = ds.dataset(
+            files,
+            schema=schema,
+            format='parquet',
+            partitioning=self._partitioning,
+            partition_base_dir=str(self.root),
+            filesystem=self._filesystem
+        )
+
+        # 日期条件下推到Parquet行组统计信息
+        expr = ds.field('source') == source
+        if start is not None:
+            expr &= ds.field(self.date_col) >= start.to_datetime64()
+        if end is not None:
+            expr &= ds.field(self.date_col) <= end.to_datetime64()
+
+        keep = [self.date_col] + (list(columns) if columns is not None else [
+            name for name in dataset.schema.names
+            if name not in self.PARTITION_COLS and name != self.date_col
+        ])
+        if not isinstance(symbol, str):
+            keep.insert(1, 'symbol')
+
+        table = dataset.to_table(columns=keep, filter=expr)
+        sort_keys = [(self.date_col, 'ascending')]
+        if not isinstance(symbol, str):
+            sort_keys.insert(0, ('symbol', 'ascending'))
+        table = table.sort_by(sort_keys)
+
+        if as_arrow:
+            return table
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def covers(
+        self,
+        source: str,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        fields: Optional[List[str]] = None
+    ) -> bool:
+        """
+        已存储的请求区间是否覆盖[start_date, end_date]
+
+        Args:
+            fields: 需要的列，None表示已存储的全部列
+        """
+        stored = self._coverage.get(source, {}).get(symbol, {})
+        if fields is None:
+            fields = list(stored)
+            if not fields:
+                return False
+        return not self.missing_fields(source, symbol, start_date, end_date, fields)
+
+    def missing_fields(
+        self,
+        source: str,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        fields: List[str]
+    ) -> List[str]:
+        """返回fields中覆盖区间不包含[start_date, end_date]的列"""
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        stored = self._coverage.get(source, {}).get(symbol, {})
+        return [
+            field for field in fields
+            if not any(
+                pd.Timestamp(left) <= start and end <= pd.Timestamp(right)
+                for left, right in stored.get(field, [])
+            )
+        ]
+
+    def symbols(self, source: str) -> List[str]:
+        """列出某数据来源下已存储的标的"""
+        return sorted(self._coverage.get(source, {}))
+
+    def _partition_files(
+        self,
+        source: str,
+        symbol: Optional[Union[str, List[str]]],
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp]
+    ) -> List[str]:
+        """列出满足标的和年份条件的分区文件"""
+        source_dir = self.root / f"source={quote(source, safe='')}"
+        if not source_dir.exists():
+            return []
+
+        if symbol is None:
+            symbol_dirs = sorted(source_dir.glob('symbol=*'))
+        else:
+            symbols = [symbol] if isinstance(symbol, str) else list(symbol)
+            symbol_dirs = [source_dir / f"symbol={quote(s, safe='')}" for s in symbols]
+
+        files = []
+        for symbol_dir in symbol_dirs:
+            for year_dir in sorted(symbol_dir.glob('year=*')):
+                year = int(year_dir.name.split('=', 1)[1])
+                if start is not None and year < start.year:
+                    continue
+                if end is not None and year > end.year:
+                    continue
+                path = year_dir / 'data.parquet'
+                if path.exists():
+                    files.append(str(path))
+        return files
+
+    def _write_partition(self, part: pd.DataFrame, source: str, symbol: str, year: int) -> None:
+        """合并写入单个年份分区"""
+        directory = (
+            self.root
+            / f"source={quote(source, safe='')}"
+            / f"symbol={quote(symbol, safe='')}"
+            / f"year={year}"
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / 'data.parquet'
+
+        part = part.drop(columns=[col for col in self.PARTITION_COLS if col in part.columns])
+        part = part.drop_duplicates(subset=[self.date_col], keep='last').set_index(self.date_col)
+        if path.exists():
+            existing = pq.read_table(path).to_pandas().set_index(self.date_col)
+            # 按日期和列合并：新数据优先，新数据缺失或未包含的列保留已有值
+            columns = list(existing.columns) + [col for col in part.columns if col not in existing.columns]
+            part = part.combine_first(existing)[columns]
+        part = part.sort_index().reset_index()
+
+        tmp_path = directory / '.data.parquet.tmp'
+        pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp_path)
+        tmp_path.replace(path)
+
+    def _load_coverage(self) -> Dict[str, Dict[str, Dict[str, List[List[str]]]]]:
+        """加载请求覆盖区间，结构为 source -> symbol -> 列 -> 区间列表"""
+        path = self.root / self.COVERAGE_FILE
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _add_coverage(self, source: str, symbol: str, fields: List[str], start, end) -> None:
+        """按列记录并合并请求覆盖区间"""
+        with self._lock:
+            stored = self._coverage.setdefault(source, {}).setdefault(symbol, {})
+            for field in fields:
+                ranges = stored.setdefault(field, [])
+                ranges.append([pd.Timestamp(start).strftime('%Y-%m-%d'), pd.Timestamp(end).strftime('%Y-%m-%d')])
+                ranges.sort()
+
+                merged = [ranges[0]]
+                for left, right in ranges[1:]:
+                    # 相邻或重叠的区间合并
+                    if pd.Timestamp(left) <= pd.Timestamp(merged[-1][1]) + pd.Timedelta(days=1):
+                        merged[-1][1] = max(merged[-1][1], right)
+                    else:
+                        merged.append([left, right])
+                stored[field] = merged
+
+            self._coverage_dirty = True
+            if self._batch_depth == 0:
+                self._save_coverage()
+
+    def _save_coverage(self) -> None:
+        """写入临时文件后替换，写入中途失败不会损坏已有的覆盖区间文件（调用方持有锁）"""
+        tmp_path = self.root / f".{self.COVERAGE_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._coverage, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.root / self.COVERAGE_FILE)
+        self._coverage_dirty = False
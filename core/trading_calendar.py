@@ -0,0 +1,152 @@
+"""
+交易日历服务
+按交易所构建一次排序好的datetime64交易日数组并缓存，
+所有查询通过searchsorted完成
+"""
+import threading
+import warnings
+from datetime import date
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from chinese_calendar import holidays as CN_HOLIDAYS
+except ImportError:
+    # chinese-calendar未安装时只剔除周末
+    CN_HOLIDAYS = {}
+
+
+DateLike = Union[str, date, np.datetime64, pd.Timestamp]
+
+# 境内交易所统一按国务院节假日休市
+CN_EXCHANGES = ('SSE', 'SZSE', 'BSE', 'SHFE', 'DCE', 'CZCE', 'CFFEX', 'INE', 'GFEX')
+
+
+class TradingCalendar:
+    """
+    交易日历（排序后的datetime64[D]数组）
+
+    默认只构建到节假日数据覆盖的最后一年年底，之后的日期不视为交易日
+    """
+
+    _cache: Dict[str, 'TradingCalendar'] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        exchange: str = "SZSE",
+        start_date: str = "2004-01-01",
+        end_date: Optional[str] = None
+    ):
+        exchange = exchange.upper()
+        if exchange not in CN_EXCHANGES:
+            raise ValueError(f"不支持的交易所: {exchange}")
+
+        if not CN_HOLIDAYS:
+            warnings.warn("未安装chinese-calendar，交易日历仅剔除周末")
+
+        # 节假日数据覆盖的最后一年，超出后无法区分节假日
+        covered_year = max(d.year for d in CN_HOLIDAYS) if CN_HOLIDAYS else None
+        if end_date is None:
+            end_date = f"{covered_year if covered_year is not None else date.today().year + 1}-12-31"
+        elif covered_year is not None and pd.Timestamp(end_date).year > covered_year:
+            warnings.warn(
+                f"chinese-calendar的节假日数据只覆盖到{covered_year}年，之后的日期只剔除周末，"
+                "请升级chinese-calendar"
+            )
+
+        self.exchange = exchange
+        self.days = self._build_days(start_date, end_date)
+
+    @classmethod
+    def get(cls, exchange: str = "SZSE") -> 'TradingCalendar':
+        """获取缓存的交易所日历，首次调用时构建"""
+        exchange = exchange.upper()
+        calendar = cls._cache.get(exchange)
+        if calendar is None:
+            with cls._cache_lock:
+                calendar = cls._cache.get(exchange)
+                if calendar is None:
+                    calendar = cls(exchange)
+                    cls._cache[exchange] = calendar
+        return calendar
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """清空日历缓存"""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def trading_days(self, start_date: DateLike, end_date: DateLike) -> np.ndarray:
+        """返回[start_date, end_date]内的交易日（只读视图）"""
+        left = np.searchsorted(self.days, self._to_days(start_date), side='left')
+        right = np.searchsorted(self.days, self._to_days(end_date), side='right')
+        return self.days[left:right]
+
+    def is_trading_day(self, dates) -> Union[bool, np.ndarray]:
+        """判断是否为交易日，支持标量或数组"""
+        days = self._to_days(dates)
+        idx = np.searchsorted(self.days, days)
+        result = (idx < len(self.days)) & (self.days[np.minimum(idx, len(self.days) - 1)] == days)
+        return bool(result) if np.ndim(result) == 0 else result
+
+    def next_trading_day(self, dates, n: int = 1):
+        """返回严格晚于给定日期的第n个交易日，超出范围时为NaT"""
+        idx = np.searchsorted(self.days, self._to_days(dates), side='right') + (n - 1)
+        return self._take(idx)
+
+    def prev_trading_day(self, dates, n: int = 1):
+        """返回严格早于给定日期的第n个交易日，超出范围时为NaT"""
+        idx = np.searchsorted(self.days, self._to_days(dates), side='left') - n
+        return self._take(idx)
+
+    def count_trading_days(self, start_date, end_date) -> Union[int, np.ndarray]:
+        """统计[start_date, end_date]内的交易日数量，支持数组"""
+        left = np.searchsorted(self.days, self._to_days(start_date), side='left')
+        right = np.searchsorted(self.days, self._to_days(end_date), side='right')
+        count = np.maximum(right - left, 0)
+        return int(count) if np.ndim(count) == 0 else count
+
+    def trading_day_index(self, dates) -> Union[int, np.ndarray]:
+        """
+        返回日期对应的交易日序号
+
+        非交易日归入其之前最近的交易日，早于日历起点时为-1
+        """
+        idx = np.searchsorted(self.days, self._to_days(dates), side='right') - 1
+        return int(idx) if np.ndim(idx) == 0 else idx
+
+    def _take(self, idx):
+        """按序号取交易日，越界位置返回NaT"""
+        idx = np.asarray(idx)
+        valid = (idx >= 0) & (idx < len(self.days))
+        result = np.where(valid, self.days[np.clip(idx, 0, len(self.days) - 1)], np.datetime64('NaT'))
+        return result[()] if result.ndim == 0 else result
+
+    @staticmethod
+    def _to_days(dates) -> np.ndarray:
+        """将日期（标量或数组）转换为datetime64[D]"""
+        if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+            return dates.astype('datetime64[D]')
+        if np.ndim(dates) == 0:
+            return np.datetime64(pd.Timestamp(dates), 'D')
+        return pd.to_datetime(dates).to_numpy().astype('datetime64[D]')
+
+    @staticmethod
+    def _build_days(start_date: str, end_date: str) -> np.ndarray:
+        """生成剔除周末和法定节假日的交易日数组"""
+        days = np.arange(
+            np.datetime64(start_date, 'D'),
+            np.datetime64(end_date, 'D') + 1,
+            dtype='datetime64[D]'
+        )
+        holidays = np.array(sorted(CN_HOLIDAYS), dtype='datetime64[D]')
+        mask = np.is_busday(days) & ~np.isin(days, holidays)
+        days = days[mask]
+        days.flags.writeable = False
+        return days
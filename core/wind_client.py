@@ -2,20 +2,29 @@
 Wind数据获取客户端
 用于从Wind数据源获取金融数据
 """
+import asyncio
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import warnings
 
+from .trading_calendar import TradingCalendar
+from .constituent_store import ConstituentStore
+
 
 class WindClient:
     """Wind数据客户端"""
     
-    def __init__(self):
+    def __init__(self, store=None):
+        """
+        Args:
+            store: 可选的本地时间序列存储（TimeSeriesStore），设置后历史数据按代码写入存储
+        """
         self.wind_api = None
         self.is_connected = False
         self.last_error = None
+        self.store = store
     
     def connect(self) -> bool:
         """连接Wind API"""
@@ -61,43 +70,69 @@ class WindClient:
             end_date = datetime.now().strftime('%Y-%m-%d')
         
         try:
-            # 模拟获取数据
-            # 实际使用时:
-            # data = self.wind_api.wsd(codes, fields, start_date, end_date, options)
-            # return pd.DataFrame(data.Data, columns=data.Codes, index=data.Times)
-            
-            # 模拟生成数据
-            date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-            
-            data_dict = {}
-            for code in codes:
-                for field in fields:
-                    col_name = f"{code}_{field}" if len(codes) > 1 or len(fields) > 1 else field
-                    
-                    # 生成模拟数据
-                    if field.upper() in ['CLOSE', 'PRICE']:
-                        base_price = 100 + np.random.randn() * 20
-                        trend = np.linspace(0, 10, len(date_range))
-                        noise = np.random.randn(len(date_range)) * 5
-                        data_dict[col_name] = base_price + trend + noise
-                    
-                    elif field.upper() in ['VOLUME', 'VOL']:
-                        base_volume = 1000 + np.random.randn() * 200
-                        data_dict[col_name] = np.maximum(base_volume + np.random.randn(len(date_range)) * 100, 100)
-                    
-                    else:
-                        data_dict[col_name] = 100 + np.random.randn(len(date_range)) * 10
-            
-            df = pd.DataFrame(data_dict, index=date_range)
-            df.index.name = 'date'
-            df.reset_index(inplace=True)
-            
-            return df
+            if self.store is not None:
+                return self._history_through_store(codes, fields, start_date, end_date, options)
+            return self._fetch_history(codes, fields, start_date, end_date, options)
             
         except Exception as e:
+            self.last_error = str(e)
             print(f"获取数据失败: {e}")
             return pd.DataFrame()
     
+    def _fetch_history(
+        self,
+        codes: List[str],
+        fields: List[str],
+        start_date: str,
+        end_date: str,
+        options: Optional[Dict] = None
+    ) -> pd.DataFrame:
+        """从数据源获取历史数据，失败时抛出异常"""
+        # 模拟获取数据
+        # 实际使用见WindPyClient._fetch_history
+        return generate_mock_history(codes, fields, start_date, end_date)
+    
+    def _history_through_store(
+        self,
+        codes: List[str],
+        fields: List[str],
+        start_date: str,
+        end_date: str,
+        options: Optional[Dict] = None
+    ) -> pd.DataFrame:
+        """只请求存储未覆盖的代码和字段，按代码写入存储后再从存储组装宽表"""
+        source = self._store_source(options)
+        
+        # 缺少相同字段的代码合并为一次请求
+        missing: Dict[Tuple[str, ...], List[str]] = {}
+        for code in codes:
+            code_fields = self.store.missing_fields(source, code, start_date, end_date, fields)
+            if code_fields:
+                missing.setdefault(tuple(code_fields), []).append(code)
+        
+        with self.store.batch():
+            for missing_fields, missing_codes in missing.items():
+                missing_fields = list(missing_fields)
+                fetched = self._fetch_history(missing_codes, missing_fields, start_date, end_date, options)
+                fetched_cols = self._column_names(missing_codes, missing_fields)
+                for idx, code in enumerate(missing_codes):
+                    cols = fetched_cols[idx * len(missing_fields):(idx + 1) * len(missing_fields)]
+                    part = fetched[['date'] + cols].rename(columns=dict(zip(cols, missing_fields)))
+                    self.store.write(part, source, code, start_date, end_date)
+        
+        names = self._column_names(codes, fields)
+        frames = []
+        for idx, code in enumerate(codes):
+            part = self.store.read(source, code, start_date, end_date, columns=fields)
+            part = part.set_index('date')
+            part.columns = names[idx * len(fields):(idx + 1) * len(fields)]
+            frames.append(part)
+        
+        df = pd.concat(frames, axis=1)
+        df.index.name = 'date'
+        df.reset_index(inplace=True)
+        return df
+    
     def get_realtime_data(
         self,
         codes: List[str],
@@ -117,10 +152,8 @@ class WindClient:
             # return pd.DataFrame(data.Data, columns=data.Codes, index=[datetime.now()])
             
             data_dict = {}
-            for code in codes:
-                for field in fields:
-                    col_name = f"{code}_{field}" if len(codes) > 1 or len(fields) > 1 else field
-                    data_dict[col_name] = [100 + np.random.randn() * 10]
+            for col_name in self._column_names(codes, fields):
+                data_dict[col_name] = [100 + np.random.randn() * 10]
             
             df = pd.DataFrame(data_dict, index=[datetime.now()])
             df.index.name = 'datetime'
@@ -132,20 +165,96 @@ class WindClient:
             print(f"获取实时数据失败: {e}")
             return pd.DataFrame()
     
+    async def subscribe_realtime(
+        self,
+        codes: List[str],
+        fields: List[str],
+        flush_interval: float = 1.0,
+        capacity: int = 4096,
+        feed: Optional[AsyncIterator] = None,
+        tick_interval: float = 0.1
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        订阅实时数据，按刷新间隔批量输出
+        
+        Args:
+            codes: 证券代码列表
+            fields: 字段列表
+            flush_interval: 批量输出间隔（秒）
+            capacity: 环形缓冲区容量，两次刷新之间超出容量的最早数据会被覆盖
+            feed: 行情源，异步产出 (时间, 数值) 或 (时间数组, 数值矩阵)；
+                为None时使用本地模拟行情
+            tick_interval: 模拟行情的推送间隔（秒）
+            
+        Yields:
+            DataFrame: datetime列加每个代码/字段一列，与get_realtime_data格式一致，
+                可直接传给TimeSeriesBuffer.append
+        """
+        
+        if not self.is_connected:
+            if not self.connect():
+                return
+        
+        columns = self._column_names(codes, fields)
+        buffer = RealtimeRingBuffer(columns, capacity)
+        
+        if feed is None:
+            # 实际使用时可通过 self.wind_api.wsq(codes, fields, func=callback) 推送到队列
+            feed = simulated_tick_feed(len(columns), tick_interval=tick_interval)
+        
+        async def pump():
+            async for times, values in feed:
+                buffer.push(times, values)
+        
+        task = asyncio.ensure_future(pump())
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=flush_interval)
+                batch = buffer.to_frame(buffer.drain(), time_col='datetime')
+                if len(batch):
+                    yield batch
+                if done:
+                    # 行情源结束时抛出其中的异常
+                    task.result()
+                    break
+        finally:
+            task.cancel()
+    
     def get_sector_constituents(
         self,
         sector_code: str,
-        date: Optional[str] = None
+        date: Optional[str] = None,
+        store: Optional[ConstituentStore] = None
     ) -> pd.DataFrame:
-        """获取板块成分股"""
+        """
+        获取板块成分股（code, name）
+        
+        传入store时，date在存储的覆盖范围（首个到最后一个快照）内直接从时点存储查询；
+        否则请求接口。晚于最后一个快照的结果作为新快照写入存储并保存（store有路径时），
+        早于首个快照的结果不写入，以免打乱快照顺序
+        """
+        if date is None:
+            date = datetime.now().strftime('%Y-%m-%d')
         
+        if store is not None and store.covers(sector_code, date):
+            codes = store.members(sector_code, date)
+            return pd.DataFrame({'code': codes, 'name': store.names(codes)})
+        
+        df = self._fetch_sector_constituents(sector_code, date)
+        
+        bounds = store.coverage(sector_code) if store is not None else None
+        if store is not None and not df.empty and (bounds is None or np.datetime64(pd.Timestamp(date), 'D') > bounds[1]):
+            store.add_snapshot(sector_code, date, df['code'], names=df['name'])
+            if store.path is not None:
+                store.save()
+        return df
+    
+    def _fetch_sector_constituents(self, sector_code: str, date: str) -> pd.DataFrame:
+        """从接口获取某日的板块成分股"""
         if not self.is_connected:
             if not self.connect():
                 return pd.DataFrame()
         
-        if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
-        
         try:
             # 模拟获取板块成分股
             # 实际使用时:
@@ -172,30 +281,203 @@ class WindClient:
         start_date: str,
         end_date: str = None,
         exchange: str = "SZSE"
-    ) -> List[str]:
-        """获取交易日历"""
+    ) -> np.ndarray:
+        """获取交易日历（datetime64[D]数组）"""
         
         if end_date is None:
             end_date = datetime.now().strftime('%Y-%m-%d')
         
         try:
-            # 模拟获取交易日历
-            # 实际使用时:
-            # data = self.wind_api.tdays(start_date, end_date, f"TradingCalendar={exchange}")
-            # return [d.strftime('%Y-%m-%d') for d in data.Data[0]]
-            
-            # 生成工作日历
-            date_range = pd.date_range(start=start_date, end=end_date, freq='B')
-            return [d.strftime('%Y-%m-%d') for d in date_range]
+            # 使用本地缓存的交易所日历（剔除周末和法定节假日）
+            return TradingCalendar.get(exchange).trading_days(start_date, end_date)
             
         except Exception as e:
             print(f"获取交易日历失败: {e}")
-            return []
+            return np.array([], dtype='datetime64[D]')
+    
+    @staticmethod
+    def _store_source(options: Optional[Dict]) -> str:
+        """存储中的数据来源名，不同请求参数（如PriceAdj复权方式）的数据分开存放"""
+        if not options:
+            return 'wind'
+        return 'wind?' + ';'.join(f"{key}={options[key]}" for key in sorted(options))
+    
+    @staticmethod
+    def _column_names(codes: List[str], fields: List[str]) -> List[str]:
+        """生成数据列名，多代码或多字段时为 代码_字段"""
+        if len(codes) > 1 or len(fields) > 1:
+            return [f"{code}_{field}" for code in codes for field in fields]
+        return list(fields)
+
+
+class RealtimeRingBuffer:
+    """实时行情环形缓冲区（预分配数组）"""
+    
+    def __init__(self, columns: List[str], capacity: int = 4096):
+        self.columns = list(columns)
+        self.capacity = max(int(capacity), 1)
+        self._times = np.empty(self.capacity, dtype='datetime64[ns]')
+        self._values = np.empty((self.capacity, len(self.columns)), dtype=np.float64)
+        self._head = 0     # 下一次写入位置
+        self._count = 0    # 未读取的行数
+        self.dropped = 0   # 因缓冲区满而被覆盖的行数
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def push(self, times, values) -> None:
+        """写入一条或一批行情"""
+        times = np.atleast_1d(np.asarray(times, dtype='datetime64[ns]'))
+        values = np.asarray(values, dtype=np.float64).reshape(len(times), len(self.columns))
+        
+        n = len(times)
+        if n > self.capacity:
+            self.dropped += n - self.capacity
+            times, values = times[-self.capacity:], values[-self.capacity:]
+            n = self.capacity
+        
+        positions = (self._head + np.arange(n)) % self.capacity
+        self._times[positions] = times
+        self._values[positions] = values
+        self._head = (self._head + n) % self.capacity
+        
+        overflow = self._count + n - self.capacity
+        if overflow > 0:
+            self.dropped += overflow
+        self._count = min(self._count + n, self.capacity)
+    
+    def drain(self) -> Tuple[np.ndarray, np.ndarray]:
+        """按时间顺序取出全部未读取的数据并清空"""
+        positions = (self._head - self._count + np.arange(self._count)) % self.capacity
+        self._count = 0
+        return self._times[positions], self._values[positions]
+    
+    def to_frame(
+        self,
+        drained: Tuple[np.ndarray, np.ndarray],
+        time_col: str = 'datetime'
+    ) -> pd.DataFrame:
+        """将drain的结果转换为DataFrame"""
+        times, values = drained
+        df = pd.DataFrame(values, columns=self.columns)
+        df.insert(0, time_col, times)
+        return df
+
+
+PRICE_FIELDS = ('CLOSE', 'PRICE')
+VOLUME_FIELDS = ('VOLUME', 'VOL')
+
+
+def generate_mock_history(
+    codes: List[str],
+    fields: List[str],
+    start_date: str,
+    end_date: str,
+    seed: Optional[int] = None,
+    dtype: type = np.float64,
+    long_format: bool = False
+) -> pd.DataFrame:
+    """
+    批量生成模拟历史数据（用于压力测试）
+    
+    所有序列由一次 np.random.Generator 调用生成到同一个二维数组中。
+    
+    Args:
+        codes: 证券代码列表
+        fields: 字段列表，CLOSE/PRICE为带趋势的价格，VOLUME/VOL为成交量
+        start_date: 开始日期
+        end_date: 结束日期
+        seed: 随机种子，相同种子得到相同数据
+        dtype: 数值类型，np.float32 可减半内存
+        long_format: 为True时返回 date/code/field/value 长表
+        
+    Returns:
+        DataFrame: 默认为与get_history_data一致的宽表
+    """
+    dtype = np.dtype(dtype)
+    dates = pd.date_range(start=start_date, end=end_date, freq='D')
+    n_dates, n_codes, n_fields = len(dates), len(codes), len(fields)
+    
+    upper = np.array([str(field).upper() for field in fields])
+    is_price = np.tile(np.isin(upper, PRICE_FIELDS), n_codes)
+    is_volume = np.tile(np.isin(upper, VOLUME_FIELDS), n_codes)
+    
+    # 首行作为每条序列的基准扰动，其余行为逐日噪声
+    rng = np.random.default_rng(seed)
+    block = rng.standard_normal((n_dates + 1, n_codes * n_fields), dtype=dtype)
+    base, data = block[0], block[1:]
+    
+    scale = np.where(is_price, 5, np.where(is_volume, 100, 10)).astype(dtype)
+    offset = np.where(
+        is_price, 100 + base * 20,
+        np.where(is_volume, 1000 + base * 200, 100)
+    ).astype(dtype)
+    data *= scale
+    data += offset
+    
+    price_idx = np.flatnonzero(is_price)
+    if len(price_idx):
+        data[:, price_idx] += np.linspace(0, 10, n_dates, dtype=dtype)[:, None]
+    volume_idx = np.flatnonzero(is_volume)
+    if len(volume_idx):
+        data[:, volume_idx] = np.maximum(data[:, volume_idx], 100)
+    
+    if long_format:
+        return pd.DataFrame({
+            'date': np.repeat(dates.to_numpy(), n_codes * n_fields),
+            'code': pd.Categorical.from_codes(
+                np.tile(np.repeat(np.arange(n_codes), n_fields), n_dates), codes
+            ),
+            'field': pd.Categorical.from_codes(
+                np.tile(np.arange(n_fields), n_codes * n_dates), fields
+            ),
+            'value': data.reshape(-1)
+        })
+    
+    df = pd.DataFrame(data, index=dates, columns=WindClient._column_names(codes, fields), copy=False)
+    df.index.name = 'date'
+    df.reset_index(inplace=True)
+    return df
+
+
+async def simulated_tick_feed(
+    n_columns: int,
+    tick_interval: float = 0.1,
+    n_ticks: Optional[int] = None,
+    base: float = 100.0,
+    seed: Optional[int] = None
+) -> AsyncIterator[Tuple[np.datetime64, np.ndarray]]:
+    """本地模拟行情源（随机游走），用于离线测试"""
+    rng = np.random.default_rng(seed)
+    last = base + rng.standard_normal(n_columns) * 10
+    
+    count = 0
+    while n_ticks is None or count < n_ticks:
+        last = last + rng.standard_normal(n_columns) * 0.1
+        yield np.datetime64(datetime.now(), 'ns'), last.copy()
+        count += 1
+        await asyncio.sleep(tick_interval)
 
 
 class WindDataProcessor:
     """Wind数据处理类"""
     
+    # 按列名（或 代码_字段 中的字段部分）识别的K线聚合方式
+    OHLC_AGG = {
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum',
+        'vol': 'sum',
+        'amount': 'sum',
+        'amt': 'sum',
+        'turnover': 'sum'
+    }
+    
+    # pandas 2的周期末别名，PeriodIndex只接受对应的周期频率
+    PERIOD_ALIASES = {'ME': 'M', 'QE': 'Q', 'YE': 'Y', 'BME': 'M', 'BQE': 'Q', 'BYE': 'Y'}
+    
     @staticmethod
     def clean_wind_data(df: pd.DataFrame) -> pd.DataFrame:
         """清洗Wind数据"""
@@ -216,9 +498,15 @@ class WindDataProcessor:
         df: pd.DataFrame,
         date_col: str,
         freq: str = 'D',
-        method: str = 'mean'
+        method: str = 'mean',
+        exchange: Optional[str] = None
     ) -> pd.DataFrame:
-        """重采样数据"""
+        """重采样数据，指定exchange时按交易日分桶（见resample_trading_days）"""
+        
+        if exchange is not None:
+            return WindDataProcessor.resample_trading_days(
+                df, date_col, freq, exchange=exchange, default_agg=method
+            )
         
         df = df.copy()
         df[date_col] = pd.to_datetime(df[date_col])
@@ -236,4 +524,79 @@ class WindDataProcessor:
             df_resampled = df.resample(freq).mean()
         
         df_resampled.reset_index(inplace=True)
-        return df_resampled
\ No newline at end of file
+        return df_resampled
+    
+    @staticmethod
+    def resample_trading_days(
+        df: pd.DataFrame,
+        date_col: str,
+        freq='W',
+        symbol_col: Optional[str] = None,
+        exchange: str = "SZSE",
+        agg: Optional[Dict[str, str]] = None,
+        default_agg: str = 'mean'
+    ) -> pd.DataFrame:
+        """
+        按交易日分桶重采样
+        
+        只生成有交易日的桶，不会因节假日和周末产生空行；
+        所有列（含多标的长表）在一次分组聚合中完成。
+        
+        Args:
+            df: 数据，可以是宽表或包含symbol_col的长表
+            date_col: 日期列
+            freq: 'D'/'W'/'M'/'Q'/'Y'（也接受'ME'/'QE'/'YE'）按自然周期内的交易日分桶，
+                整数N表示从数据的第一个交易日起每N个交易日一根K线
+            symbol_col: 标的列，长表时按标的分别聚合
+            exchange: 交易所日历
+            agg: 列名到聚合方式的映射，覆盖默认规则
+            default_agg: 未识别列的聚合方式
+            
+        Returns:
+            DataFrame: 日期列为每个桶的最后一个交易日
+        """
+        calendar = TradingCalendar.get(exchange)
+        
+        df = df.copy()
+        df[date_col] = pd.to_datetime(df[date_col])
+        sort_cols = [symbol_col, date_col] if symbol_col else [date_col]
+        df = df.sort_values(sort_cols, kind='stable')
+        
+        # 每行映射到交易日序号，非交易日并入之前最近的交易日
+        day_idx = calendar.trading_day_index(df[date_col].to_numpy())
+        if np.any(day_idx < 0):
+            raise ValueError("数据日期早于交易日历起点")
+        
+        if isinstance(freq, (int, np.integer)):
+            # 从第一个交易日起每N个交易日一个桶，最后一个不完整的桶以最后出现的交易日为标签
+            start = day_idx.min()
+            bucket = (day_idx - start) // int(freq)
+            label_idx = np.minimum(start + bucket * int(freq) + int(freq) - 1, day_idx.max())
+        elif freq == 'D':
+            label_idx = day_idx
+        else:
+            # 先对日历上的交易日计算一次周期编号，再按序号取值
+            base, sep, anchor = str(freq).upper().partition('-')
+            freq = WindDataProcessor.PERIOD_ALIASES.get(base, base) + sep + anchor
+            codes = pd.PeriodIndex(calendar.days, freq=freq).asi8
+            last_in_bucket = np.searchsorted(codes, codes, side='right') - 1
+            label_idx = last_in_bucket[day_idx]
+        
+        labels = calendar.days[label_idx].astype('datetime64[ns]')
+        
+        value_cols = [col for col in df.columns if col not in (date_col, symbol_col)]
+        agg_map = {}
+        for col in value_cols:
+            field = str(col).rsplit('_', 1)[-1].lower()
+            agg_map[col] = WindDataProcessor.OHLC_AGG.get(
+                str(col).lower(), WindDataProcessor.OHLC_AGG.get(field, default_agg)
+            )
+        agg_map.update(agg or {})
+        
+        keys = [df[symbol_col].to_numpy(), labels] if symbol_col else [labels]
+        names = [symbol_col, date_col] if symbol_col else [date_col]
+        result = df[value_cols].groupby(keys, sort=True).agg(agg_map)
+        result.index.names = names
+        result.reset_index(inplace=True)
+        
+        return result[[date_col] + ([symbol_col] if symbol_col else []) + value_cols]
@@ -0,0 +1,249 @@
+"""
+WindPy数据客户端
+对接真实WindPy接口：复用单个会话，将大请求拆分为接口可接受的分块并发获取
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .wind_client import WindClient
+
+
+class WindPyClient(WindClient):
+    """基于WindPy的数据客户端，接口与WindClient一致"""
+
+    def __init__(
+        self,
+        wind_api: Any = None,
+        max_codes_per_request: int = 100,
+        max_days_per_request: int = 366 * 3,
+        max_concurrency: int = 4,
+        wait_time: int = 60,
+        store=None
+    ):
+        """
+        Args:
+            wind_api: WindPy的w对象，为None时在connect时导入；测试时可传入模拟对象
+            max_codes_per_request: 单次wsd请求的最大代码数
+            max_days_per_request: 单次wsd请求的最大自然日跨度
+            max_concurrency: 并发请求数上限（接口配额）
+            wait_time: w.start的等待时间（秒）
+            store: 可选的本地时间序列存储（TimeSeriesStore）
+        """
+        super().__init__(store)
+        self.wind_api = wind_api
+        self.max_codes_per_request = max_codes_per_request
+        self.max_days_per_request = max_days_per_request
+        self.max_concurrency = max_concurrency
+        self.wait_time = wait_time
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    def connect(self) -> bool:
+        """连接Wind API，已有会话时直接复用"""
+        with self._lock:
+            if self.is_connected:
+                return True
+
+            try:
+                if self.wind_api is None:
+                    from WindPy import w
+                    self.wind_api = w
+
+                if not self.wind_api.isconnected():
+                    result = self.wind_api.start(waitTime=self.wait_time)
+                    self._check(result, "w.start")
+
+                self.is_connected = True
+                return True
+
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Wind API连接失败: {e}")
+                return False
+
+    def disconnect(self) -> None:
+        """断开Wind API连接"""
+        with self._lock:
+            if self.wind_api is not None and self.is_connected:
+                self.wind_api.close()
+                self.is_connected = False
+                print("Wind API连接已断开")
+
+    def _fetch_history(
+        self,
+        codes: List[str],
+        fields: List[str],
+        start_date: str,
+        end_date: str,
+        options: Optional[Dict] = None
+    ) -> pd.DataFrame:
+        """获取历史数据（按代码、字段、日期分块并发请求）"""
+
+        option_str = self._format_options(options)
+        windows = self._date_windows(start_date, end_date, self.max_days_per_request)
+        code_chunks = [
+            codes[i:i + self.max_codes_per_request]
+            for i in range(0, len(codes), self.max_codes_per_request)
+        ]
+
+        # wsd只支持“多代码单字段”或“单代码多字段”，这里统一按字段拆分
+        tasks = [
+            (window_idx, window, field_idx, field, chunk_start, chunk)
+            for window_idx, window in enumerate(windows)
+            for field_idx, field in enumerate(fields)
+            for chunk_start, chunk in zip(
+                range(0, len(codes), self.max_codes_per_request), code_chunks
+            )
+        ]
+
+        def fetch(task):
+            _, (start, end), _, field, _, chunk = task
+            data = self._call('wsd', ','.join(chunk), field, start, end, option_str)
+            return data.Times, np.asarray(data.Data, dtype=np.float64)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = list(executor.map(fetch, tasks))
+
+        n_fields = len(fields)
+        blocks: List[Optional[np.ndarray]] = [None] * len(windows)
+        times: List[Optional[list]] = [None] * len(windows)
+
+        for task, (chunk_times, values) in zip(tasks, results):
+            window_idx, _, field_idx, _, chunk_start, chunk = task
+            if blocks[window_idx] is None:
+                times[window_idx] = list(chunk_times)
+                blocks[window_idx] = np.empty(
+                    (len(chunk_times), len(codes) * n_fields), dtype=np.float64
+                )
+            elif len(chunk_times) != len(times[window_idx]):
+                raise RuntimeError("分块返回的日期序列不一致")
+
+            # Data按代码排列: (代码数, 日期数)，转置为视图后写入目标列
+            columns = (chunk_start + np.arange(len(chunk))) * n_fields + field_idx
+            blocks[window_idx][:, columns] = values.reshape(len(chunk), -1).T
+
+        values = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+        index = pd.DatetimeIndex(
+            [t for window_times in times for t in window_times], name='date'
+        )
+
+        df = pd.DataFrame(
+            values, index=index, columns=self._column_names(codes, fields), copy=False
+        )
+        df.reset_index(inplace=True)
+        return df
+
+    def get_realtime_data(
+        self,
+        codes: List[str],
+        fields: List[str],
+        options: Optional[Dict] = None
+    ) -> pd.DataFrame:
+        """获取实时数据"""
+
+        if not self.is_connected:
+            if not self.connect():
+                return pd.DataFrame()
+
+        try:
+            data = self._call('wsq', ','.join(codes), ','.join(fields), self._format_options(options))
+
+            # wsq的Data按字段排列: (字段数, 代码数)，转置后按 代码_字段 展开
+            values = np.asarray(data.Data, dtype=np.float64).reshape(len(fields), len(codes))
+            df = pd.DataFrame(
+                values.T.reshape(1, -1),
+                columns=self._column_names(codes, fields),
+                index=[datetime.now()]
+            )
+            df.index.name = 'datetime'
+            df.reset_index(inplace=True)
+            return df
+
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"获取实时数据失败: {e}")
+            return pd.DataFrame()
+
+    def _fetch_sector_constituents(self, sector_code: str, date: str) -> pd.DataFrame:
+        """通过wset获取某日的板块成分股（code, name），存储的读取和写入由WindClient处理"""
+
+        if not self.is_connected:
+            if not self.connect():
+                return pd.DataFrame()
+
+        try:
+            data = self._call('wset', "sectorconstituent", f"date={date};sectorid={sector_code}")
+            df = pd.DataFrame(dict(zip(data.Fields, data.Data)))
+            df = df.rename(columns={'wind_code': 'code', 'sec_name': 'name'})
+            return df[['code', 'name']]
+
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"获取板块成分股失败: {e}")
+            return pd.DataFrame()
+
+    def get_trading_calendar(
+        self,
+        start_date: str,
+        end_date: str = None,
+        exchange: str = "SZSE"
+    ) -> np.ndarray:
+        """获取交易日历（datetime64[D]数组）"""
+
+        if not self.is_connected:
+            if not self.connect():
+                return np.array([], dtype='datetime64[D]')
+
+        if end_date is None:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+
+        try:
+            data = self._call('tdays', start_date, end_date, f"TradingCalendar={exchange}")
+            return np.array(data.Data[0], dtype='datetime64[D]')
+
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"获取交易日历失败: {e}")
+            return np.array([], dtype='datetime64[D]')
+
+    def _call(self, method: str, *args) -> Any:
+        """调用WindPy接口并检查错误码"""
+        with self._lock:
+            self.request_count += 1
+        result = getattr(self.wind_api, method)(*args)
+        self._check(result, f"w.{method}")
+        return result
+
+    @staticmethod
+    def _check(result: Any, name: str) -> None:
+        """WindPy返回非零ErrorCode时抛出异常"""
+        error_code = getattr(result, 'ErrorCode', 0)
+        if error_code != 0:
+            raise RuntimeError(f"{name} 返回错误码 {error_code}: {getattr(result, 'Data', '')}")
+
+    @staticmethod
+    def _format_options(options: Optional[Dict]) -> str:
+        """将参数字典转换为Wind选项字符串，如 PriceAdj=F;Period=D"""
+        if not options:
+            return ""
+        return ";".join(f"{key}={value}" for key, value in options.items())
+
+    @staticmethod
+    def _date_windows(
+        start_date: str,
+        end_date: str,
+        max_days: int
+    ) -> List[Tuple[str, str]]:
+        """将日期区间拆分为不超过max_days自然日的窗口"""
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        windows = []
+        while start <= end:
+            window_end = min(start + pd.Timedelta(days=max_days - 1), end)
+            windows.append((start.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d')))
+            start = window_end + pd.Timedelta(days=1)
+        return windows
@@ -0,0 +1,37 @@
+import pytest
+import pandas as pd
+
+pytest.importorskip('pytest_benchmark')
+
+
+# 模拟数据覆盖的时间跨度，规模越大时间间隔越密
+BENCH_START = pd.Timestamp('2016-01-01')
+BENCH_END = pd.Timestamp('2025-12-31')
+
+
+def pytest_generate_tests(metafunc):
+    """按--bench-rows参数化数据规模；未指定时跳过"""
+    if 'bench_rows' not in metafunc.fixturenames:
+        return
+
+    option = metafunc.config.getoption('bench_rows')
+    if option:
+        sizes = [int(size.replace('_', '')) for size in option.split(',')]
+        params = [pytest.param(size, id=f"{size:_}") for size in sizes]
+    else:
+        params = [pytest.param(0, id='skipped', marks=pytest.mark.skip(reason="未指定--bench-rows"))]
+    metafunc.parametrize('bench_rows', params, scope='session')
+
+
+@pytest.fixture(scope='session')
+def bench_dataframe(bench_rows, price_dataframe_factory):
+    """规模为bench_rows的模拟行情数据，时间均匀分布在2016-2025年"""
+    step = max((BENCH_END - BENCH_START) // bench_rows, pd.Timedelta(seconds=1))
+    dates = pd.date_range(BENCH_START, periods=bench_rows, freq=step)
+    return price_dataframe_factory(dates)
+
+
+@pytest.fixture(scope='session')
+def bench_value_dataframe(bench_dataframe):
+    """只包含date和value列的数据"""
+    return bench_dataframe[['date', 'price']].rename(columns={'price': 'value'})
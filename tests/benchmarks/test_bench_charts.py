@@ -0,0 +1,60 @@
+import pytest
+
+from visualkit.charts.seasonal_chart import SeasonalChart
+from visualkit.charts.time_series_chart import TimeSeriesChart
+from visualkit.utils.chart_server import dump_chart_options
+
+
+@pytest.fixture(scope='module')
+def line_chart(bench_dataframe):
+    """用于渲染测试的时间序列图"""
+    return TimeSeriesChart().create_time_series_line(bench_dataframe, 'date', ['close'])
+
+
+@pytest.mark.benchmark(group='charts')
+class TestChartBenchmarks:
+
+    @pytest.mark.parametrize('calendar_type', ['gregorian', 'lunar'])
+    def test_seasonal_line(self, benchmark, bench_value_dataframe, calendar_type):
+        """季节性折线图"""
+        benchmark(SeasonalChart().create_seasonal_line, bench_value_dataframe, calendar_type=calendar_type)
+
+    def test_seasonal_grid(self, benchmark, bench_dataframe):
+        """多指标季节性网格图"""
+        benchmark(SeasonalChart().create_seasonal_grid, bench_dataframe, 'date', ['close', 'price'])
+
+    def test_time_series_line(self, benchmark, bench_dataframe):
+        """时间序列折线图"""
+        benchmark(TimeSeriesChart().create_time_series_line, bench_dataframe, 'date', ['close', 'price'])
+
+    def test_incremental_line(self, benchmark, bench_dataframe):
+        """增量缓冲区构建与option输出"""
+        def build():
+            return TimeSeriesChart().create_incremental_line(bench_dataframe, 'date', ['close']).to_option()
+
+        benchmark(build)
+
+    def test_candlestick(self, benchmark, bench_dataframe):
+        """K线图（逐行构造数据，只运行少量轮次）"""
+        benchmark.pedantic(
+            TimeSeriesChart().create_candlestick_chart,
+            args=(bench_dataframe, 'date', 'open', 'close', 'low', 'high'),
+            rounds=3
+        )
+
+    def test_volume_chart(self, benchmark, bench_dataframe):
+        """成交量图"""
+        benchmark(TimeSeriesChart().create_volume_chart, bench_dataframe, 'date', 'volume')
+
+
+@pytest.mark.benchmark(group='render')
+class TestRenderBenchmarks:
+
+    def test_dump_options(self, benchmark, line_chart):
+        """option序列化为JSON"""
+        benchmark(dump_chart_options, line_chart)
+
+    def test_render_html(self, benchmark, line_chart, tmp_path):
+        """渲染HTML文件"""
+        path = str(tmp_path / 'chart.html')
+        benchmark(TimeSeriesChart().save_chart, line_chart, path)
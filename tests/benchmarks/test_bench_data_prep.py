@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+
+from visualkit.core.calendar_manager import CalendarManager
+from visualkit.core.data_processor import DataProcessor
+from visualkit.utils.data_formatter import DataFormatter
+
+
+PRICE_COLS = ['open', 'high', 'low', 'close', 'price']
+
+
+@pytest.mark.benchmark(group='data_prep')
+class TestDataPrepBenchmarks:
+
+    def test_lunar_aligned_data(self, benchmark, bench_value_dataframe):
+        """春节对齐"""
+        result = benchmark(
+            CalendarManager().get_lunar_aligned_data,
+            bench_value_dataframe, 'date', 'value', (-70, 70)
+        )
+        assert len(result)
+
+    def test_pivot_for_seasonal(self, benchmark, bench_value_dataframe):
+        """季节性透视表"""
+        result = benchmark(DataProcessor.pivot_for_seasonal, bench_value_dataframe, 'date', 'value')
+        assert result.shape == (12, 10)
+
+    def test_aggregate_by_period(self, benchmark, bench_dataframe):
+        """按月聚合"""
+        benchmark(DataFormatter.aggregate_by_period, bench_dataframe, 'date', PRICE_COLS, 'M')
+
+    def test_create_derived_features(self, benchmark, bench_value_dataframe):
+        """衍生特征"""
+        benchmark(DataFormatter.create_derived_features, bench_value_dataframe, 'date', 'value')
+
+    def test_rolling_stats(self, benchmark, bench_dataframe):
+        """滚动统计量"""
+        benchmark(DataFormatter.calculate_rolling_stats, bench_dataframe, PRICE_COLS, 30)
+
+    def test_normalize(self, benchmark, bench_dataframe):
+        """归一化"""
+        benchmark(DataFormatter.normalize_data, bench_dataframe, PRICE_COLS, 'z_score')
+
+    @pytest.mark.parametrize('method,window', [('iqr', None), ('zscore', 250), ('hampel', 21)])
+    def test_remove_outliers(self, benchmark, bench_dataframe, method, window):
+        """异常值检测"""
+        benchmark(DataFormatter.remove_outliers, bench_dataframe, PRICE_COLS, method, window=window, mode='combined')
+
+    @pytest.mark.parametrize('method', ['forward_fill', 'interpolate', 'mean'])
+    def test_handle_missing_values(self, benchmark, bench_dataframe, method):
+        """缺失值填充（约10%缺失）"""
+        df = bench_dataframe.copy()
+        mask = np.random.default_rng(0).random(len(df)) < 0.1
+        df.loc[mask, PRICE_COLS] = np.nan
+        benchmark(DataFormatter.handle_missing_values, df, method, date_col='date')
@@ -1,15 +1,25 @@
+import os
+
 import pytest
 import pandas as pd
 import numpy as np
 
 
-@pytest.fixture
-def sample_dataframe():
-    """创建标准测试数据"""
-    dates = pd.date_range('2021-01-01', '2023-12-31', freq='D')
+def pytest_addoption(parser):
+    group = parser.getgroup('visualkit')
+    group.addoption(
+        '--bench-rows',
+        default=os.environ.get('VISUALKIT_BENCH_ROWS'),
+        help="运行tests/benchmarks的数据规模，逗号分隔，如 1000000,10000000,50000000"
+             "（也可用环境变量VISUALKIT_BENCH_ROWS）；未指定时跳过基准测试"
+    )
+
+
+def make_price_dataframe(dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """按给定日期生成模拟行情数据"""
     np.random.seed(42)  # 确保可重复
     
-    data = pd.DataFrame({
+    return pd.DataFrame({
         'date': dates,
         'open': 100 + np.random.randn(len(dates)).cumsum(),
         'high': 102 + np.random.randn(len(dates)).cumsum(),
@@ -18,8 +28,19 @@ def sample_dataframe():
         'volume': np.random.randint(1000, 10000, len(dates)),
         'price': 100 + np.random.randn(len(dates)).cumsum()
     })
-    
-    return data
+
+
+@pytest.fixture(scope='session')
+def price_dataframe_factory():
+    """按日期生成模拟行情数据的函数，供基准测试按规模构造数据"""
+    return make_price_dataframe
+
+
+@pytest.fixture
+def sample_dataframe():
+    """创建标准测试数据"""
+    dates = pd.date_range('2021-01-01', '2023-12-31', freq='D')
+    return make_price_dataframe(dates)
 
 
 @pytest.fixture
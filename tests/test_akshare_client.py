@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import pandas as pd
+
+pytest.importorskip('akshare')
+
+from visualkit.core.akshare_client import AkShareClient, AsyncAkShareClient
+
+
+@pytest.fixture
+def slow_fetch(monkeypatch):
+    """用计数的慢速假接口替换get_stock_daily"""
+    calls = []
+    lock = threading.Lock()
+    
+    def fake(symbol, start_date, end_date):
+        with lock:
+            calls.append(symbol)
+        time.sleep(0.05)
+        return pd.DataFrame({'date': pd.date_range(start_date, end_date), 'close': 1.0})
+    
+    monkeypatch.setattr(AkShareClient, 'get_stock_daily', staticmethod(fake))
+    return calls
+
+
+class TestAsyncAkShareClient:
+    
+    def test_concurrent_requests_coalesced(self, slow_fetch):
+        """测试相同参数的并发请求只获取一次"""
+        client = AsyncAkShareClient()
+        
+        async def run():
+            return await asyncio.gather(
+                client.get_stock_daily('000001', '20240101', '20240110'),
+                client.get_stock_daily('000001', '20240101', '20240110'),
+                client.get_stock_daily('600000', '20240101', '20240110')
+            )
+        
+        first, second, other = asyncio.run(run())
+        
+        assert sorted(slow_fetch) == ['000001', '600000']
+        assert first is second
+        assert client.coalesced_calls == 1
+    
+    def test_cancel_one_waiter(self, slow_fetch):
+        """测试取消单个等待者不影响其他等待者"""
+        client = AsyncAkShareClient()
+        
+        async def run():
+            cancelled = asyncio.ensure_future(client.get_stock_daily('000001', '20240101', '20240102'))
+            kept = asyncio.ensure_future(client.get_stock_daily('000001', '20240101', '20240102'))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            result = await kept
+            return cancelled.cancelled(), result
+        
+        was_cancelled, result = asyncio.run(run())
+        
+        assert was_cancelled
+        assert len(result) == 2
+        assert slow_fetch == ['000001']
+
+
+class TestSingleFlight:
+    
+    def test_threads_share_one_fetch(self):
+        """测试多线程相同请求只执行一次"""
+        from visualkit.core.single_flight import SingleFlight, single_flight
+        
+        flight = SingleFlight()
+        calls = []
+        
+        @single_flight(flight)
+        def fetch(symbol):
+            calls.append(symbol)
+            time.sleep(0.05)
+            return [symbol]
+        
+        results = [None] * 4
+        
+        def worker(idx):
+            results[idx] = fetch('000001')
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert calls == ['000001']
+        assert all(result is results[0] for result in results)
+        assert flight.metrics() == {'calls': 4, 'executions': 1, 'deduplicated': 3, 'errors': 0}
+    
+    def test_error_shared_and_not_cached(self):
+        """测试异常传递给所有调用方且不缓存"""
+        from visualkit.core.single_flight import SingleFlight
+        
+        flight = SingleFlight()
+        
+        def fail():
+            raise RuntimeError("upstream down")
+        
+        with pytest.raises(RuntimeError):
+            flight.do('key', fail)
+        assert flight.do('key', lambda: 42) == 42
+        assert flight.metrics()['errors'] == 1
+
+
+class TestSymbolListing:
+    
+    def test_list_and_search_use_symbol_master(self, tmp_path, monkeypatch):
+        """测试代码列表返回完整代码表并支持市场过滤"""
+        from visualkit.core.symbol_master import SymbolMaster
+        
+        codes = [f"sz{i:06d}" for i in range(60)] + ['sh600000']
+        monkeypatch.setitem(SymbolMaster.LOADERS, 'stock', lambda: pd.DataFrame({
+            'code': codes, 'name': [f"股票{i}" for i in range(61)]
+        }))
+        monkeypatch.setattr(AkShareClient, 'symbol_master', SymbolMaster(tmp_path))
+        
+        assert len(AkShareClient.list_available_symbols("stock")) == 61
+        assert AkShareClient.list_available_symbols("stock", market="SH") == ['sh600000']
+        assert AkShareClient.list_available_symbols("stock", limit=3) == codes[:3]
+        assert AkShareClient.search_symbols("sh6")['code'].tolist() == ['sh600000']
+
+
+class TestEconomicIndicators:
+    
+    @pytest.fixture
+    def catalog(self, tmp_path, monkeypatch):
+        """使用假数据源的经济指标目录"""
+        from visualkit.core.economic_indicators import EconomicIndicatorCatalog
+        
+        calls = []
+        
+        def fake_cpi():
+            calls.append('CPI')
+            return pd.DataFrame({
+                '商品': '中国CPI年率',
+                '日期': ['2024-03-09', '2024-01-12', '2024-02-08', '2024-04-11'],
+                '今值': [0.1, -0.8, 0.7, None]
+            })
+        
+        def fake_rate():
+            return pd.DataFrame({'TRADE_DATE': ['2024-01-22', '2024-02-20'], 'LPR1Y': ['3.45', '3.45']})
+        
+        catalog = EconomicIndicatorCatalog(tmp_path, indicators={})
+        catalog.register('CPI', fake_cpi, {'日期': 'date', '今值': 'value'})
+        catalog.register('lpr1y', fake_rate, {'TRADE_DATE': 'date', 'LPR1Y': 'value'})
+        catalog.calls = calls
+        monkeypatch.setattr(AkShareClient, 'indicator_catalog', catalog)
+        return catalog
+    
+    def test_range_applied(self, catalog):
+        """测试区间过滤生效且序列已排序、剔除未公布值"""
+        df = AkShareClient.get_economic_indicator('cpi', '2024-02-01', '2024-12-31')
+        assert df['date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-02-08', '2024-03-09']
+        assert df['value'].tolist() == [0.7, 0.1]
+        
+        AkShareClient.get_economic_indicator('CPI', '2024-01-01', '2024-01-31')
+        assert catalog.calls == ['CPI']
+    
+    def test_many_aligned(self, catalog):
+        """测试多指标按日期对齐为宽表"""
+        df = AkShareClient.get_economic_indicators(['CPI', 'LPR1Y'], '2024-01-01', '2024-02-28')
+        assert list(df.columns) == ['date', 'CPI', 'LPR1Y']
+        assert len(df) == 4
+        assert df['CPI'].notna().sum() == 2
+        assert df['LPR1Y'].notna().sum() == 2
+    
+    def test_unknown_indicator(self, catalog):
+        with pytest.raises(RuntimeError):
+            AkShareClient.get_economic_indicator('GDP', '2024-01-01', '2024-12-31')
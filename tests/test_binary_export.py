@@ -0,0 +1,134 @@
+import base64
+import gzip
+import json
+import re
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+from visualkit import SeasonalChart, TimeSeriesChart
+from visualkit.charts.binary_export import encode_chart_payload, render_binary
+
+
+def decode_payload(payload: bytes):
+    """按visualkitDecodeOption的格式解析payload，返回(头部, {路径: 数组})"""
+    buffer = gzip.decompress(payload)
+    header_length = struct.unpack('<I', buffer[:4])[0]
+    header = json.loads(buffer[4:4 + header_length].decode('utf-8'))
+    data_start = -(-(4 + header_length) // 8) * 8
+    columns = {
+        tuple(column['target']): np.frombuffer(
+            buffer, dtype=column['dtype'], count=column['length'], offset=data_start + column['offset']
+        )
+        for column in header['columns']
+    }
+    return header, columns
+
+
+class TestBinaryExport:
+
+    @pytest.fixture
+    def chart(self):
+        """创建图表实例"""
+        return TimeSeriesChart()
+
+    def test_round_trip(self, chart, sample_dataframe):
+        """测试数值列还原后与原数据一致，option中不再包含明文数值"""
+        df = sample_dataframe.copy()
+        df.loc[df.index[5], 'close'] = np.nan
+        line = chart.create_time_series_line(df, 'date', ['close', 'price'])
+        plain = line.get_options()
+
+        header, columns = decode_payload(encode_chart_payload(line, dtype='float64'))
+
+        assert '"series"' in header['option']
+        assert all(column['offset'] % 8 == 0 for column in header['columns'])
+        for idx in range(2):
+            values = columns[('series', idx, 'data')]
+            expected = [np.nan if point[1] is None else point[1] for point in plain['series'][idx]['data']]
+            np.testing.assert_array_equal(values, np.array(expected, dtype=np.float64))
+        assert np.isnan(columns[('series', 0, 'data')][5])
+
+    def test_range_bars_round_trip(self, chart):
+        """测试K线的[low, high]数据不被当作[x, y]，还原后与原option一致"""
+        df = pd.DataFrame({
+            'date': pd.date_range('2024-01-01', periods=3),
+            'open': [1.0, 2.0, 3.0],
+            'close': [1.5, 2.5, 3.5],
+            'low': [0.5, 1.5, 2.5],
+            'high': [2.0, 3.0, 4.0]
+        })
+        candle = chart.create_candlestick_chart(df, 'date', 'open', 'close', 'low', 'high')
+        plain = json.loads(candle.dump_options())
+
+        header, columns = decode_payload(encode_chart_payload(candle, dtype='float64'))
+        option = json.loads(header['option'])
+        for (*path, key), values in columns.items():
+            target = option
+            for step in path:
+                target = target[step]
+            target[key] = values.tolist()
+
+        assert option['series'][0]['data'] == [[0.5, 2.0], [1.5, 3.0], [2.5, 4.0]]
+        assert [series['data'] for series in option['series']] == [series['data'] for series in plain['series']]
+
+    def test_float32_and_auto(self, chart, sample_dataframe):
+        """测试float32的精度与auto按列选择类型"""
+        line = chart.create_time_series_line(sample_dataframe, 'date', ['close', 'volume'])
+        _, columns = decode_payload(encode_chart_payload(line, dtype='float32'))
+        np.testing.assert_allclose(columns[('series', 0, 'data')], sample_dataframe['close'], rtol=1e-6)
+
+        header, _ = decode_payload(encode_chart_payload(line, dtype='auto'))
+        assert [column['dtype'] for column in header['columns']] == ['float64', 'float32']
+
+    def test_default_lossless(self):
+        """测试默认不丢精度，显式float32时按7位有效数字还原"""
+        option = {'xAxis': [{'data': ['a', 'b', 'c']}], 'series': [{'type': 'line', 'data': [3456.78, 0.1, None]}]}
+        header, columns = decode_payload(encode_chart_payload(option))
+        assert header['columns'][0]['dtype'] == 'float64'
+        assert 'precision' not in header['columns'][0]
+        assert columns[('series', 0, 'data')][:2].tolist() == [3456.78, 0.1]
+
+        header, columns = decode_payload(encode_chart_payload(option, dtype='float32'))
+        precision = header['columns'][0]['precision']
+        values = columns[('series', 0, 'data')].astype(np.float64)
+        assert values[0] != 3456.78
+        assert [float(f"{v:.{precision}g}") for v in values[:2]] == [3456.78, 0.1]
+
+    def test_dataset_mode(self, chart, sample_dataframe):
+        """测试dataset模式下编码source中的数值列，x轴标签留在option中"""
+        line = chart.create_time_series_line(sample_dataframe, 'date', ['close'], dataset=True)
+        header, columns = decode_payload(encode_chart_payload(line))
+
+        assert list(columns) == [('dataset', 0, 'source', 's0')]
+        assert '2021-01-01' in header['option']
+
+    def test_chart_unchanged(self, sample_dataframe):
+        """测试编码不修改图表本身的option"""
+        grid = SeasonalChart().create_seasonal_grid(sample_dataframe, 'date', ['close', 'price'])
+        before = grid.dump_options()
+        encode_chart_payload(grid)
+        assert grid.dump_options() == before
+
+    def test_render(self, chart, sample_dataframe, tmp_path):
+        """测试生成的页面只包含压缩payload和解码脚本"""
+        line = chart.create_time_series_line(sample_dataframe, 'date', ['close'])
+        path = tmp_path / 'binary.html'
+        chart.save_chart(line, str(path), embed='binary')
+        page = path.read_text(encoding='utf-8')
+
+        blob = re.search(r'-data">([^<]+)<', page).group(1)
+        assert gzip.decompress(base64.b64decode(blob))
+        assert 'function visualkitDecodeOption' in page
+        assert '"series"' not in page
+
+    def test_invalid_dtype(self, chart, sample_dataframe, tmp_path):
+        """测试不支持的数值类型和嵌入方式"""
+        line = chart.create_time_series_line(sample_dataframe, 'date', ['close'])
+        with pytest.raises(ValueError):
+            encode_chart_payload(line, dtype='int8')
+        with pytest.raises(ValueError):
+            render_binary(line, str(tmp_path / 'x.html'), dtype='float16')
+        with pytest.raises(ValueError):
+            chart.save_chart(line, str(tmp_path / 'y.html'), embed='msgpack')
@@ -0,0 +1,87 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+import pandas as pd
+import numpy as np
+from visualkit import ChartServer
+
+
+class TestChartServer:
+
+    @pytest.fixture
+    def server(self):
+        """创建注册了时间序列端点的服务"""
+        dates = pd.date_range('2021-01-01', '2021-12-31', freq='D')
+        data = pd.DataFrame({
+            'date': dates,
+            'value': np.arange(len(dates), dtype=float)
+        })
+
+        server = ChartServer(port=0, compress_min_size=256)
+        server.register_time_series(
+            'demo', lambda: data, 'date', ['value'], title='测试'
+        )
+        return server
+
+    def test_returns_option_json(self, server):
+        """测试返回图表option JSON"""
+        status, headers, body = server.build_response('GET', '/charts/demo')
+
+        assert status == 200
+        option = json.loads(body)
+        assert option['series'][0]['name'] == 'value'
+        assert headers['ETag'].startswith('"')
+
+    def test_not_modified(self, server):
+        """测试ETag命中时返回304"""
+        _, headers, _ = server.build_response('GET', '/charts/demo')
+        status, _, body = server.build_response(
+            'GET', '/charts/demo', {'If-None-Match': headers['ETag']}
+        )
+
+        assert status == 304
+        assert body == b''
+
+    def test_gzip_compression(self, server):
+        """测试大响应使用gzip压缩"""
+        _, plain_headers, plain = server.build_response('GET', '/charts/demo')
+        status, headers, body = server.build_response(
+            'GET', '/charts/demo', {'Accept-Encoding': 'gzip'}
+        )
+
+        assert status == 200
+        assert headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(body) == plain
+
+        # 压缩变体的ETag同样可以用于协商缓存
+        status, _, _ = server.build_response(
+            'GET', '/charts/demo', {'If-None-Match': headers['ETag']}
+        )
+        assert status == 304
+
+    def test_unknown_chart(self, server):
+        """测试未注册的端点"""
+        status, _, _ = server.build_response('GET', '/charts/missing')
+        assert status == 404
+
+    def test_http_roundtrip(self, server):
+        """测试通过socket请求服务"""
+        async def fetch():
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection(server.host, server.port)
+                writer.write(b'GET /charts HTTP/1.1\r\nHost: localhost\r\n\r\n')
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                return response
+            finally:
+                await server.stop()
+
+        response = asyncio.run(fetch())
+        head, _, body = response.partition(b'\r\n\r\n')
+
+        assert head.startswith(b'HTTP/1.1 200')
+        assert json.loads(body) == ['demo']
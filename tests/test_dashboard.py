@@ -0,0 +1,58 @@
+import base64
+import gzip
+import json
+import re
+import struct
+
+import pytest
+from visualkit import SeasonalChart, TimeSeriesChart
+from visualkit.charts.dashboard import Dashboard
+
+
+class TestDashboard:
+
+    @pytest.fixture
+    def dashboard(self, sample_dataframe):
+        """包含三个指标的季节性仪表盘"""
+        return SeasonalChart().create_seasonal_dashboard(
+            sample_dataframe, 'date', ['close', 'price', 'volume'], columns=3
+        )
+
+    def test_inline_payload(self, dashboard, tmp_path):
+        """测试页内payload为可解压的二进制option，页面不包含明文数据"""
+        path = tmp_path / 'dashboard.html'
+        dashboard.render(str(path))
+        page = path.read_text(encoding='utf-8')
+
+        blobs = re.findall(r'id="vk-chart-\d+-data">([^<]+)<', page)
+        assert len(blobs) == len(dashboard) == 3
+        buffer = gzip.decompress(base64.b64decode(blobs[0]))
+        header_length = struct.unpack('<I', buffer[:4])[0]
+        header = json.loads(buffer[4:4 + header_length].decode('utf-8'))
+        assert '"series"' in header['option'] and 'function(params)' in header['option']
+        assert header['columns'] and 'function visualkitDecodeOption' in page
+        assert '"series"' not in page
+        assert 'repeat(3,' in page and 'IntersectionObserver' in page
+
+    def test_sidecar_payload(self, sample_dataframe, tmp_path):
+        """测试旁路文件按图表写出，页面只引用文件"""
+        dashboard = Dashboard(payload='sidecar')
+        chart = TimeSeriesChart()
+        for col in ['open', 'close']:
+            dashboard.add(chart.create_time_series_line(sample_dataframe, 'date', [col]), title=col)
+
+        path = tmp_path / 'report.html'
+        dashboard.render(str(path))
+        page = path.read_text(encoding='utf-8')
+
+        files = sorted(p.name for p in (tmp_path / 'report_charts').iterdir())
+        assert files == ['vk-chart-0.js', 'vk-chart-1.js']
+        assert 'data-src="report_charts/vk-chart-1.js"' in page
+        assert 'function visualkitInflate' not in page
+        script = (tmp_path / 'report_charts' / 'vk-chart-0.js').read_text(encoding='utf-8')
+        assert script.startswith('visualkitDashboard.register("vk-chart-0"')
+
+    def test_invalid_payload(self):
+        """测试不支持的payload方式"""
+        with pytest.raises(ValueError):
+            Dashboard(payload='zip')
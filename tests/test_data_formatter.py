@@ -0,0 +1,165 @@
+import pytest
+import pandas as pd
+import numpy as np
+from visualkit.utils.data_formatter import DataFormatter, MissingValueFiller
+
+
+class TestRemoveOutliers:
+    
+    @pytest.fixture
+    def spiky_dataframe(self):
+        """在上升趋势上加入两个尖峰"""
+        n = 1000
+        rng = np.random.default_rng(42)
+        df = pd.DataFrame({
+            'date': pd.date_range('2021-01-01', periods=n, freq='D'),
+            'price': np.linspace(50, 150, n) + rng.normal(0, 0.5, n),
+            'volume': 5000.0 + np.arange(n) % 7 * 10
+        })
+        df.loc[100, 'price'] += 30
+        df.loc[800, 'price'] -= 30
+        return df
+    
+    def test_drop_combined_mask(self, spiky_dataframe):
+        """测试各列异常合并为一个掩码删除，且不影响原数据"""
+        df = spiky_dataframe.copy()
+        df.loc[5, 'volume'] = 10 ** 7
+        
+        result = DataFormatter.remove_outliers(df, ['price', 'volume'], method='hampel', threshold=5, mode='combined')
+        assert {5, 100, 800}.isdisjoint(result.index)
+        assert len(result) == len(df) - 3
+        assert len(df) == len(spiky_dataframe)
+    
+    def test_hampel_finds_local_spikes(self, spiky_dataframe):
+        """测试滚动MAD只标记局部尖峰，全局阈值无法识别趋势中的尖峰"""
+        flagged = DataFormatter.remove_outliers(spiky_dataframe, ['price'], method='hampel', threshold=5, action='flag')
+        assert np.flatnonzero(flagged['is_outlier']).tolist() == [100, 800]
+        
+        global_iqr = DataFormatter.remove_outliers(spiky_dataframe, ['price'], method='iqr', action='flag')
+        assert not global_iqr['is_outlier'].iloc[[100, 800]].all()
+    
+    def test_hampel_chunks(self, spiky_dataframe, monkeypatch):
+        """测试滚动MAD分块计算与整体计算结果一致"""
+        df = spiky_dataframe.copy()
+        df.loc[50:60, 'price'] = np.nan
+        whole = DataFormatter.remove_outliers(df, ['price', 'volume'], method='hampel', action='clip')
+        monkeypatch.setattr(DataFormatter, 'HAMPEL_CHUNK_ELEMENTS', 100)
+        chunked = DataFormatter.remove_outliers(df, ['price', 'volume'], method='hampel', action='clip')
+        pd.testing.assert_frame_equal(whole, chunked)
+    
+    def test_clip(self, spiky_dataframe):
+        """测试截断到局部上下界"""
+        result = DataFormatter.remove_outliers(spiky_dataframe, ['price'], method='mad', window=11, action='clip')
+        assert len(result) == len(spiky_dataframe)
+        assert result.loc[100, 'price'] < spiky_dataframe.loc[100, 'price']
+        assert result.loc[800, 'price'] > spiky_dataframe.loc[800, 'price']
+        assert result.loc[300, 'price'] == spiky_dataframe.loc[300, 'price']
+    
+    def test_global_iqr_and_missing(self):
+        """测试combined模式的全局IQR，缺失值不视为异常"""
+        df = pd.DataFrame({'value': [1.0, 2.0, 3.0, np.nan, 2.0, 100.0]})
+        result = DataFormatter.remove_outliers(df, ['value', 'missing_col'], mode='combined')
+        assert result.index.tolist() == [0, 1, 2, 3, 4]
+    
+    @pytest.mark.parametrize('method', ['iqr', 'zscore'])
+    def test_sequential_default(self, spiky_dataframe, method):
+        """测试默认逐列过滤：后面列的边界基于前面列过滤后的数据，缺失值所在行被删除"""
+        df = spiky_dataframe.copy()
+        df.loc[5, 'volume'] = np.nan
+        df.loc[[10, 20], 'volume'] = [10 ** 6, -10 ** 6]
+        
+        expected = df.copy()
+        for col in ['volume', 'price']:
+            if method == 'iqr':
+                q1, q3 = expected[col].quantile(0.25), expected[col].quantile(0.75)
+                expected = expected[(expected[col] >= q1 - 1.5 * (q3 - q1)) & (expected[col] <= q3 + 1.5 * (q3 - q1))]
+            else:
+                z = np.abs((expected[col] - expected[col].mean()) / expected[col].std())
+                expected = expected[z < 1.5]
+        
+        result = DataFormatter.remove_outliers(df, ['volume', 'price'], method=method)
+        pd.testing.assert_frame_equal(result, expected)
+        assert 5 not in result.index
+        assert not result.index.equals(
+            DataFormatter.remove_outliers(df, ['volume', 'price'], method=method, mode='combined').index
+        )
+    
+    def test_invalid_method(self, small_dataframe):
+        with pytest.raises(ValueError):
+            DataFormatter.remove_outliers(small_dataframe, ['value'], method='unknown')
+
+
+class TestHandleMissingValues:
+    
+    @pytest.fixture
+    def gappy_dataframe(self, missing_data_dataframe):
+        """带非数值列、不等间隔日期和跨块长缺口的数据"""
+        df = missing_data_dataframe.drop(index=[20, 21, 22]).reset_index(drop=True)
+        df['close'] = df['value'] * 2
+        df.loc[100:130, 'close'] = np.nan
+        df['label'] = 'a'
+        df.loc[[0, 5], 'label'] = None
+        return df
+    
+    def test_mean_skips_non_numeric(self, gappy_dataframe):
+        """测试均值填充只作用于数值列"""
+        result = DataFormatter.handle_missing_values(gappy_dataframe, method='mean')
+        assert result['value'].notna().all()
+        assert result['label'].isna().sum() == 2
+        assert result['date'].equals(gappy_dataframe['date'])
+    
+    def test_strategies_and_limit(self, gappy_dataframe):
+        """测试按列指定填充方式和limit"""
+        result = DataFormatter.handle_missing_values(
+            gappy_dataframe,
+            method=None,
+            strategies={'close': 'forward_fill', 'label': 'backward_fill'},
+            limit=5
+        )
+        assert result.loc[100:104, 'close'].notna().all()
+        assert result.loc[105:130, 'close'].isna().all()
+        assert result['label'].notna().all()
+        assert result['value'].isna().sum() == gappy_dataframe['value'].isna().sum()
+    
+    def test_time_weighted_interpolation(self):
+        """测试按日期间隔加权插值"""
+        df = pd.DataFrame({
+            'date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-05']),
+            'value': [0.0, np.nan, 4.0]
+        })
+        result = DataFormatter.handle_missing_values(df, method='interpolate', date_col='date')
+        assert result.loc[1, 'value'] == pytest.approx(1.0)
+    
+    def test_group_fill_keeps_order(self, gappy_dataframe):
+        """测试分组填充不跨组并保持行序"""
+        df = gappy_dataframe.assign(group=np.arange(len(gappy_dataframe)) % 2)
+        result = DataFormatter.handle_missing_values(df, group_col='group', strategies={'close': 'mean'})
+        assert result.index.equals(df.index)
+        assert result.loc[101, 'close'] == pytest.approx(df.loc[df['group'] == 1, 'close'].mean())
+    
+    def test_group_fill_keeps_missing_groups(self, gappy_dataframe):
+        """测试分组值缺失的行原样保留"""
+        df = gappy_dataframe.assign(group=np.where(np.arange(len(gappy_dataframe)) < 115, 'a', None))
+        result = DataFormatter.handle_missing_values(df, group_col='group', strategies={'close': 'mean'})
+        assert result.index.equals(df.index)
+        assert result.loc[100:114, 'close'].notna().all()
+        assert result.loc[115:130, 'close'].isna().all()
+        pd.testing.assert_frame_equal(result.loc[115:], df.loc[115:])
+    
+    @pytest.mark.parametrize('limit', [None, 3])
+    def test_chunked_matches_full(self, gappy_dataframe, limit):
+        """测试分块填充与整体填充结果一致，块边界处的缺口正确填充"""
+        strategies = {'value': 'forward_fill', 'close': 'interpolate', 'label': 'backward_fill'}
+        expected = DataFormatter.handle_missing_values(
+            gappy_dataframe, method=None, strategies=strategies, limit=limit, date_col='date'
+        )
+        
+        filler = MissingValueFiller(method=None, strategies=strategies, limit=limit, date_col='date')
+        chunks = [filler.transform(gappy_dataframe.iloc[i:i + 25]) for i in range(0, len(gappy_dataframe), 25)]
+        result = pd.concat(chunks + [filler.flush()])
+        
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    
+    def test_chunked_rejects_median(self, small_dataframe):
+        with pytest.raises(ValueError):
+            MissingValueFiller(method='median').transform(small_dataframe)
@@ -0,0 +1,54 @@
+import pytest
+import pandas as pd
+from visualkit import SeasonalChart, TimeSeriesChart
+from visualkit.charts.dataset import DatasetPage, SharedDataset
+
+
+class TestDatasetMode:
+
+    @pytest.fixture
+    def chart(self):
+        """创建图表实例"""
+        return TimeSeriesChart()
+
+    def test_time_series_line(self, chart, sample_dataframe):
+        """测试多序列引用同一个dataset维度，数据与普通模式一致"""
+        plain = chart.create_time_series_line(sample_dataframe, 'date', ['close', 'price']).get_options()
+        options = chart.create_time_series_line(
+            sample_dataframe, 'date', ['close', 'price'], dataset=True
+        ).get_options()
+
+        assert len(options['dataset']) == 1
+        source = options['dataset'][0]['source']
+        assert source['x'] == plain['xAxis'][0]['data']
+        assert 'data' not in options['xAxis'][0]
+        for idx, series in enumerate(options['series']):
+            assert 'data' not in series
+            assert series['encode'] == {'x': 'x', 'y': f's{idx}'}
+            assert source[f's{idx}'] == [point[1] for point in plain['series'][idx]['data']]
+
+    def test_seasonal_grid_shares_axis(self, sample_dataframe):
+        """测试网格图中x轴相同的子图共用一个dataset"""
+        grid = SeasonalChart().create_seasonal_grid(sample_dataframe, 'date', ['close', 'price'], dataset=True)
+        options = grid.get_options()
+
+        assert len(options['dataset']) == 1
+        assert options['dataset'][0]['source']['x'] == list(range(1, 13))
+        assert {series['datasetIndex'] for series in options['series']} == {0}
+        assert len(options['dataset'][0]['dimensions']) == len(options['series']) + 1
+
+    def test_shared_page(self, chart, sample_dataframe):
+        """测试多个图表共享页面级维度，只在页面中输出一次"""
+        shared = SharedDataset()
+        charts = [
+            chart.create_time_series_line(sample_dataframe, 'date', [col], dataset=shared)
+            for col in ['open', 'close', 'price']
+        ]
+        page = DatasetPage(shared)
+        page.add(*charts)
+        html = page.render_embed()
+
+        assert shared.axis_count == 1
+        assert html.count('"2021-01-01"') == 1
+        assert html.index('var visualkitDatasets') < html.index('setOption')
+        assert charts[0].js_functions.items == []
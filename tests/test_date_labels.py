@@ -0,0 +1,53 @@
+import pytest
+import pandas as pd
+import numpy as np
+from visualkit import TimeSeriesChart
+from visualkit.core.date_labels import DateLabelCache, format_date_labels
+
+
+class TestDateLabels:
+
+    @pytest.mark.parametrize('fmt', ['%Y-%m-%d', '%Y-%m', '%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H时'])
+    @pytest.mark.parametrize('freq', ['D', '90min'])
+    def test_matches_strftime(self, fmt, freq):
+        """测试向量化格式化与strftime结果一致，包括NaT"""
+        dates = pd.Series(pd.date_range('2023-12-25', periods=500, freq=freq))
+        dates[7] = pd.NaT
+
+        expected = dates.dt.strftime(fmt).tolist()
+        result = format_date_labels(dates.to_numpy(), fmt)
+        assert result[:7] + result[8:] == expected[:7] + expected[8:]
+        assert pd.isna(result[7])
+
+    def test_cache_shares_lists(self, sample_dataframe):
+        """测试相同日期和格式返回同一个列表，不同格式分别缓存"""
+        cache = DateLabelCache()
+        labels = cache.get(sample_dataframe['date'])
+
+        assert cache.get(sample_dataframe['date'].copy()) is labels
+        assert cache.get(sample_dataframe['date'], '%Y-%m') is not labels
+        assert cache.metrics()['hits'] == 1 and len(cache) == 2
+
+    def test_eviction(self):
+        """测试超过标签总数上限时淘汰最久未用的条目"""
+        cache = DateLabelCache(max_labels=250)
+        first = pd.date_range('2020-01-01', periods=100)
+        cache.get(first)
+        cache.get(pd.date_range('2021-01-01', periods=100))
+        cache.get(first)
+        cache.get(pd.date_range('2022-01-01', periods=100))
+
+        assert len(cache) == 2
+        assert cache.get(first) is cache.get(first)
+        assert len(cache.get(pd.date_range('2023-01-01', periods=300))) == 300
+        assert cache.metrics()['labels'] <= 250
+
+    def test_charts_share_axis(self, sample_dataframe):
+        """测试同一坐标轴的多个图表共享x轴标签"""
+        chart = TimeSeriesChart()
+        line = chart.create_time_series_line(sample_dataframe, 'date', ['close'])
+        volume = chart.create_volume_chart(sample_dataframe, 'date', 'volume')
+
+        line_axis = line.options['xAxis'][0]['data']
+        assert line_axis is volume.options['xAxis'][0]['data']
+        assert line_axis[0] == '2021-01-01'
@@ -0,0 +1,56 @@
+import pandas as pd
+import numpy as np
+from visualkit.core.date_parsing import parse_dates, prepare_frame
+from visualkit.core.data_processor import DataProcessor
+from visualkit.utils.data_formatter import DataFormatter
+
+
+class TestDateParsing:
+
+    def test_parse_datetime_passthrough(self, sample_dataframe):
+        """测试已是datetime64的列原样返回"""
+        dates = sample_dataframe['date']
+        assert parse_dates(dates) is dates
+
+    def test_parse_strings_with_inferred_format(self):
+        """测试字符串日期按推断格式解析"""
+        values = pd.Series(['2024/01/05', '2024/01/06', None, '2024/01/05'])
+        parsed = parse_dates(values)
+        assert parsed.dtype == 'datetime64[ns]'
+        assert parsed[0] == pd.Timestamp('2024-01-05')
+        assert pd.isna(parsed[2])
+
+    def test_prepared_frame_is_reused(self, sample_dataframe):
+        """测试已解析且有序的数据不拷贝"""
+        assert prepare_frame(sample_dataframe, 'date') is sample_dataframe
+
+    def test_prepare_strings_and_unsorted(self, sample_dataframe):
+        """测试字符串日期和乱序数据被解析、排序，输入保持不变"""
+        df = sample_dataframe.iloc[::-1].copy()
+        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+
+        prepared = prepare_frame(df, 'date', ['date', 'price'])
+        assert list(prepared.columns) == ['date', 'price']
+        assert prepared['date'].is_monotonic_increasing
+        assert prepare_frame(prepared, 'date') is prepared
+        assert df['date'].dtype == object
+
+        # 准备过的数据重排后仍会重新排序
+        shuffled = prepared.sample(frac=1, random_state=0)
+        assert prepare_frame(shuffled, 'date')['date'].is_monotonic_increasing
+
+    def test_string_and_datetime_inputs_agree(self, sample_dataframe):
+        """测试字符串日期与datetime输入结果一致"""
+        df = sample_dataframe[['date', 'price']]
+        text = df.assign(date=df['date'].dt.strftime('%Y-%m-%d'))
+
+        pd.testing.assert_frame_equal(
+            DataProcessor.pivot_for_seasonal(df, 'date', 'price'),
+            DataProcessor.pivot_for_seasonal(text, 'date', 'price')
+        )
+        pd.testing.assert_frame_equal(
+            DataFormatter.aggregate_by_period(df, 'date', ['price'], 'M'),
+            DataFormatter.aggregate_by_period(text, 'date', ['price'], 'M')
+        )
+        filtered = DataFormatter.filter_by_date_range(text, 'date', '2023-02-01', '2023-02-28')
+        assert len(filtered) == 28 and np.issubdtype(filtered['date'].dtype, np.datetime64)
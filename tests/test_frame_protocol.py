@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+from visualkit import SeasonalChart, TimeSeriesChart
+from visualkit.core.data_processor import DataProcessor
+from visualkit.core.frame_protocol import frame_columns, frame_kind, to_pandas
+
+pa = pytest.importorskip('pyarrow')
+
+
+class TestArrowInput:
+
+    @pytest.fixture
+    def table(self, sample_dataframe):
+        """与sample_dataframe内容相同的Arrow表"""
+        return pa.Table.from_pandas(sample_dataframe, preserve_index=False)
+
+    def test_zero_copy_projection(self, table):
+        """测试只转换所需列，无缺失的数值和时间列直接引用Arrow内存"""
+        df = to_pandas(table, ['date', 'close', None, 'close'])
+
+        assert list(df.columns) == ['date', 'close']
+        assert df['date'].dtype == 'datetime64[ns]'
+        assert np.shares_memory(df['close'].to_numpy(), table.column('close').chunk(0).to_numpy())
+
+    def test_nulls_and_chunks(self):
+        """测试有缺失值和多块的列按pandas语义转换"""
+        table = pa.table({'value': pa.array([1, None, 3])})
+        table = pa.concat_tables([table, table])
+        values = to_pandas(table)['value']
+        assert values.dtype == 'float64'
+        assert values.isna().sum() == 2 and len(values) == 6
+
+    def test_kinds_and_errors(self, sample_dataframe, table):
+        """测试类型识别、列名和缺失列"""
+        assert frame_kind(sample_dataframe) == 'pandas'
+        assert to_pandas(sample_dataframe, ['close']) is sample_dataframe
+        assert frame_kind(table) == 'arrow'
+        assert frame_columns(table.to_batches()[0]) == list(sample_dataframe.columns)
+        with pytest.raises(KeyError):
+            to_pandas(table, ['missing'])
+        with pytest.raises(TypeError):
+            to_pandas([1, 2, 3])
+
+    def test_charts_match_pandas(self, sample_dataframe, table):
+        """测试图表和透视表对Arrow输入的结果与pandas输入一致"""
+        seasonal, series = SeasonalChart(), TimeSeriesChart()
+        builders = [
+            lambda df: seasonal.create_seasonal_line(df, 'date', 'close'),
+            lambda df: seasonal.create_seasonal_grid(df, 'date', ['close', 'price']),
+            lambda df: series.create_time_series_line(df, 'date', ['open', 'close']),
+            lambda df: series.create_volume_chart(df, 'date', 'volume'),
+        ]
+        for build in builders:
+            assert build(table).dump_options() == build(sample_dataframe).dump_options()
+
+        pd.testing.assert_frame_equal(
+            DataProcessor.pivot_for_seasonal(table, 'date', 'close'),
+            DataProcessor.pivot_for_seasonal(sample_dataframe, 'date', 'close')
+        )
+
+    def test_read_only_buffers(self, sample_dataframe, table):
+        """测试零拷贝列只读，不会通过pandas修改Arrow数据"""
+        df = to_pandas(table, ['close'])
+        with pytest.raises(ValueError):
+            df['close'].to_numpy()[0] = 0.0
+        assert table.column('close')[0].as_py() == sample_dataframe['close'].iloc[0]
+
+
+class TestPolarsInput:
+
+    def test_polars_frames(self, sample_dataframe):
+        """测试polars DataFrame和LazyFrame输入"""
+        pl = pytest.importorskip('polars')
+        frame = pl.from_pandas(sample_dataframe)
+
+        df = to_pandas(frame.lazy(), ['date', 'close'])
+        assert list(df.columns) == ['date', 'close']
+        np.testing.assert_array_equal(df['close'].to_numpy(), sample_dataframe['close'].to_numpy())
+
+        chart = TimeSeriesChart()
+        assert (
+            chart.create_time_series_line(frame, 'date', ['close']).dump_options()
+            == chart.create_time_series_line(sample_dataframe, 'date', ['close']).dump_options()
+        )
+
+    def test_lazy_frame_entry_points(self, sample_dataframe):
+        """测试各图表入口和透视表接受LazyFrame，结果与pandas输入一致"""
+        pl = pytest.importorskip('polars')
+        lazy = pl.from_pandas(sample_dataframe).lazy()
+
+        seasonal, series = SeasonalChart(), TimeSeriesChart()
+        builders = [
+            lambda df: seasonal.create_seasonal_line(df, 'date', 'close'),
+            lambda df: seasonal.create_seasonal_grid(df, 'date', ['close', 'price']),
+            lambda df: series.create_time_series_line(df, 'date', ['open', 'close']),
+            lambda df: series.create_candlestick_chart(df, 'date', 'open', 'close', 'low', 'high'),
+            lambda df: series.create_volume_chart(df, 'date', 'volume'),
+            lambda df: series.create_incremental_line(df, 'date', ['close']).to_chart(),
+        ]
+        for build in builders:
+            assert build(lazy).dump_options() == build(sample_dataframe).dump_options()
+
+        pd.testing.assert_frame_equal(
+            DataProcessor.pivot_for_seasonal(lazy, 'date', 'close'),
+            DataProcessor.pivot_for_seasonal(sample_dataframe, 'date', 'close')
+        )
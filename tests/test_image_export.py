@@ -0,0 +1,116 @@
+import xml.dom.minidom
+
+import numpy as np
+import pandas as pd
+import pytest
+from visualkit import SeasonalChart, TimeSeriesChart
+from visualkit.charts import image_export
+from visualkit.charts.dataset import SharedDataset
+from visualkit.charts.image_export import ImageExporter, render_svg
+
+
+def paths(svg: str):
+    """SVG中所有path元素的d属性"""
+    return [node.getAttribute('d') for node in xml.dom.minidom.parseString(svg).getElementsByTagName('path')]
+
+
+class TestSVGRenderer:
+
+    @pytest.fixture
+    def chart(self):
+        """创建图表实例"""
+        return TimeSeriesChart()
+
+    def test_seasonal_line(self, sample_dataframe):
+        """测试季节性图包含标题、图例和每个年份一条折线"""
+        line = SeasonalChart().create_seasonal_line(sample_dataframe, 'date', 'close', title='收盘价')
+        svg = render_svg(line)
+
+        years = sorted(sample_dataframe['date'].dt.year.unique())
+        assert '收盘价' in svg
+        assert all(f'>{year}<' in svg for year in years)
+        assert len(paths(svg)) == len(years)
+        assert svg.startswith('<svg') and 'width="960" height="500"' in svg
+
+    def test_missing_values_split_line(self, chart, sample_dataframe):
+        """测试缺失值处折线断开"""
+        df = sample_dataframe.copy()
+        df.loc[df.index[10:15], 'close'] = np.nan
+        svg = render_svg(chart.create_time_series_line(df, 'date', ['close']))
+        assert paths(svg)[0].count('M') == 2
+
+    def test_downsampling(self, chart):
+        """测试数据点远多于像素时输出大小与数据量无关"""
+        def size(rows):
+            df = pd.DataFrame({
+                'date': pd.date_range('2000-01-01', periods=rows, freq='h'),
+                'close': np.sin(np.arange(rows) / 50.0)
+            })
+            return len(paths(render_svg(chart.create_time_series_line(df, 'date', ['close']), width=800))[0])
+
+        assert size(200_000) < size(4_000) * 1.2
+
+    def test_dataset_mode(self, chart, sample_dataframe):
+        """测试dataset模式与普通模式绘制结果一致，页面级共享维度无法导出"""
+        plain = chart.create_time_series_line(sample_dataframe, 'date', ['close', 'price'])
+        dataset = chart.create_time_series_line(sample_dataframe, 'date', ['close', 'price'], dataset=True)
+        assert paths(render_svg(plain)) == paths(render_svg(dataset))
+
+        shared = chart.create_time_series_line(sample_dataframe, 'date', ['close'], dataset=SharedDataset())
+        with pytest.raises(ValueError):
+            render_svg(shared)
+
+    def test_bar_and_grid(self, chart, sample_dataframe):
+        """测试柱状图和多grid布局"""
+        bars = paths(render_svg(chart.create_volume_chart(sample_dataframe, 'date', 'volume')))
+        assert bars[0].count('Z') == len(sample_dataframe)
+
+        grid = SeasonalChart().create_seasonal_grid(sample_dataframe, 'date', ['close', 'price'])
+        svg = render_svg(grid)
+        assert svg.count('<clipPath') == 2
+        assert 'height="800"' in svg
+
+
+class TestImageExporter:
+
+    @pytest.fixture
+    def charts(self, sample_dataframe):
+        """一批季节性图和时间序列图"""
+        seasonal, series = SeasonalChart(), TimeSeriesChart()
+        return {
+            'close': seasonal.create_seasonal_line(sample_dataframe, 'date', 'close'),
+            'grid': seasonal.create_seasonal_grid(sample_dataframe, 'date', ['close', 'price']),
+            'line': series.create_time_series_line(sample_dataframe, 'date', ['open', 'close']),
+        }
+
+    def test_batch_matches_single(self, charts):
+        """测试进程池批量渲染与逐个渲染结果一致且顺序不变，进程池在批次间复用"""
+        with ImageExporter(max_workers=2) as exporter:
+            first = exporter.render(list(charts.values()))
+            pool = exporter._executor
+            second = exporter.render(list(charts.values()))
+            assert exporter._executor is pool
+        assert exporter._executor is None
+        assert first == second == [render_svg(chart).encode('utf-8') for chart in charts.values()]
+
+    def test_save(self, charts, tmp_path):
+        """测试批量写出文件"""
+        files = ImageExporter(max_workers=1).save(charts, directory=str(tmp_path / 'images'))
+        assert [path.rsplit('/', 1)[-1] for path in files] == ['close.svg', 'grid.svg', 'line.svg']
+        assert all((tmp_path / 'images' / name).read_bytes().startswith(b'<svg') for name in ['close.svg', 'line.svg'])
+
+    def test_save_image(self, charts, tmp_path):
+        """测试BaseChart按扩展名保存图片"""
+        path = tmp_path / 'close.svg'
+        TimeSeriesChart().save_image(charts['close'], str(path), width=600, height=300)
+        assert 'width="600" height="300"' in path.read_text(encoding='utf-8')
+        with pytest.raises(ValueError):
+            TimeSeriesChart().save_image(charts['close'], str(tmp_path / 'close.gif'))
+
+    def test_invalid_format(self, monkeypatch):
+        """测试不支持的格式和缺少cairosvg时导出PNG"""
+        with pytest.raises(ValueError):
+            ImageExporter(fmt='gif')
+        monkeypatch.setattr(image_export, 'cairosvg', None)
+        with pytest.raises(ImportError):
+            ImageExporter(fmt='png')
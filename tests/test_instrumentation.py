@@ -0,0 +1,121 @@
+import logging
+import tracemalloc
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from visualkit.core.instrumentation import LoggingSink, MemorySink, instrument, get_sink, span, traced
+from visualkit.core.memory_profile import copy_on_write_enabled, defensive_copy, profile_memory
+from visualkit import DataFormatter, SeasonalChart, TimeSeriesChart
+
+
+class TestInstrumentation:
+
+    def test_disabled_is_noop(self):
+        """测试未启用时span为共享的空对象"""
+        assert get_sink() is None
+        with span('a', rows=1) as s:
+            s.set(extra=2)
+        assert span('a') is span('b')
+
+    def test_nested_spans(self):
+        """测试嵌套span记录父子关系、属性和异常"""
+        @traced('outer')
+        def work():
+            with span('inner', rows=3) as s:
+                s.set(cols=2)
+            return pd.DataFrame({'a': [1, 2]})
+
+        with instrument() as sink:
+            work()
+            with pytest.raises(ValueError):
+                with span('failing'):
+                    raise ValueError("boom")
+
+        records = sink.to_frame().set_index('name')
+        assert records.loc['inner', 'parent'] == 'outer'
+        assert records.loc['inner', 'depth'] == 1
+        assert records.loc['inner', 'cols'] == 2
+        assert records.loc['outer', 'rows'] == 2
+        assert records.loc['failing', 'error'] == 'ValueError'
+        assert get_sink() is None
+
+    def test_chart_pipeline_stages(self, sample_dataframe, tmp_path):
+        """测试图表流水线各阶段均有计时"""
+        with instrument() as sink:
+            SeasonalChart().create_seasonal_line(sample_dataframe, 'date', 'price', calendar_type='lunar')
+            chart = TimeSeriesChart()
+            line = chart.create_time_series_line(sample_dataframe, 'date', ['price'])
+            chart.save_chart(line, str(tmp_path / 'chart.html'))
+
+        summary = sink.summary()
+        for stage in [
+            'seasonal_chart.create_seasonal_line', 'seasonal_chart.prepare', 'calendar.parse_dates',
+            'calendar.lunar_align', 'seasonal_chart.build_options', 'time_series_chart.parse_dates',
+            'time_series_chart.build_options', 'chart.render'
+        ]:
+            assert stage in summary.index
+        assert (summary['total'] > 0).all()
+
+    def test_logging_sink(self, caplog):
+        """测试日志sink输出阶段耗时"""
+        logger = logging.getLogger('visualkit.test')
+        with caplog.at_level(logging.DEBUG, logger='visualkit.test'):
+            with instrument(LoggingSink(logger)):
+                with span('stage', rows=10):
+                    pass
+        assert 'stage' in caplog.text and 'rows=10' in caplog.text
+
+
+class TestMemoryProfile:
+
+    def test_defensive_copy_records_bytes(self, sample_dataframe):
+        """测试防御性拷贝计入当前span的copied_bytes"""
+        with profile_memory(copy_on_write=False) as sink:
+            with span('stage'):
+                copied = defensive_copy(sample_dataframe, ['date', 'price'])
+            with span('full'):
+                defensive_copy(sample_dataframe)
+
+        records = sink.to_frame().set_index('name')
+        assert list(copied.columns) == ['date', 'price']
+        assert records.loc['stage', 'copied_bytes'] == copied.memory_usage(index=True).sum()
+        assert records.loc['full', 'copied_bytes'] == sample_dataframe.memory_usage(index=True).sum()
+
+    def test_formatter_copies_recorded(self, sample_dataframe):
+        """测试通过visualkit导入的DataFormatter的拷贝计入同一sink"""
+        with profile_memory(copy_on_write=False) as sink:
+            with span('normalize'):
+                DataFormatter.normalize_data(sample_dataframe, ['price'])
+
+        records = sink.to_frame().set_index('name')
+        assert records.loc['normalize', 'copied_bytes'] == sample_dataframe.memory_usage(index=True).sum()
+
+    def test_copy_on_write_skips_copies(self, sample_dataframe):
+        """测试开启copy-on-write后不再深拷贝且不修改输入"""
+        original = sample_dataframe.copy()
+        previous = copy_on_write_enabled()
+        with profile_memory(copy_on_write=True) as sink:
+            SeasonalChart().create_seasonal_line(sample_dataframe, 'date', 'price', calendar_type='lunar')
+            TimeSeriesChart().create_time_series_line(sample_dataframe, 'date', ['price'])
+            DataFormatter.normalize_data(sample_dataframe, ['price'])
+        assert copy_on_write_enabled() == previous
+
+        summary = sink.summary()
+        assert 'copied_bytes' not in summary.columns
+        pd.testing.assert_frame_equal(sample_dataframe, original)
+
+    def test_stage_memory(self, sample_dataframe):
+        """测试记录阶段分配峰值，父阶段峰值不小于子阶段"""
+        with profile_memory() as sink:
+            with span('outer'):
+                with span('inner'):
+                    data = np.ones(1_000_000)
+                del data
+
+        records = sink.to_frame().set_index('name')
+        assert records.loc['inner', 'peak_alloc'] >= 8_000_000
+        assert records.loc['outer', 'peak_alloc'] >= records.loc['inner', 'peak_alloc']
+        assert records.loc['outer', 'peak_rss'] > 0
+        assert not tracemalloc.is_tracing()
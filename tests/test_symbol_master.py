@@ -0,0 +1,86 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from visualkit.core.symbol_master import SymbolMaster
+
+
+STOCKS = pd.DataFrame({
+    'code': ['sh600000', 'sh600036', 'sz000001', 'sz000002', 'bj830799'],
+    'name': ['浦发银行', '招商银行', '平安银行', '万科A', '艾融软件']
+})
+
+
+@pytest.fixture
+def master(tmp_path, monkeypatch):
+    """使用本地假数据的代码主数据缓存，记录下载次数"""
+    calls = []
+
+    def load_stock():
+        calls.append(1)
+        return STOCKS.copy()
+
+    monkeypatch.setitem(SymbolMaster.LOADERS, 'stock', load_stock)
+    master = SymbolMaster(tmp_path)
+    master.calls = calls
+    return master
+
+
+class TestSymbolMaster:
+    """代码主数据缓存测试"""
+
+    def test_universe_with_market(self, master):
+        """完整代码表并推断市场"""
+        universe = master.universe('stock')
+        assert len(universe) == 5
+        assert universe.set_index('code')['market'].to_dict() == {
+            'sh600000': 'SH', 'sh600036': 'SH', 'sz000001': 'SZ',
+            'sz000002': 'SZ', 'bj830799': 'BJ'
+        }
+
+    def test_search_ranking(self, master):
+        """代码前缀优先，名称包含匹配在后"""
+        assert master.search('sh600')['code'].tolist() == ['sh600000', 'sh600036']
+        assert master.search('平安')['code'].tolist() == ['sz000001']
+        assert master.search('银行')['code'].tolist() == ['sh600000', 'sh600036', 'sz000001']
+        assert master.search('万科a')['code'].tolist() == ['sz000002']
+        assert master.search('不存在').empty
+
+    def test_search_filters(self, master):
+        """市场过滤与数量限制"""
+        assert master.search('银行', market='sz')['code'].tolist() == ['sz000001']
+        assert len(master.search('0', limit=2)) == 2
+
+    def test_daily_cache(self, master, tmp_path):
+        """当日缓存只下载一次，过期后重新下载"""
+        master.universe('stock')
+        SymbolMaster(tmp_path).universe('stock')
+        assert len(master.calls) == 1
+
+        # 缓存文件改为昨天
+        path = tmp_path / 'symbols_stock.csv'
+        yesterday = time.time() - 86400
+        os.utime(path, (yesterday, yesterday))
+        fresh = SymbolMaster(tmp_path)
+        assert fresh.universe('stock')['code'].tolist() == STOCKS['code'].tolist()
+        assert len(master.calls) == 2
+
+    def test_stale_cache_on_failure(self, master, tmp_path, monkeypatch):
+        """刷新失败时使用旧缓存"""
+        master.universe('stock')
+        path = tmp_path / 'symbols_stock.csv'
+        yesterday = time.time() - 86400
+        os.utime(path, (yesterday, yesterday))
+
+        def fail():
+            raise ConnectionError('offline')
+
+        monkeypatch.setitem(SymbolMaster.LOADERS, 'stock', fail)
+        with pytest.warns(UserWarning):
+            assert len(SymbolMaster(tmp_path).universe('stock')) == 5
+
+    def test_unknown_type(self, master):
+        with pytest.raises(ValueError):
+            master.universe('bond')
@@ -0,0 +1,60 @@
+import pytest
+import pandas as pd
+import numpy as np
+from visualkit import TimeSeriesChart
+
+
+class TestIncrementalLine:
+    
+    @pytest.fixture
+    def chart(self):
+        """创建图表实例"""
+        return TimeSeriesChart()
+    
+    def test_append_matches_full_build(self, chart, sample_dataframe):
+        """测试增量追加后与完整构建结果一致"""
+        head, tail = sample_dataframe.iloc[:500], sample_dataframe.iloc[500:]
+        
+        buffer = chart.create_incremental_line(head, 'date', ['close', 'volume'], capacity=16)
+        buffer.append(tail)
+        
+        full = chart.create_time_series_line(sample_dataframe, 'date', ['close', 'volume'])
+        incremental = buffer.to_chart()
+        
+        assert len(buffer) == len(sample_dataframe)
+        assert incremental.get_options()['xAxis'][0]['data'] == full.get_options()['xAxis'][0]['data']
+        assert incremental.get_options()['series'][0]['data'] == full.get_options()['series'][0]['data']
+    
+    def test_integer_columns_keep_dtype(self, chart, sample_dataframe):
+        """测试整数列增量输出与完整构建一致，不变为浮点数"""
+        buffer = chart.create_incremental_line(sample_dataframe.iloc[:10], 'date', ['volume'])
+        buffer.append(sample_dataframe.iloc[10:20])
+        
+        full = chart.create_time_series_line(sample_dataframe.iloc[:20], 'date', ['volume'])
+        assert buffer.to_chart().dump_options() == full.dump_options()
+        assert buffer.to_frame()['volume'].dtype == sample_dataframe['volume'].dtype
+        
+        buffer.append(sample_dataframe.iloc[20:21].astype({'volume': float}))
+        assert isinstance(buffer.delta()['append_data'][0]['data'][0][1], float)
+    
+    def test_delta_only_contains_new_rows(self, chart, small_dataframe):
+        """测试增量输出只包含新数据"""
+        buffer = chart.create_incremental_line(small_dataframe.iloc[:20], 'date', ['value'])
+        buffer.to_chart()
+        
+        new_rows = small_dataframe.iloc[20:].sample(frac=1, random_state=0)
+        buffer.append(new_rows)
+        delta = buffer.delta()
+        
+        assert delta['start'] == 20
+        assert delta['x_data'][0] == '2021-01-21'
+        assert delta['append_data'][0]['data'][0] == ['2021-01-21', 20.0]
+        assert len(delta['append_data'][0]['data']) == 11
+        assert buffer.delta()['x_data'] == []
+    
+    def test_reject_out_of_order(self, chart, small_dataframe):
+        """测试追加早于已有数据的行"""
+        buffer = chart.create_incremental_line(small_dataframe, 'date', ['value'])
+        
+        with pytest.raises(ValueError):
+            buffer.append(small_dataframe.iloc[:1])
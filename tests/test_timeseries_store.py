@@ -0,0 +1,92 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+pytest.importorskip('pyarrow')
+
+from visualkit import TimeSeriesStore, WindClient
+
+
+class TestTimeSeriesStore:
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """创建临时存储"""
+        return TimeSeriesStore(tmp_path / 'store')
+    
+    def test_write_merge_and_range_read(self, store, sample_dataframe):
+        """测试跨年分区写入、合并与区间读取"""
+        store.write(sample_dataframe.iloc[:400], 'test', '000001')
+        store.write(sample_dataframe.iloc[300:], 'test', '000001')
+        
+        full = store.read('test', '000001')
+        part = store.read('test', '000001', '2022-12-30', '2023-01-02', columns=['close'])
+        
+        assert len(full) == len(sample_dataframe)
+        assert list(part.columns) == ['date', 'close']
+        assert part['date'].dt.strftime('%Y-%m-%d').tolist() == [
+            '2022-12-30', '2022-12-31', '2023-01-01', '2023-01-02'
+        ]
+        np.testing.assert_allclose(part['close'], sample_dataframe.set_index('date').loc['2022-12-30':'2023-01-02', 'close'])
+        assert store.covers('test', '000001', '2021-06-01', '2023-06-01')
+    
+    def test_wind_client_writes_through(self, store):
+        """测试WindClient只请求存储未覆盖的代码"""
+        client = WindClient(store=store)
+        first = client.get_history_data(['A', 'B'], ['close'], '2024-01-01', '2024-01-31')
+        
+        fetched = []
+        original = client._fetch_history
+        client._fetch_history = lambda codes, *args: fetched.append(codes) or original(codes, *args)
+        second = client.get_history_data(['A', 'B', 'C'], ['close'], '2024-01-10', '2024-01-20')
+        
+        assert fetched == [['C']]
+        assert list(second.columns) == ['date', 'A_close', 'B_close', 'C_close']
+        np.testing.assert_allclose(
+            second['B_close'], first.set_index('date').loc['2024-01-10':'2024-01-20', 'B_close']
+        )
+    
+    def test_merge_keeps_other_columns(self, store, sample_dataframe):
+        """测试按日期和列合并，后写入的列不覆盖已有列"""
+        df = sample_dataframe.iloc[:10]
+        store.write(df[['date', 'close']], 'test', '000001')
+        store.write(df[['date', 'volume']].iloc[5:], 'test', '000001')
+        
+        merged = store.read('test', '000001')
+        np.testing.assert_allclose(merged['close'], df['close'])
+        assert merged['volume'].isna().sum() == 5
+        assert store.missing_fields('test', '000001', df['date'].min(), df['date'].max(), ['close', 'volume']) == ['volume']
+        assert not store.covers('test', '000001', df['date'].min(), df['date'].max())
+    
+    def test_wind_client_fetches_missing_fields(self, store):
+        """测试WindClient只请求缺少的字段，不同options的数据分开存储"""
+        client = WindClient(store=store)
+        client.get_history_data(['A', 'B'], ['close'], '2024-01-01', '2024-01-31')
+        
+        fetched = []
+        original = client._fetch_history
+        client._fetch_history = lambda codes, fields, *args: fetched.append((codes, fields)) or original(codes, fields, *args)
+        both = client.get_history_data(['A', 'B'], ['close', 'volume'], '2024-01-01', '2024-01-31')
+        assert fetched == [(['A', 'B'], ['volume'])]
+        assert list(both.columns) == ['date', 'A_close', 'A_volume', 'B_close', 'B_volume']
+        assert both.notna().all().all()
+        
+        adjusted = client.get_history_data(['A', 'B'], ['close'], '2024-01-01', '2024-01-31', options={'PriceAdj': 'F'})
+        assert fetched[-1] == (['A', 'B'], ['close'])
+        assert len(adjusted) == len(both)
+        assert sorted(store.symbols('wind?PriceAdj=F')) == ['A', 'B']
+    
+    def test_batch_saves_coverage_once(self, store, sample_dataframe, monkeypatch):
+        """测试批量写入只在退出时保存一次覆盖区间，保存通过临时文件替换"""
+        saves = []
+        original = store._save_coverage
+        monkeypatch.setattr(store, '_save_coverage', lambda: saves.append(1) or original())
+        
+        with store.batch():
+            for symbol in ['A', 'B', 'C']:
+                store.write(sample_dataframe.iloc[:10], 'test', symbol)
+            assert saves == []
+        
+        assert saves == [1]
+        assert TimeSeriesStore(store.root).symbols('test') == ['A', 'B', 'C']
+        assert [path.name for path in store.root.iterdir() if path.suffix == '.tmp'] == []
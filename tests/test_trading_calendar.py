@@ -0,0 +1,100 @@
+import pytest
+import pandas as pd
+import numpy as np
+from visualkit import TradingCalendar, WindClient
+
+
+class TestTradingCalendar:
+    
+    @pytest.fixture
+    def calendar(self):
+        """获取缓存的深交所日历"""
+        return TradingCalendar.get('SZSE')
+    
+    def test_cached_per_exchange(self, calendar):
+        """测试同一交易所日历只构建一次"""
+        assert TradingCalendar.get('szse') is calendar
+        assert TradingCalendar.get('SSE') is not calendar
+    
+    def test_holidays_excluded(self, calendar):
+        """测试剔除周末和法定节假日"""
+        # 2024-10-01至10-07国庆休市，10-12为调休补班的周六（交易所不开市）
+        assert not calendar.is_trading_day('2024-10-01')
+        assert not calendar.is_trading_day('2024-10-12')
+        assert calendar.is_trading_day('2024-10-08')
+        
+        flags = calendar.is_trading_day(np.array(['2024-02-12', '2024-02-19'], dtype='datetime64[D]'))
+        np.testing.assert_array_equal(flags, [False, True])
+    
+    def test_range_capped_at_holiday_data(self, calendar):
+        """测试默认只构建到节假日数据覆盖的最后一年，超出时告警"""
+        chinese_calendar = pytest.importorskip('chinese_calendar')
+        covered_year = max(chinese_calendar.holidays).year
+        
+        assert calendar.days[-1] <= np.datetime64(f'{covered_year}-12-31')
+        assert not calendar.is_trading_day(f'{covered_year + 1}-01-02')
+        with pytest.warns(UserWarning):
+            TradingCalendar('SZSE', start_date='2024-01-01', end_date=f'{covered_year + 1}-12-31')
+    
+    def test_next_and_prev(self, calendar):
+        """测试前后交易日"""
+        assert calendar.next_trading_day('2024-09-30') == np.datetime64('2024-10-08')
+        assert calendar.prev_trading_day('2024-10-08') == np.datetime64('2024-09-30')
+        assert calendar.next_trading_day('2024-09-27', n=2) == np.datetime64('2024-10-08')
+    
+    def test_count_between(self, calendar):
+        """测试区间交易日计数"""
+        assert calendar.count_trading_days('2024-10-01', '2024-10-31') == 18
+        assert calendar.count_trading_days('2024-10-31', '2024-10-01') == 0
+    
+    def test_wind_client_returns_array(self):
+        """测试WindClient返回交易日数组"""
+        days = WindClient().get_trading_calendar('2024-09-28', '2024-10-09')
+        
+        assert days.dtype == np.dtype('datetime64[D]')
+        assert days.tolist() == [pd.Timestamp('2024-09-30').date(), pd.Timestamp('2024-10-08').date(),
+                                 pd.Timestamp('2024-10-09').date()]
+
+
+class TestTradingDayResample:
+    
+    def test_weekly_bars_skip_holidays(self):
+        """测试周K线不产生节假日空桶且按OHLC规则聚合"""
+        from visualkit.core.wind_client import WindDataProcessor
+        
+        dates = pd.date_range('2024-09-23', '2024-10-13', freq='D')
+        frames = [
+            pd.DataFrame({
+                'date': dates,
+                'symbol': symbol,
+                'open': np.arange(len(dates), dtype=float) + offset,
+                'close': np.arange(len(dates), dtype=float) + offset,
+                'volume': 1.0
+            })
+            for symbol, offset in (('A', 0), ('B', 100))
+        ]
+        df = pd.concat(frames, ignore_index=True)
+        
+        result = WindDataProcessor.resample_trading_days(df, 'date', 'W', symbol_col='symbol')
+        a = result[result['symbol'] == 'A'].reset_index(drop=True)
+        
+        assert a['date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-09-27', '2024-09-30', '2024-10-11']
+        # 周末及国庆假期的数据并入之前最近的交易日
+        assert a['volume'].tolist() == [7.0, 8.0, 6.0]
+        assert a.loc[2, 'open'] == 15.0
+        assert a.loc[2, 'close'] == 20.0
+        assert len(result) == 6
+    
+    def test_n_day_bars_and_period_aliases(self):
+        """测试N日K线从数据首日起分桶且标签不晚于最后一行，接受pandas 2的周期末别名"""
+        from visualkit.core.wind_client import WindDataProcessor
+        
+        dates = TradingCalendar.get('SZSE').trading_days('2024-03-01', '2024-03-14')
+        df = pd.DataFrame({'date': dates.astype('datetime64[ns]'), 'close': np.arange(len(dates), dtype=float)})
+        
+        result = WindDataProcessor.resample_trading_days(df, 'date', 3)
+        assert result['date'].tolist() == [pd.Timestamp(d) for d in dates[[2, 5, 8, 9]]]
+        assert result['close'].tolist() == [2.0, 5.0, 8.0, 9.0]
+        
+        monthly = WindDataProcessor.resample_trading_days(df, 'date', 'M')
+        pd.testing.assert_frame_equal(WindDataProcessor.resample_trading_days(df, 'date', 'ME'), monthly)
@@ -0,0 +1,231 @@
+import asyncio
+import sys
+import types
+
+import pytest
+import pandas as pd
+import numpy as np
+from visualkit.core.wind_client import (
+    WindClient, RealtimeRingBuffer, generate_mock_history, simulated_tick_feed
+)
+
+
+class TestRealtimeSubscription:
+    
+    def test_ring_buffer_overwrites_oldest(self):
+        """测试环形缓冲区满时覆盖最早的数据"""
+        buffer = RealtimeRingBuffer(['a', 'b'], capacity=4)
+        times = pd.date_range('2024-01-01 09:30', periods=6, freq='s').to_numpy()
+        values = np.arange(12, dtype=float).reshape(6, 2)
+        
+        buffer.push(times[:3], values[:3])
+        buffer.push(times[3:], values[3:])
+        drained_times, drained_values = buffer.drain()
+        
+        assert buffer.dropped == 2
+        assert len(buffer) == 0
+        np.testing.assert_array_equal(drained_times, times[2:])
+        np.testing.assert_array_equal(drained_values, values[2:])
+    
+    def test_subscribe_batches(self):
+        """测试订阅按批次输出全部模拟行情"""
+        client = WindClient()
+        
+        async def collect():
+            feed = simulated_tick_feed(2, tick_interval=0.001, n_ticks=50, seed=0)
+            return [
+                batch async for batch in client.subscribe_realtime(
+                    ['000001.SZ', '600000.SH'], ['close'], flush_interval=0.01, feed=feed
+                )
+            ]
+        
+        batches = asyncio.run(collect())
+        result = pd.concat(batches)
+        
+        assert list(result.columns) == ['datetime', '000001.SZ_close', '600000.SH_close']
+        assert len(result) == 50
+        assert result['datetime'].is_monotonic_increasing
+
+
+class TestMockHistory:
+    
+    def test_seeded_output_is_reproducible(self):
+        """测试相同种子生成相同数据"""
+        first = generate_mock_history(['A', 'B'], ['close', 'volume'], '2024-01-01', '2024-03-31', seed=7)
+        second = generate_mock_history(['A', 'B'], ['close', 'volume'], '2024-01-01', '2024-03-31', seed=7)
+        
+        pd.testing.assert_frame_equal(first, second)
+        assert list(first.columns) == ['date', 'A_close', 'A_volume', 'B_close', 'B_volume']
+        assert (first[['A_volume', 'B_volume']] >= 100).all().all()
+    
+    def test_long_format_matches_wide(self):
+        """测试长表与宽表数据一致"""
+        kwargs = dict(seed=1, dtype=np.float32)
+        wide = generate_mock_history(['A', 'B'], ['close', 'pe'], '2024-01-01', '2024-01-10', **kwargs)
+        long = generate_mock_history(['A', 'B'], ['close', 'pe'], '2024-01-01', '2024-01-10', long_format=True, **kwargs)
+        
+        pivot = long.pivot_table(index='date', columns=['code', 'field'], values='value', observed=True)
+        
+        assert long['value'].dtype == np.float32
+        np.testing.assert_array_equal(pivot[('B', 'pe')].to_numpy(), wide['B_pe'].to_numpy())
+
+
+class FakeWindData:
+    """模拟WindPy返回对象"""
+    
+    def __init__(self, data, codes=None, fields=None, times=None, error_code=0):
+        self.ErrorCode = error_code
+        self.Data = data
+        self.Codes = codes or []
+        self.Fields = fields or []
+        self.Times = times or []
+
+
+class FakeWind:
+    """模拟WindPy的w对象，数值为 代码序号*1000 + 日序号"""
+    
+    def __init__(self):
+        self.started = 0
+        self.wsd_calls = []
+        self.wset_calls = []
+    
+    def isconnected(self):
+        return self.started > 0
+    
+    def start(self, waitTime=60):
+        self.started += 1
+        return FakeWindData([])
+    
+    def close(self):
+        self.started = 0
+    
+    def wsd(self, codes, field, start, end, options=""):
+        self.wsd_calls.append((codes, field, start, end))
+        times = [d.to_pydatetime() for d in pd.date_range(start, end, freq='B')]
+        offset = np.busday_count('2024-01-01', start)
+        data = [
+            [int(code.split('.')[0]) * 1000 + offset + i for i in range(len(times))]
+            for code in codes.split(',')
+        ]
+        return FakeWindData(data, codes=codes.split(','), fields=[field], times=times)
+    
+    def wset(self, table, options):
+        self.wset_calls.append(options)
+        date = options.split(';')[0].split('=')[1]
+        codes = ['000001.SZ', '000002.SZ'] if date < '2024-03-01' else ['000002.SZ', '000003.SZ']
+        names = {'000001.SZ': '平安银行', '000002.SZ': '万科A', '000003.SZ': '国农科技'}
+        return FakeWindData(
+            [[date] * len(codes), codes, [names[code] for code in codes]],
+            fields=['date', 'wind_code', 'sec_name']
+        )
+
+
+class TestWindPyClient:
+    
+    def test_chunked_history_matches_layout(self):
+        """测试分块请求结果按 代码_字段 拼接"""
+        from visualkit.core.windpy_client import WindPyClient
+        
+        fake = FakeWind()
+        client = WindPyClient(fake, max_codes_per_request=2, max_days_per_request=10)
+        codes = [f"{i:06d}.SZ" for i in range(5)]
+        
+        df = client.get_history_data(codes, ['close', 'volume'], '2024-01-01', '2024-01-31')
+        
+        assert fake.started == 1
+        assert len(fake.wsd_calls) == 4 * 2 * 3
+        assert list(df.columns[:3]) == ['date', '000000.SZ_close', '000000.SZ_volume']
+        assert len(df) == len(pd.bdate_range('2024-01-01', '2024-01-31'))
+        np.testing.assert_array_equal(df['000004.SZ_volume'].to_numpy(), 4000 + np.arange(len(df)))
+    
+    def test_error_code_returns_empty(self):
+        """测试接口返回错误码时返回空表"""
+        from visualkit.core.windpy_client import WindPyClient
+        
+        fake = FakeWind()
+        fake.wsd = lambda *args: FakeWindData('quota exceeded', error_code=-40522017)
+        client = WindPyClient(fake)
+        
+        assert client.get_history_data(['A'], ['close'], '2024-01-01', '2024-01-05').empty
+        assert '-40522017' in client.last_error
+    
+    def test_sector_constituents_through_store(self, tmp_path, monkeypatch):
+        """测试WindPy客户端的成分股按存储覆盖范围读取，范围外调用wset并保存快照"""
+        from visualkit.core.constituent_store import ConstituentStore
+        from visualkit.core.windpy_client import WindPyClient
+        
+        fake = FakeWind()
+        monkeypatch.setitem(sys.modules, 'WindPy', types.SimpleNamespace(w=fake))
+        path = tmp_path / 'constituents.npz'
+        store = ConstituentStore(path)
+        client = WindPyClient()
+        
+        client.get_sector_constituents('BANK', '2024-01-02', store=store)
+        client.get_sector_constituents('BANK', '2024-06-03', store=store)
+        cached = client.get_sector_constituents('BANK', '2024-02-01', store=store)
+        later = client.get_sector_constituents('BANK', '2025-06-02', store=store)
+        earlier = client.get_sector_constituents('BANK', '2020-06-01', store=store)
+        
+        assert [options.split(';')[0] for options in fake.wset_calls] == [
+            'date=2024-01-02', 'date=2024-06-03', 'date=2025-06-02', 'date=2020-06-01'
+        ]
+        assert list(cached.columns) == list(later.columns) == ['code', 'name']
+        assert cached['name'].tolist() == ['平安银行', '万科A']
+        assert earlier['code'].tolist() == ['000001.SZ', '000002.SZ']
+        
+        reloaded = ConstituentStore(path)
+        assert reloaded.members('BANK', '2025-07-01').tolist() == ['000002.SZ', '000003.SZ']
+        assert reloaded.names(['000003.SZ']) == ['国农科技']
+
+
+class TestConstituentStore:
+    
+    def test_point_in_time_members(self, tmp_path):
+        """测试按快照构建区间并按日期查询"""
+        from visualkit.core.constituent_store import ConstituentStore
+        
+        store = ConstituentStore(tmp_path / 'constituents.npz')
+        store.add_snapshot('BANK', '2024-01-02', ['A', 'B'])
+        store.add_snapshot('BANK', '2024-03-01', ['B', 'C'])
+        store.add_snapshot('BANK', '2024-06-03', ['A', 'B', 'C'])
+        store.save()
+        
+        reloaded = ConstituentStore(tmp_path / 'constituents.npz')
+        
+        assert reloaded.members('BANK', '2024-02-01').tolist() == ['A', 'B']
+        assert reloaded.members('BANK', '2024-04-01').tolist() == ['B', 'C']
+        assert reloaded.members('BANK', '2024-07-01').tolist() == ['A', 'B', 'C']
+        assert reloaded.members('OTHER', '2024-07-01').tolist() == []
+        
+        matrix = reloaded.membership_matrix('BANK', '2024-02-28', '2024-03-04')
+        assert list(matrix.columns) == ['A', 'B', 'C']
+        assert matrix['A'].tolist() == [True, True, False, False]
+        assert matrix['C'].tolist() == [False, False, True, True]
+    
+    def test_client_reads_from_store(self, tmp_path, monkeypatch):
+        """测试覆盖范围内从存储读取，范围外请求接口，写入后保存"""
+        from visualkit.core.constituent_store import ConstituentStore
+        
+        path = tmp_path / 'constituents.npz'
+        store = ConstituentStore(path)
+        client = WindClient()
+        fetch = client._fetch_sector_constituents
+        calls = []
+        monkeypatch.setattr(client, '_fetch_sector_constituents', lambda *args: calls.append(args[1]) or fetch(*args))
+        
+        first = client.get_sector_constituents('BANK', '2024-01-02', store=store)
+        client.get_sector_constituents('BANK', '2024-03-01', store=store)
+        cached = client.get_sector_constituents('BANK', '2024-02-01', store=store)
+        earlier = client.get_sector_constituents('BANK', '2023-06-01', store=store)
+        
+        assert calls == ['2024-01-02', '2024-03-01', '2023-06-01']
+        assert list(cached.columns) == list(first.columns) == ['code', 'name']
+        assert cached['code'].tolist() == sorted(first['code'])
+        assert cached['name'].tolist() == first.sort_values('code')['name'].tolist()
+        assert not earlier.empty
+        
+        reloaded = ConstituentStore(path)
+        assert reloaded.covers('BANK', '2024-02-01') and not reloaded.covers('BANK', '2023-06-01')
+        assert reloaded.names(['000002.SZ']) == ['万科A']
+        with pytest.raises(ValueError):
+            reloaded.add_snapshot('BANK', '2024-01-15', ['A'])
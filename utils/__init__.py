@@ -3,10 +3,13 @@
 提供数据格式化和模板管理功能
 """
 
-from .data_formatter import DataFormatter
+from .data_formatter import DataFormatter, MissingValueFiller
 from .template_manager import TemplateManager
+from .chart_server import ChartServer
 
 __all__ = [
     'DataFormatter',
-    'TemplateManager'
+    'MissingValueFiller',
+    'TemplateManager',
+    'ChartServer'
 ]
\ No newline at end of file
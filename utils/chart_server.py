@@ -0,0 +1,284 @@
+"""
+图表配置服务
+基于asyncio的轻量HTTP服务，只返回图表的option JSON，
+支持内容哈希ETag、304协商缓存以及gzip/brotli压缩
+"""
+import asyncio
+import gzip
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import pandas as pd
+import simplejson
+from pyecharts.charts.base import default as _json_default
+from pyecharts.commons.utils import replace_placeholder_with_quotes
+
+try:
+    from ..charts.seasonal_chart import SeasonalChart
+    from ..charts.time_series_chart import TimeSeriesChart
+except ImportError:
+    from charts.seasonal_chart import SeasonalChart
+    from charts.time_series_chart import TimeSeriesChart
+
+try:
+    import brotli
+except ImportError:
+    # brotli为可选依赖，未安装时仅使用gzip
+    brotli = None
+
+
+HTTP_REASONS = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+}
+
+
+def dump_chart_options(chart: Any) -> bytes:
+    """将图表对象序列化为紧凑的option JSON"""
+    if isinstance(chart, bytes):
+        return chart
+    if isinstance(chart, str):
+        return chart.encode('utf-8')
+
+    options = chart if isinstance(chart, (dict, list)) else chart.get_options()
+    text = simplejson.dumps(
+        options,
+        separators=(',', ':'),
+        default=_json_default,
+        ignore_nan=True,
+        ensure_ascii=False
+    )
+    return replace_placeholder_with_quotes(text).encode('utf-8')
+
+
+class ChartServer:
+    """图表option JSON服务"""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 8765,
+        compress_min_size: int = 1024,
+        cache_size: int = 64
+    ):
+        self.host = host
+        self.port = port
+        self.compress_min_size = compress_min_size
+        self.cache_size = cache_size
+        self.routes: Dict[str, Callable[..., Any]] = {}
+        # 压缩结果缓存: (etag, encoding) -> body
+        self._encoded_cache: Dict[Tuple[str, str], bytes] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def register(self, name: str, builder: Callable[..., Any]) -> None:
+        """
+        注册图表端点
+
+        Args:
+            name: 端点名称，对应 /charts/<name>
+            builder: 接收查询参数并返回pyecharts图表、dict或JSON字符串的函数
+        """
+        self.routes[name] = builder
+
+    def register_seasonal(
+        self,
+        name: str,
+        loader: Callable[..., pd.DataFrame],
+        **chart_kwargs
+    ) -> None:
+        """注册季节性图表端点，loader接收查询参数并返回DataFrame"""
+        chart = SeasonalChart()
+
+        def builder(**params):
+            return chart.create_seasonal_line(loader(**params), **chart_kwargs)
+
+        self.register(name, builder)
+
+    def register_time_series(
+        self,
+        name: str,
+        loader: Callable[..., pd.DataFrame],
+        date_col: str,
+        value_cols: List[str],
+        **chart_kwargs
+    ) -> None:
+        """注册时间序列图表端点，loader接收查询参数并返回DataFrame"""
+        chart = TimeSeriesChart()
+
+        def builder(**params):
+            return chart.create_time_series_line(
+                loader(**params), date_col, value_cols, **chart_kwargs
+            )
+
+        self.register(name, builder)
+
+    def build_response(
+        self,
+        method: str,
+        target: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """根据请求生成 (状态码, 响应头, 响应体)"""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+        if method not in ('GET', 'HEAD'):
+            return self._error(405, 'method not allowed', {'Allow': 'GET, HEAD'})
+
+        url = urlsplit(target)
+        path = unquote(url.path).rstrip('/')
+        params = dict(parse_qsl(url.query))
+
+        if path == '/charts':
+            body = dump_chart_options(sorted(self.routes))
+        elif path.startswith('/charts/') and path[len('/charts/'):] in self.routes:
+            try:
+                body = dump_chart_options(self.routes[path[len('/charts/'):]](**params))
+            except Exception as e:
+                return self._error(500, f'chart build failed: {e}')
+        else:
+            return self._error(404, 'chart not found')
+
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        response_headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding',
+        }
+
+        if self._etag_matches(headers.get('if-none-match', ''), etag):
+            response_headers['ETag'] = f'"{etag}"'
+            return 304, response_headers, b''
+
+        encoding = self._choose_encoding(headers.get('accept-encoding', ''), len(body))
+        if encoding:
+            body = self._encode(body, etag, encoding)
+            response_headers['Content-Encoding'] = encoding
+            response_headers['ETag'] = f'"{etag}-{encoding}"'
+        else:
+            response_headers['ETag'] = f'"{etag}"'
+
+        return 200, response_headers, body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理单个HTTP连接"""
+        try:
+            request_line = await reader.readline()
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                status, headers, body = self._error(400, 'bad request')
+                method = 'GET'
+            else:
+                method, target, _ = parts
+                request_headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    request_headers[key.strip()] = value.strip()
+
+                # 图表构建可能较慢，放到线程池避免阻塞事件循环
+                loop = asyncio.get_running_loop()
+                status, headers, body = await loop.run_in_executor(
+                    None, self.build_response, method, target, request_headers
+                )
+
+            head = [f'HTTP/1.1 {status} {HTTP_REASONS.get(status, "")}']
+            headers['Content-Length'] = str(len(body))
+            headers['Connection'] = 'close'
+            head.extend(f'{k}: {v}' for k, v in headers.items())
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+            if method != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self) -> asyncio.AbstractServer:
+        """启动服务（不阻塞）"""
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def stop(self) -> None:
+        """停止服务"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """启动服务并持续运行"""
+        server = await self.start()
+        print(f"图表服务已启动: http://{self.host}:{self.port}/charts")
+        async with server:
+            await server.serve_forever()
+
+    def run(self) -> None:
+        """在本地阻塞运行服务"""
+        asyncio.run(self.serve_forever())
+
+    @staticmethod
+    def _etag_matches(if_none_match: str, etag: str) -> bool:
+        """判断If-None-Match是否命中当前内容"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        for candidate in if_none_match.split(','):
+            candidate = candidate.strip()
+            if candidate.startswith('W/'):
+                candidate = candidate[2:]
+            # 压缩变体的ETag带编码后缀，内容哈希相同即视为未变化
+            if candidate.strip('"').split('-')[0] == etag:
+                return True
+        return False
+
+    def _choose_encoding(self, accept_encoding: str, size: int) -> Optional[str]:
+        """选择压缩算法，小响应不压缩"""
+        if size < self.compress_min_size:
+            return None
+        accepted = {
+            item.split(';')[0].strip().lower()
+            for item in accept_encoding.split(',')
+            if item.strip() and not item.strip().endswith('q=0')
+        }
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    def _encode(self, body: bytes, etag: str, encoding: str) -> bytes:
+        """压缩响应体，同一内容只压缩一次"""
+        key = (etag, encoding)
+        cached = self._encoded_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if encoding == 'br':
+            encoded = brotli.compress(body)
+        else:
+            encoded = gzip.compress(body, compresslevel=6, mtime=0)
+
+        if len(self._encoded_cache) >= self.cache_size:
+            self._encoded_cache.pop(next(iter(self._encoded_cache)))
+        self._encoded_cache[key] = encoded
+        return encoded
+
+    @staticmethod
+    def _error(
+        status: int,
+        message: str,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """生成JSON格式的错误响应"""
+        headers = {'Content-Type': 'application/json; charset=utf-8'}
+        headers.update(extra_headers or {})
+        return status, headers, dump_chart_options({'error': message})
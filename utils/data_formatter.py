@@ -8,6 +8,90 @@ from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 import warnings
 
+try:
+    from ..core.date_parsing import parse_dates, prepare_frame
+    from ..core.memory_profile import defensive_copy
+    from ..core.wind_client import WindDataProcessor
+except ImportError:
+    from core.date_parsing import parse_dates, prepare_frame
+    from core.memory_profile import defensive_copy
+    from core.wind_client import WindDataProcessor
+
+
+# 缺失值填充方式
+FILL_STRATEGIES = ('forward_fill', 'backward_fill', 'interpolate', 'mean', 'median', 'zero', 'custom')
+
+# 只适用于数值列的填充方式
+_NUMERIC_FILLS = ('interpolate', 'mean', 'median', 'zero')
+
+
+def _fill_plan(
+    df: pd.DataFrame,
+    method: Optional[str],
+    strategies: Optional[Dict[str, str]],
+    exclude=()
+) -> Dict[str, str]:
+    """确定每列的填充方式：strategies优先，其余列使用method"""
+    plan = {}
+    for col, strategy in (strategies or {}).items():
+        if strategy not in FILL_STRATEGIES:
+            raise ValueError(f"不支持的填充方式: {strategy}")
+        if strategy in _NUMERIC_FILLS and not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"列 {col} 不是数值列，不能使用 {strategy}")
+        plan[col] = strategy
+    
+    if method is None:
+        return plan
+    if method not in FILL_STRATEGIES:
+        # 默认前向填充
+        method = 'forward_fill'
+    
+    for col in df.columns:
+        if col in plan or col in exclude:
+            continue
+        if method in _NUMERIC_FILLS and not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        plan[col] = method
+    return plan
+
+
+def _apply_fill(
+    df: pd.DataFrame,
+    plan: Dict[str, str],
+    fill_value: Any,
+    limit: Optional[int],
+    date_col: Optional[str]
+) -> pd.DataFrame:
+    """按填充方式分组，对同一方式的所有列一次性填充"""
+    by_strategy: Dict[str, List[str]] = {}
+    for col, strategy in plan.items():
+        by_strategy.setdefault(strategy, []).append(col)
+    
+    for strategy, cols in by_strategy.items():
+        part = df[cols]
+        if strategy == 'forward_fill':
+            part = part.ffill(limit=limit)
+        elif strategy == 'backward_fill':
+            part = part.bfill(limit=limit)
+        elif strategy == 'interpolate':
+            if date_col is not None:
+                part = part.set_axis(pd.DatetimeIndex(df[date_col])).interpolate(method='time', limit=limit)
+            elif isinstance(df.index, pd.DatetimeIndex):
+                part = part.interpolate(method='time', limit=limit)
+            else:
+                part = part.interpolate(limit=limit)
+        elif strategy == 'mean':
+            part = part.fillna(part.mean())
+        elif strategy == 'median':
+            part = part.fillna(part.median())
+        elif strategy == 'zero':
+            part = part.fillna(0)
+        else:
+            part = part.fillna(fill_value)
+        df[cols] = part.to_numpy() if strategy == 'interpolate' else part
+    return df
+
+
 
 class DataFormatter:
     """数据格式化类"""
@@ -19,12 +103,11 @@ class DataFormatter:
         format_str: str = '%Y-%m-%d'
     ) -> pd.DataFrame:
         """格式化日期列"""
-        df = df.copy()
+        df = defensive_copy(df)
         
         # 尝试解析日期
         try:
-            df[date_col] = pd.to_datetime(df[date_col])
-            df[date_col] = df[date_col].dt.strftime(format_str)
+            df[date_col] = parse_dates(df[date_col]).dt.strftime(format_str)
         except Exception as e:
             warnings.warn(f"日期格式化失败: {e}")
         
@@ -38,7 +121,7 @@ class DataFormatter:
         thousands_sep: bool = True
     ) -> pd.DataFrame:
         """格式化数值列"""
-        df = df.copy()
+        df = defensive_copy(df)
         
         for col in columns:
             if col in df.columns:
@@ -56,60 +139,188 @@ class DataFormatter:
     @staticmethod
     def handle_missing_values(
         df: pd.DataFrame,
-        method: str = 'forward_fill',
-        fill_value: Any = None
+        method: Optional[str] = 'forward_fill',
+        fill_value: Any = None,
+        strategies: Optional[Dict[str, str]] = None,
+        limit: Optional[int] = None,
+        date_col: Optional[str] = None,
+        group_col: Optional[str] = None
     ) -> pd.DataFrame:
-        """处理缺失值"""
-        df = df.copy()
-        
-        if method == 'forward_fill':
-            df = df.fillna(method='ffill')
-        elif method == 'backward_fill':
-            df = df.fillna(method='bfill')
-        elif method == 'interpolate':
-            df = df.interpolate()
-        elif method == 'mean':
-            df = df.fillna(df.mean())
-        elif method == 'median':
-            df = df.fillna(df.median())
-        elif method == 'zero':
-            df = df.fillna(0)
-        elif method == 'custom':
-            df = df.fillna(fill_value)
-        else:
-            # 默认前向填充
-            df = df.fillna(method='ffill')
+        """
+        处理缺失值
         
-        return df
+        Args:
+            df: 数据
+            method: 默认填充方式，见FILL_STRATEGIES；mean, median, interpolate只作用于数值列，
+                None表示只处理strategies中的列
+            fill_value: custom方式的填充值（可为按列的字典）
+            strategies: 按列指定填充方式，如 {'close': 'interpolate', 'volume': 'zero'}
+            limit: 连续缺失最多填充的个数
+            date_col: 日期列，不参与填充；interpolate按该列的时间间隔加权
+            group_col: 分组列，各组分别填充；分组值缺失的行原样保留，不参与填充
+            
+        Returns:
+            DataFrame: 填充后的数据
+        """
+        plan = _fill_plan(df, method, strategies, exclude=(date_col, group_col))
+        if not plan:
+            return defensive_copy(df)
+        
+        if group_col is None:
+            return _apply_fill(defensive_copy(df), plan, fill_value, limit, date_col)
+        
+        groups = list(df.groupby(group_col, sort=False).indices.values())
+        parts = [_apply_fill(df.iloc[rows].copy(), plan, fill_value, limit, date_col) for rows in groups]
+        ungrouped = np.flatnonzero(df[group_col].isna().to_numpy())
+        if len(ungrouped):
+            groups.append(ungrouped)
+            parts.append(df.iloc[ungrouped])
+        # 恢复原始行序
+        order = np.argsort(np.concatenate(groups), kind='stable')
+        return pd.concat(parts).iloc[order]
+    
+    # 各检测方法的默认阈值：iqr为四分位距倍数，其余为（稳健）标准差倍数
+    OUTLIER_THRESHOLDS = {'iqr': 1.5, 'zscore': 1.5, 'mad': 3.0, 'hampel': 3.0}
+    
+    # MAD换算为正态分布标准差的系数
+    MAD_SCALE = 1.4826
+    
+    # 滚动MAD每块最多展开的元素数（行数×列数×窗口），每个临时数组约8MB
+    HAMPEL_CHUNK_ELEMENTS = 1 << 20
     
     @staticmethod
     def remove_outliers(
         df: pd.DataFrame,
         columns: List[str],
         method: str = 'iqr',
-        threshold: float = 1.5
+        threshold: Optional[float] = None,
+        window: Optional[int] = None,
+        action: str = 'drop',
+        min_periods: Optional[int] = None,
+        mode: str = 'sequential'
     ) -> pd.DataFrame:
-        """移除异常值"""
-        df = df.copy()
+        """
+        检测并处理异常值
         
-        for col in columns:
-            if col in df.columns:
-                if method == 'iqr':
-                    Q1 = df[col].quantile(0.25)
-                    Q3 = df[col].quantile(0.75)
-                    IQR = Q3 - Q1
-                    lower_bound = Q1 - threshold * IQR
-                    upper_bound = Q3 + threshold * IQR
-                    
-                    mask = (df[col] >= lower_bound) & (df[col] <= upper_bound)
-                    df = df[mask]
-                
-                elif method == 'zscore':
-                    z_scores = np.abs((df[col] - df[col].mean()) / df[col].std())
-                    df = df[z_scores < threshold]
+        Args:
+            df: 数据
+            columns: 需要检测的列
+            method: iqr, zscore, mad（中位数绝对偏差）, hampel（滚动MAD）
+            threshold: 阈值，默认见OUTLIER_THRESHOLDS
+            window: 滚动窗口长度（居中），指定后按局部统计量检测；hampel默认为21
+            action: drop 删除任一列异常的行, clip 截断到上下界,
+                flag 保留数据并增加is_outlier列
+            min_periods: 滚动窗口内的最少有效值数量，默认为窗口长度的一半
+            mode: drop时的处理方式。sequential（默认）按列依次过滤，每列的上下界基于前面各列
+                过滤后的数据，值缺失的行也被删除；combined 所有列基于完整数据一次性计算上下界
+                并合并为一个掩码，缺失值不视为异常。clip和flag总是按完整数据计算
+            
+        Returns:
+            DataFrame: 处理后的数据
+        """
+        if method not in DataFormatter.OUTLIER_THRESHOLDS:
+            raise ValueError(f"不支持的异常值检测方法: {method}")
+        if action not in ('drop', 'clip', 'flag'):
+            raise ValueError(f"不支持的异常值处理方式: {action}")
+        if mode not in ('sequential', 'combined'):
+            raise ValueError(f"不支持的异常值处理模式: {mode}")
         
+        if threshold is None:
+            threshold = DataFormatter.OUTLIER_THRESHOLDS[method]
+        if method == 'hampel' and window is None:
+            window = 21
+        
+        columns = [col for col in columns if col in df.columns]
+        
+        if action == 'drop' and mode == 'sequential':
+            for col in columns:
+                values = df[[col]].to_numpy(dtype=np.float64)
+                lower, upper = DataFormatter._outlier_bounds(values, method, threshold, window, min_periods)
+                with np.errstate(invalid='ignore'):
+                    # zscore保留|z| < threshold，其余方法保留边界上的值
+                    if method == 'zscore':
+                        outliers = (values <= lower) | (values >= upper)
+                    else:
+                        outliers = (values < lower) | (values > upper)
+                df = df[~(outliers | np.isnan(values))[:, 0]]
+            return df.copy()
+        
+        values = df[columns].to_numpy(dtype=np.float64)
+        lower, upper = DataFormatter._outlier_bounds(values, method, threshold, window, min_periods)
+        
+        # 边界为NaN（窗口内有效值不足）或值缺失时比较结果为False，不视为异常
+        with np.errstate(invalid='ignore'):
+            outliers = (values < lower) | (values > upper)
+        
+        if action == 'drop':
+            return df[~outliers.any(axis=1)].copy()
+        
+        df = defensive_copy(df)
+        if action == 'clip':
+            clipped = np.where(values < lower, lower, values)
+            clipped = np.where(clipped > upper, upper, clipped)
+            df[columns] = clipped
+        else:
+            df['is_outlier'] = outliers.any(axis=1)
         return df
     
+    @staticmethod
+    def _outlier_bounds(
+        values: np.ndarray,
+        method: str,
+        threshold: float,
+        window: Optional[int],
+        min_periods: Optional[int]
+    ):
+        """计算异常值上下界，全局方法返回(列数,)，滚动方法返回(行数, 列数)"""
+        if window is None:
+            with warnings.catch_warnings():
+                # 全为NaN的列返回NaN边界
+                warnings.simplefilter('ignore', RuntimeWarning)
+                if method == 'iqr':
+                    q1, q3 = np.nanpercentile(values, [25, 75], axis=0)
+                    return q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+                if method == 'zscore':
+                    center = np.nanmean(values, axis=0)
+                    spread = np.nanstd(values, axis=0, ddof=1)
+                else:
+                    center = np.nanmedian(values, axis=0)
+                    spread = DataFormatter.MAD_SCALE * np.nanmedian(np.abs(values - center), axis=0)
+                return center - threshold * spread, center + threshold * spread
+        
+        if min_periods is None:
+            min_periods = max(window // 2, 1)
+        
+        if method in ('iqr', 'zscore'):
+            rolling = pd.DataFrame(values).rolling(window, center=True, min_periods=min_periods)
+            if method == 'iqr':
+                q1 = rolling.quantile(0.25).to_numpy()
+                q3 = rolling.quantile(0.75).to_numpy()
+                return q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+            center = rolling.mean().to_numpy()
+            spread = rolling.std().to_numpy()
+            return center - threshold * spread, center + threshold * spread
+        
+        # 滚动MAD：两端补NaN后取居中窗口视图 (行数, 列数, 窗口)。
+        # 视图本身不复制数据，但nanmedian和偏差计算会按窗口展开，因此按行分块计算
+        pad = np.full((window // 2, values.shape[1]), np.nan)
+        padded = np.concatenate([pad, values, pad[:window - 1 - window // 2]])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+        
+        center = np.empty(values.shape)
+        spread = np.empty(values.shape)
+        step = max(DataFormatter.HAMPEL_CHUNK_ELEMENTS // (values.shape[1] * window), 1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for start in range(0, len(values), step):
+                block = windows[start:start + step]
+                block_center = np.nanmedian(block, axis=2)
+                block_spread = np.nanmedian(np.abs(block - block_center[..., None]), axis=2)
+                block_center[np.count_nonzero(~np.isnan(block), axis=2) < min_periods] = np.nan
+                center[start:start + step] = block_center
+                spread[start:start + step] = DataFormatter.MAD_SCALE * block_spread
+        return center - threshold * spread, center + threshold * spread
+    
     @staticmethod
     def normalize_data(
         df: pd.DataFrame,
@@ -117,7 +328,7 @@ class DataFormatter:
         method: str = 'min_max'
     ) -> pd.DataFrame:
         """数据归一化"""
-        df = df.copy()
+        df = defensive_copy(df)
         
         for col in columns:
             if col in df.columns:
@@ -142,10 +353,8 @@ class DataFormatter:
         value_col: str
     ) -> pd.DataFrame:
         """创建衍生特征"""
-        df = df.copy()
-        
         # 确保日期列为datetime类型
-        df[date_col] = pd.to_datetime(df[date_col])
+        df = prepare_frame(df, date_col, sort=False, copy=True)
         
         # 时间特征
         df['year'] = df[date_col].dt.year
@@ -173,14 +382,23 @@ class DataFormatter:
         df: pd.DataFrame,
         date_col: str,
         value_cols: List[str],
-        period: str = 'M'
+        period: str = 'M',
+        exchange: Optional[str] = None
     ) -> pd.DataFrame:
-        """按时间段聚合数据"""
-        df = df.copy()
+        """按时间段聚合数据，指定exchange时只按交易日分桶，不产生节假日空行"""
+        if exchange is not None:
+            return WindDataProcessor.resample_trading_days(
+                df[[date_col] + value_cols],
+                date_col,
+                period,
+                exchange=exchange,
+                agg={col: 'mean' for col in value_cols}
+            )
         
-        # 确保日期列为datetime类型
-        df[date_col] = pd.to_datetime(df[date_col])
-        df.set_index(date_col, inplace=True)
+        # 只取聚合列，以日期为索引，不拷贝整个DataFrame
+        values = df[value_cols]
+        values.index = pd.DatetimeIndex(parse_dates(df[date_col]))
+        df = values
         
         # 聚合
         if period == 'D':
@@ -207,10 +425,8 @@ class DataFormatter:
         end_date: str
     ) -> pd.DataFrame:
         """按日期范围过滤数据"""
-        df = df.copy()
-        
         # 确保日期列为datetime类型
-        df[date_col] = pd.to_datetime(df[date_col])
+        df = prepare_frame(df, date_col, sort=False)
         
         # 过滤
         mask = (df[date_col] >= pd.to_datetime(start_date)) & \
@@ -236,7 +452,7 @@ class DataFormatter:
         lags: List[int]
     ) -> pd.DataFrame:
         """创建滞后特征"""
-        df = df.copy()
+        df = defensive_copy(df)
         
         for col in columns:
             if col in df.columns:
@@ -253,7 +469,7 @@ class DataFormatter:
         stats: List[str] = ['mean', 'std', 'min', 'max']
     ) -> pd.DataFrame:
         """计算滚动统计量"""
-        df = df.copy()
+        df = defensive_copy(df)
         
         for col in columns:
             if col in df.columns:
@@ -268,4 +484,148 @@ class DataFormatter:
                     elif stat == 'max':
                         df[col_name] = df[col].rolling(window=window).max()
         
-        return df
\ No newline at end of file
+        return df
+
+
+class MissingValueFiller:
+    """
+    分块缺失值填充器
+    
+    依次传入按时间排序的数据块，跨块保留状态：前向填充的limit跨块计数，
+    块末尾等待后续数据的行（backward_fill, interpolate）会暂存到下一块一起输出，
+    全部数据传入后调用flush输出剩余行。
+    """
+    
+    STREAMING_STRATEGIES = ('forward_fill', 'backward_fill', 'interpolate', 'mean', 'zero', 'custom')
+    
+    def __init__(
+        self,
+        method: Optional[str] = 'forward_fill',
+        strategies: Optional[Dict[str, str]] = None,
+        fill_value: Any = None,
+        limit: Optional[int] = None,
+        date_col: Optional[str] = None
+    ):
+        """
+        Args:
+            method, strategies, fill_value, limit, date_col: 同DataFormatter.handle_missing_values；
+                mean使用至当前块为止的累计均值，不支持median
+        """
+        self.method = method
+        self.strategies = strategies
+        self.fill_value = fill_value
+        self.limit = limit
+        self.date_col = date_col
+        
+        self._plan: Optional[Dict[str, str]] = None
+        self._pending: Optional[pd.DataFrame] = None
+        self._rows = 0
+        # 列 -> [最后一个有效值, 其位置坐标, 之后已输出的连续缺失数]
+        self._last: Dict[str, list] = {}
+        # 列 -> [累计和, 累计个数]
+        self._totals: Dict[str, list] = {}
+    
+    def transform(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """填充一个数据块，返回可以确定填充结果的行"""
+        frame = chunk if self._pending is None else pd.concat([self._pending, chunk])
+        if self._plan is None:
+            self._plan = _fill_plan(frame, self.method, self.strategies, exclude=(self.date_col,))
+            unsupported = set(self._plan.values()) - set(self.STREAMING_STRATEGIES)
+            if unsupported:
+                raise ValueError(f"分块填充不支持: {sorted(unsupported)}")
+        
+        # 需要后续数据的列，最后一个有效值之后的行暂存
+        cut = len(frame)
+        for col, strategy in self._plan.items():
+            if strategy in ('backward_fill', 'interpolate'):
+                valid = np.flatnonzero(frame[col].notna().to_numpy())
+                cut = min(cut, valid[-1] + 1 if len(valid) else 0)
+        
+        self._pending = frame.iloc[cut:] if cut < len(frame) else None
+        return self._fill(frame, cut)
+    
+    def flush(self) -> pd.DataFrame:
+        """输出暂存的行：interpolate以最后一个有效值延续，backward_fill保持缺失"""
+        if self._pending is None:
+            return pd.DataFrame()
+        frame, self._pending = self._pending, None
+        return self._fill(frame, len(frame))
+    
+    def _fill(self, frame: pd.DataFrame, cut: int) -> pd.DataFrame:
+        """用整个frame计算填充值，输出前cut行并更新状态"""
+        result = frame.iloc[:cut].copy()
+        if self.date_col is not None:
+            coords = parse_dates(frame[self.date_col]).to_numpy().astype('datetime64[ns]').astype(np.int64)
+        else:
+            coords = self._rows + np.arange(len(frame), dtype=np.int64)
+        
+        for col, strategy in self._plan.items():
+            values = frame[col].to_numpy()
+            missing = pd.isna(values)
+            state = self._last.get(col)
+            
+            if strategy in ('forward_fill', 'interpolate'):
+                filled = self._forward(values, missing, coords, state, strategy == 'interpolate')
+            elif strategy == 'backward_fill':
+                filled = self._forward(values[::-1], missing[::-1], coords, None, False)[::-1]
+            elif strategy == 'mean':
+                totals = self._totals.setdefault(col, [0.0, 0])
+                seen = values[:cut][~missing[:cut]].astype(np.float64)
+                totals[0] += seen.sum()
+                totals[1] += len(seen)
+                filled = np.where(missing, totals[0] / totals[1] if totals[1] else np.nan, values)
+            else:
+                fill = 0 if strategy == 'zero' else (
+                    self.fill_value.get(col) if isinstance(self.fill_value, dict) else self.fill_value
+                )
+                filled = np.where(missing, fill, values)
+            
+            result[col] = filled[:cut]
+            self._update_state(col, values[:cut], missing[:cut], coords[:cut])
+        
+        self._rows += cut
+        return result
+    
+    def _forward(
+        self,
+        values: np.ndarray,
+        missing: np.ndarray,
+        coords: np.ndarray,
+        state: Optional[list],
+        interpolate: bool
+    ) -> np.ndarray:
+        """前向填充或插值；state为上一块的最后有效值，limit跨块计数"""
+        n = len(values)
+        positions = np.arange(n)
+        last_valid = np.maximum.accumulate(np.where(missing, -1, positions))
+        has_prev = last_valid >= 0
+        
+        # 距上一个有效值的缺失行数
+        gap = positions - last_valid
+        if state is not None:
+            gap = np.where(has_prev, gap, state[2] + positions + 1)
+        fillable = missing & (has_prev | (state is not None))
+        if self.limit is not None:
+            fillable &= gap <= self.limit
+        
+        prev_values = np.where(has_prev, values[np.maximum(last_valid, 0)], state[0] if state is not None else np.nan)
+        if interpolate:
+            xp, fp = coords[~missing], values[~missing].astype(np.float64)
+            if state is not None:
+                xp, fp = np.concatenate([[state[1]], xp]), np.concatenate([[state[0]], fp])
+            if len(xp):
+                # 超出最后一个有效值的部分np.interp取末值，与pandas一致
+                prev_values = np.interp(coords, xp, fp)
+        
+        filled = values.copy()
+        filled[fillable] = prev_values[fillable]
+        return filled
+    
+    def _update_state(self, col: str, values: np.ndarray, missing: np.ndarray, coords: np.ndarray) -> None:
+        """记录已输出部分的最后有效值"""
+        valid = np.flatnonzero(~missing)
+        if len(valid):
+            last = valid[-1]
+            self._last[col] = [values[last], coords[last], len(values) - 1 - last]
+        elif col in self._last:
+            self._last[col][2] += len(values)